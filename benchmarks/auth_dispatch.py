@@ -0,0 +1,172 @@
+# python -c "import benchmarks.auth_dispatch"
+
+import json
+import timeit
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from bfxapi.types import serializers
+from bfxapi.types.dataclasses import FundingOffer, Order
+from bfxapi.types.serializers import _Notification
+from bfxapi.websocket._handlers import AuthEventsHandler
+
+REPEAT, NUMBER = 5, 2_000
+
+# Authenticated frames (channel 0) recorded on an account with heavy order
+# churn: new/update/cancel orders, executions, wallet updates and the
+# notifications of the order requests.
+RECORDED = Path(__file__).with_name("auth_frames.jsonl")
+
+FRAMES: List[List[Any]] = [
+    json.loads(line) for line in RECORDED.read_text().splitlines()
+]
+
+
+class _NullEmitter:
+    def emit(self, *_: Any) -> bool:
+        return True
+
+
+class _FormerHandler:
+    """
+    The former AuthEventsHandler (verbatim): linear scan of the serializers.
+    """
+
+    __ABBREVIATIONS = {
+        "os": "order_snapshot",
+        "on": "order_new",
+        "ou": "order_update",
+        "oc": "order_cancel",
+        "ps": "position_snapshot",
+        "pn": "position_new",
+        "pu": "position_update",
+        "pc": "position_close",
+        "te": "trade_execution",
+        "tu": "trade_execution_update",
+        "fos": "funding_offer_snapshot",
+        "fon": "funding_offer_new",
+        "fou": "funding_offer_update",
+        "foc": "funding_offer_cancel",
+        "fcs": "funding_credit_snapshot",
+        "fcn": "funding_credit_new",
+        "fcu": "funding_credit_update",
+        "fcc": "funding_credit_close",
+        "fls": "funding_loan_snapshot",
+        "fln": "funding_loan_new",
+        "flu": "funding_loan_update",
+        "flc": "funding_loan_close",
+        "ws": "wallet_snapshot",
+        "wu": "wallet_update",
+        "fiu": "funding_info_update",
+        "bu": "balance_update",
+    }
+
+    __SERIALIZERS: Dict[Tuple[str, ...], serializers._Serializer] = {
+        ("os", "on", "ou", "oc"): serializers.Order,
+        ("ps", "pn", "pu", "pc"): serializers.Position,
+        ("te", "tu"): serializers.Trade,
+        ("fos", "fon", "fou", "foc"): serializers.FundingOffer,
+        ("fcs", "fcn", "fcu", "fcc"): serializers.FundingCredit,
+        ("fls", "fln", "flu", "flc"): serializers.FundingLoan,
+        ("ws", "wu"): serializers.Wallet,
+        ("fiu",): serializers.FundingInfo,
+        ("bu",): serializers.BalanceInfo,
+    }
+
+    def __init__(self, event_emitter: Any) -> None:
+        self.__event_emitter = event_emitter
+
+    def handle(self, abbrevation: str, stream: Any) -> None:
+        if abbrevation == "n":
+            self.__notification(stream)
+        elif abbrevation == "miu":
+            if stream[0] == "base":
+                self.__event_emitter.emit(
+                    "base_margin_info", serializers.BaseMarginInfo.parse(*stream)
+                )
+            elif stream[0] == "sym":
+                self.__event_emitter.emit(
+                    "symbol_margin_info", serializers.SymbolMarginInfo.parse(*stream)
+                )
+        else:
+            for abbrevations, serializer in _FormerHandler.__SERIALIZERS.items():
+                if abbrevation in abbrevations:
+                    event = _FormerHandler.__ABBREVIATIONS[abbrevation]
+
+                    if all(isinstance(sub_stream, list) for sub_stream in stream):
+                        data = [serializer.parse(*sub_stream) for sub_stream in stream]
+                    else:
+                        data = serializer.parse(*stream)
+
+                    self.__event_emitter.emit(event, data)
+
+    def __notification(self, stream: Any) -> None:
+        event: str = "notification"
+
+        serializer: _Notification = _Notification[None](serializer=None)
+
+        if stream[1] in ("on-req", "ou-req", "oc-req"):
+            event, serializer = f"{stream[1]}-notification", _Notification[Order](
+                serializer=serializers.Order
+            )
+
+        if stream[1] in ("fon-req", "foc-req"):
+            event, serializer = f"{stream[1]}-notification", _Notification[
+                FundingOffer
+            ](serializer=serializers.FundingOffer)
+
+        self.__event_emitter.emit(event, serializer.parse(*stream))
+
+
+def _benchmark() -> None:
+    handlers = {
+        "former": _FormerHandler(_NullEmitter()),
+        "bfxapi": AuthEventsHandler(_NullEmitter()),  # type: ignore[arg-type]
+    }
+
+    groups: Dict[str, List[Any]] = defaultdict(list)
+
+    for message in FRAMES:
+        groups[message[1]].append(message[2])
+
+    # Mean cost of the frames of each abbreviation, for each handler
+    costs: Dict[str, List[float]] = {}
+
+    for abbreviation, streams in groups.items():
+        costs[abbreviation] = []
+
+        for handler in handlers.values():
+
+            def replay(h: Any = handler, a: str = abbreviation) -> None:
+                for stream in groups[a]:
+                    h.handle(a, stream)
+
+            best = min(timeit.repeat(replay, repeat=REPEAT, number=NUMBER))
+
+            costs[abbreviation].append(best / (NUMBER * len(streams)) * 1e9)
+
+    print(f"{'':<5}{'frames':>7}{'former':>11}{'bfxapi':>11}")
+
+    for abbreviation, (before, after) in costs.items():
+        print(
+            f"{abbreviation:<5}{len(groups[abbreviation]):>7}"
+            f"{before:>8.0f} ns{after:>8.0f} ns  ({before / after:.1f}x)"
+        )
+
+    # Weighted by the number of frames of each abbreviation
+    before, after = (
+        sum(cost[i] * len(groups[abbreviation]) for abbreviation, cost in costs.items())
+        / len(FRAMES)
+        for i in range(len(handlers))
+    )
+
+    print(
+        f"{'mean':<5}{len(FRAMES):>7}"
+        f"{before:>8.0f} ns{after:>8.0f} ns  ({before / after:.1f}x)"
+    )
+
+
+print(f"Dispatch cost of {len(FRAMES)} replayed authenticated frames:")
+
+_benchmark()
@@ -0,0 +1,123 @@
+# python -c "import benchmarks.dataclasses_memory"
+
+import copy
+import pickle
+import tracemalloc
+from dataclasses import asdict, fields, is_dataclass, make_dataclass
+from typing import Any, Callable, List, Type
+
+from bfxapi.types import (
+    Candle,
+    InvoiceSubmission,
+    Ledger,
+    Notification,
+    Order,
+    TradingPairBook,
+    TradingPairTrade,
+    dataclasses,
+)
+from bfxapi.types.labeler import partial
+
+AMOUNT = 100_000
+
+
+def _unslotted(klass: Type[Any]) -> Type[Any]:
+    """
+    Build a regular (__dict__ based) dataclass with the same fields of klass.
+    """
+
+    return make_dataclass(
+        klass.__name__, [(field.name, field.type) for field in fields(klass)]
+    )
+
+
+def _bytes_per_object(factory: Callable[[], Any]) -> float:
+    tracemalloc.start()
+
+    objects: List[Any] = [factory() for _ in range(AMOUNT)]
+
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    del objects
+
+    return size / AMOUNT
+
+
+def _measure(klass: Type[Any]) -> None:
+    kwargs = {field.name: index for index, field in enumerate(fields(klass))}
+
+    unslotted = _unslotted(klass)
+
+    before = _bytes_per_object(lambda: unslotted(**kwargs))
+
+    after = _bytes_per_object(lambda: klass(**kwargs))
+
+    print(
+        f"{klass.__name__:<20} {before:>8.1f} B -> {after:>8.1f} B "
+        f"({100 * (1 - after / before):.0f}% less)"
+    )
+
+
+def _types() -> List[Type[Any]]:
+    """
+    Every dataclass of bfxapi.types (nested ones included).
+    """
+
+    types: List[Type[Any]] = [Notification]
+
+    types += [
+        value
+        for value in vars(dataclasses).values()
+        if isinstance(value, type) and value.__module__ == dataclasses.__name__
+    ]
+
+    for klass in list(types):
+        types += [
+            value
+            for value in vars(klass).values()
+            if isinstance(value, type) and is_dataclass(value)
+        ]
+
+    return [klass for klass in types if is_dataclass(klass)]
+
+
+def _check(klass: Type[Any]) -> None:
+    kwargs = {field.name: index for index, field in enumerate(fields(klass))}
+
+    instance = klass(**kwargs)
+
+    assert not hasattr(instance, "__dict__"), klass
+
+    assert pickle.loads(pickle.dumps(instance)) == instance, klass
+
+    assert copy.deepcopy(instance) == instance, klass
+
+    assert asdict(instance) == kwargs, klass
+
+    try:
+        klass(**kwargs, _unexpected=None)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError(klass)
+
+    # Types decorated with @partial default the missing fields to None
+    if klass.__init__.__qualname__.startswith(partial.__qualname__):
+        assert all(value is None for value in asdict(klass()).values()), klass
+
+
+_TYPES = _types()
+
+for _type in _TYPES:
+    _check(_type)
+
+print(f"pickle, deepcopy, asdict and __init__ checked on {len(_TYPES)} types.")
+
+print(f"Bytes per object ({AMOUNT} objects, list overhead included):")
+
+for _klass in [TradingPairTrade, TradingPairBook, Candle, Order, Ledger]:
+    _measure(_klass)
+
+_measure(InvoiceSubmission.Payment)
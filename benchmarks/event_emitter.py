@@ -0,0 +1,108 @@
+# python -c "import benchmarks.event_emitter"
+# (requires pyee, listed in dev-requirements.txt)
+
+import timeit
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from pyee.asyncio import AsyncIOEventEmitter
+
+from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket._event_emitter.bfx_event_emitter import (
+    _ONCE_PER_CONNECTION,
+    _ONCE_PER_SUBSCRIPTION,
+)
+
+REPEAT, NUMBER = 5, 200_000
+
+SUBSCRIPTION = {"channel": "book", "sub_id": "1", "symbol": "tBTCUSD"}
+
+LEVEL = (100.0, 1, 1.5)
+
+
+class _PyeeEmitter(AsyncIOEventEmitter):
+    """
+    The former BfxEventEmitter: list membership and pyee's locked dispatch.
+    """
+
+    _ONCE_PER_CONNECTION = list(_ONCE_PER_CONNECTION)
+
+    _ONCE_PER_SUBSCRIPTION = list(_ONCE_PER_SUBSCRIPTION)
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._connection: List[str] = []
+
+        self._subscriptions: Dict[str, List[str]] = defaultdict(lambda: [])
+
+    def emit(self, event: str, *args: Any, **kwargs: Any) -> bool:
+        if event in _PyeeEmitter._ONCE_PER_CONNECTION:
+            if event in self._connection:
+                return self._has_listeners(event)
+
+            self._connection += [event]
+
+        if event in _PyeeEmitter._ONCE_PER_SUBSCRIPTION:
+            sub_id = args[0]["sub_id"]
+
+            if event in self._subscriptions[sub_id]:
+                return self._has_listeners(event)
+
+            self._subscriptions[sub_id] += [event]
+
+        return super().emit(event, *args, **kwargs)
+
+    def _has_listeners(self, event: str) -> bool:
+        with self._lock:
+            listeners = self._events.get(event)
+
+        return bool(listeners)
+
+
+def _listener(subscription: Any, data: Any) -> None:
+    pass
+
+
+def _scenarios(emitter: Any) -> Dict[str, Callable[[], Any]]:
+    for event in ("t_book_snapshot", "t_book_update", "checksum"):
+        emitter.add_listener(event, _listener)
+
+    emitter.emit("t_book_snapshot", SUBSCRIPTION, [])
+
+    return {
+        "update (1 listener)": lambda: emitter.emit(
+            "t_book_update", SUBSCRIPTION, LEVEL
+        ),
+        "update (no listener)": lambda: emitter.emit(
+            "t_ticker_update", SUBSCRIPTION, LEVEL
+        ),
+        "repeated snapshot": lambda: emitter.emit("t_book_snapshot", SUBSCRIPTION, []),
+    }
+
+
+def _benchmark() -> None:
+    emitters = {"pyee": _PyeeEmitter(), "bfxapi": BfxEventEmitter()}
+
+    scenarios = {name: _scenarios(emitter) for name, emitter in emitters.items()}
+
+    print(f"{'':<22}{'pyee':>10}{'bfxapi':>10}")
+
+    for scenario in scenarios["pyee"]:
+        costs = [
+            min(timeit.repeat(scenarios[name][scenario], repeat=REPEAT, number=NUMBER))
+            / NUMBER
+            * 1e9
+            for name in emitters
+        ]
+
+        print(
+            f"{scenario:<22}"
+            + "".join(f"{cost:>7.0f} ns" for cost in costs)
+            + f"  ({costs[0] / costs[1]:.1f}x)"
+        )
+
+
+print("Cost of BfxEventEmitter.emit (per call):")
+
+_benchmark()
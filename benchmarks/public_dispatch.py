@@ -0,0 +1,297 @@
+# python -c "import benchmarks.public_dispatch"
+
+import json
+import timeit
+from typing import Any, Dict, List, cast
+
+from bfxapi.types import serializers
+from bfxapi.websocket._handlers import PublicChannelsHandler
+from bfxapi.websocket.subscriptions import (
+    Book,
+    Candles,
+    Status,
+    Subscription,
+    Ticker,
+    Trades,
+)
+
+REPEAT, NUMBER = 5, 2_000
+
+SUBSCRIPTIONS: Dict[int, Subscription] = {
+    17082: {
+        "channel": "book",
+        "sub_id": "1",
+        "symbol": "tBTCUSD",
+        "prec": "P0",
+        "freq": "F0",
+        "len": "25",
+    },
+    17083: {
+        "channel": "book",
+        "sub_id": "2",
+        "symbol": "tETHUSD",
+        "prec": "R0",
+        "freq": "F0",
+        "len": "25",
+    },
+    17084: {"channel": "trades", "sub_id": "3", "symbol": "tBTCUSD"},
+    17085: {"channel": "ticker", "sub_id": "4", "symbol": "fUSD"},
+    17086: {"channel": "candles", "sub_id": "5", "key": "trade:1m:tBTCUSD"},
+}
+
+# Recorded frames (already decoded), in the proportions seen on a busy book.
+RECORDED = """
+[17082,[61230,3,0.5]]
+[17082,[61231,1,-0.25]]
+[17082,[61229,0,1]]
+[17082,[61232,2,-1.7]]
+[17083,[128776319104,3350.1,0.8]]
+[17083,[128776319105,3351.4,-2.1]]
+[17083,[128776319104,0,1]]
+[17082,"cs",-1452631451]
+[17084,"te",[1585034937,1714558870562,0.0012,61230]]
+[17084,"tu",[1585034937,1714558870562,0.0012,61230]]
+[17085,[0.0001,0.00012,30,5010000,0.00011,2,2230000,0,0,0.00011,40000000,0.00013,0.0001,null,null,5100000]]
+[17086,[1714558860000,61230,61231,61240,61200,1.52]]
+"""
+
+FRAMES: List[List[Any]] = [json.loads(line) for line in RECORDED.split()] * 50
+
+
+class _NullEmitter:
+    def emit(self, *_: Any) -> bool:
+        return True
+
+
+class _FormerHandler:
+    """
+    The former PublicChannelsHandler (verbatim): string branching on each frame.
+    """
+
+    def __init__(self, event_emitter: Any) -> None:
+        self.__event_emitter = event_emitter
+
+    def handle(self, subscription: Subscription, stream: List[Any]) -> None:
+        if subscription["channel"] == "ticker":
+            self.__ticker_channel_handler(cast(Ticker, subscription), stream)
+        elif subscription["channel"] == "trades":
+            self.__trades_channel_handler(cast(Trades, subscription), stream)
+        elif subscription["channel"] == "book":
+            subscription = cast(Book, subscription)
+
+            if stream[0] == "cs":
+                self.__checksum_handler(subscription, stream[1])
+            else:
+                if subscription["prec"] != "R0":
+                    self.__book_channel_handler(subscription, stream)
+                else:
+                    self.__raw_book_channel_handler(subscription, stream)
+        elif subscription["channel"] == "candles":
+            self.__candles_channel_handler(cast(Candles, subscription), stream)
+        elif subscription["channel"] == "status":
+            self.__status_channel_handler(cast(Status, subscription), stream)
+
+    def __ticker_channel_handler(self, subscription: Ticker, stream: List[Any]):
+        if subscription["symbol"].startswith("t"):
+            return self.__event_emitter.emit(
+                "t_ticker_update",
+                subscription,
+                serializers.TradingPairTicker.parse(*stream[0]),
+            )
+
+        if subscription["symbol"].startswith("f"):
+            return self.__event_emitter.emit(
+                "f_ticker_update",
+                subscription,
+                serializers.FundingCurrencyTicker.parse(*stream[0]),
+            )
+
+    def __trades_channel_handler(self, subscription: Trades, stream: List[Any]):
+        if (event := stream[0]) and event in ["te", "tu", "fte", "ftu"]:
+            events = {
+                "te": "t_trade_execution",
+                "tu": "t_trade_execution_update",
+                "fte": "f_trade_execution",
+                "ftu": "f_trade_execution_update",
+            }
+
+            if subscription["symbol"].startswith("t"):
+                return self.__event_emitter.emit(
+                    events[event],
+                    subscription,
+                    serializers.TradingPairTrade.parse(*stream[1]),
+                )
+
+            if subscription["symbol"].startswith("f"):
+                return self.__event_emitter.emit(
+                    events[event],
+                    subscription,
+                    serializers.FundingCurrencyTrade.parse(*stream[1]),
+                )
+
+        if subscription["symbol"].startswith("t"):
+            return self.__event_emitter.emit(
+                "t_trades_snapshot",
+                subscription,
+                [
+                    serializers.TradingPairTrade.parse(*sub_stream)
+                    for sub_stream in stream[0]
+                ],
+            )
+
+        if subscription["symbol"].startswith("f"):
+            return self.__event_emitter.emit(
+                "f_trades_snapshot",
+                subscription,
+                [
+                    serializers.FundingCurrencyTrade.parse(*sub_stream)
+                    for sub_stream in stream[0]
+                ],
+            )
+
+    def __book_channel_handler(self, subscription: Book, stream: List[Any]):
+        if subscription["symbol"].startswith("t"):
+            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
+                return self.__event_emitter.emit(
+                    "t_book_snapshot",
+                    subscription,
+                    [
+                        serializers.TradingPairBook.parse(*sub_stream)
+                        for sub_stream in stream[0]
+                    ],
+                )
+
+            return self.__event_emitter.emit(
+                "t_book_update",
+                subscription,
+                serializers.TradingPairBook.parse(*stream[0]),
+            )
+
+        if subscription["symbol"].startswith("f"):
+            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
+                return self.__event_emitter.emit(
+                    "f_book_snapshot",
+                    subscription,
+                    [
+                        serializers.FundingCurrencyBook.parse(*sub_stream)
+                        for sub_stream in stream[0]
+                    ],
+                )
+
+            return self.__event_emitter.emit(
+                "f_book_update",
+                subscription,
+                serializers.FundingCurrencyBook.parse(*stream[0]),
+            )
+
+    def __raw_book_channel_handler(self, subscription: Book, stream: List[Any]):
+        if subscription["symbol"].startswith("t"):
+            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
+                return self.__event_emitter.emit(
+                    "t_raw_book_snapshot",
+                    subscription,
+                    [
+                        serializers.TradingPairRawBook.parse(*sub_stream)
+                        for sub_stream in stream[0]
+                    ],
+                )
+
+            return self.__event_emitter.emit(
+                "t_raw_book_update",
+                subscription,
+                serializers.TradingPairRawBook.parse(*stream[0]),
+            )
+
+        if subscription["symbol"].startswith("f"):
+            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
+                return self.__event_emitter.emit(
+                    "f_raw_book_snapshot",
+                    subscription,
+                    [
+                        serializers.FundingCurrencyRawBook.parse(*sub_stream)
+                        for sub_stream in stream[0]
+                    ],
+                )
+
+            return self.__event_emitter.emit(
+                "f_raw_book_update",
+                subscription,
+                serializers.FundingCurrencyRawBook.parse(*stream[0]),
+            )
+
+    def __candles_channel_handler(self, subscription: Candles, stream: List[Any]):
+        if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
+            return self.__event_emitter.emit(
+                "candles_snapshot",
+                subscription,
+                [serializers.Candle.parse(*sub_stream) for sub_stream in stream[0]],
+            )
+
+        return self.__event_emitter.emit(
+            "candles_update", subscription, serializers.Candle.parse(*stream[0])
+        )
+
+    def __status_channel_handler(self, subscription: Status, stream: List[Any]):
+        if subscription["key"].startswith("deriv:"):
+            return self.__event_emitter.emit(
+                "derivatives_status_update",
+                subscription,
+                serializers.DerivativesStatus.parse(*stream[0]),
+            )
+
+        if subscription["key"].startswith("liq:"):
+            return self.__event_emitter.emit(
+                "liquidation_feed_update",
+                subscription,
+                serializers.Liquidation.parse(*stream[0][0]),
+            )
+
+    def __checksum_handler(self, subscription: Book, value: int):
+        return self.__event_emitter.emit("checksum", subscription, value & 0xFFFFFFFF)
+
+
+def _per_frame(function: Any) -> float:
+    best = min(timeit.repeat(function, repeat=REPEAT, number=NUMBER))
+
+    return best / (NUMBER * len(FRAMES)) * 1e9
+
+
+def _benchmark() -> None:
+    subscriptions = SUBSCRIPTIONS
+
+    former = _FormerHandler(_NullEmitter())
+
+    # The former dispatch of BfxWebSocketBucket (frames were always parsed)
+    def branching() -> None:
+        for message in FRAMES:
+            if subscription := subscriptions.get(message[0]):
+                former.handle(subscription, message[1:])
+
+    before = _per_frame(branching)
+
+    print(f"{'former':<8} {before:>8.0f} ns per frame")
+
+    handler = PublicChannelsHandler(_NullEmitter())  # type: ignore[arg-type]
+
+    for raw in (False, True):
+        handlers = {
+            chan_id: handler.resolve(subscription, raw=raw)
+            for chan_id, subscription in subscriptions.items()
+        }
+
+        def resolved(handlers: Dict[int, Any] = handlers) -> None:
+            for message in FRAMES:
+                if _handler := handlers.get(message[0]):
+                    _handler(message)
+
+        after = _per_frame(resolved)
+
+        print(
+            f"{'raw' if raw else 'parsed':<8} {after:>8.0f} ns per frame "
+            f"({before / after:.1f}x)"
+        )
+
+
+print(f"Dispatch cost over {len(FRAMES)} recorded frames:")
+
+_benchmark()
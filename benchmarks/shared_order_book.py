@@ -0,0 +1,165 @@
+# python -c "import benchmarks.shared_order_book"
+
+import asyncio
+import random
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from bfxapi.types import TradingPairBook
+from bfxapi.websocket import (
+    OrderBookManager,
+    SharedOrderBookPublisher,
+    SharedOrderBookReader,
+)
+
+REPEAT, NUMBER, UPDATES, DURATION = 5, 100_000, 200_000, 3.0
+
+SYMBOL, PREFIX = "tBTCUSD", "bfxapi-benchmark"
+
+
+class _Client:
+    """
+    The subset of BfxWebSocketClient used by OrderBookManager.
+    """
+
+    def __init__(self) -> None:
+        self.handlers: Dict[str, Callable[..., Any]] = {}
+
+    def on(self, event: str, f: Callable[..., Any]) -> None:
+        self.handlers[event] = f
+
+    async def subscribe(self, channel: str, **kwargs: Any) -> None:
+        self.subscription = {"channel": channel, **kwargs}
+
+
+def _updates(count: int) -> List[TradingPairBook]:
+    rng = random.Random(0)
+
+    return [
+        TradingPairBook(
+            price=float(rng.randint(9_950, 10_050)),
+            count=rng.choice((0, 1, 2, 3)),
+            amount=rng.choice((1.0, -1.0)) * rng.random(),
+        )
+        for _ in range(count)
+    ]
+
+
+# Runs in another interpreter (this module runs the benchmark on import)
+_READER = """
+import sys, time
+from bfxapi.websocket import SharedOrderBookReader
+
+reader = SharedOrderBookReader(sys.argv[1], prefix=sys.argv[2])
+print("ready", flush=True)
+reads, versions, sequence = 0, 0, -1
+end = time.perf_counter() + float(sys.argv[3])
+while time.perf_counter() < end:
+    snapshot = reader.snapshot()
+    reads += 1
+    if snapshot.sequence != sequence:
+        sequence, versions = snapshot.sequence, versions + 1
+print(reads, versions)
+reader.close()
+"""
+
+
+def _benchmark() -> None:
+    client, updates = _Client(), _updates(UPDATES)
+
+    manager = OrderBookManager(client)  # type: ignore[arg-type]
+
+    asyncio.run(manager.subscribe(SYMBOL))
+
+    snapshot, update = (
+        client.handlers["t_book_snapshot"],
+        client.handlers["t_book_update"],
+    )
+
+    levels = [TradingPairBook(10_000.0 - i, 1, 1.0) for i in range(1, 51)] + [
+        TradingPairBook(10_000.0 + i, 1, -1.0) for i in range(1, 51)
+    ]
+
+    def _throughput() -> float:
+        start = time.perf_counter()
+
+        for level in updates:
+            update(client.subscription, level)
+
+        return UPDATES / (time.perf_counter() - start)
+
+    snapshot(client.subscription, levels)
+
+    baseline = _throughput()
+
+    publisher = SharedOrderBookPublisher(manager, prefix=PREFIX)
+
+    snapshot(client.subscription, levels)
+
+    published = _throughput()
+
+    print("Update throughput (OrderBookManager, 25 levels published):")
+
+    print(f"  without publisher  {baseline:>12,.0f} updates/s")
+
+    print(f"  with publisher     {published:>12,.0f} updates/s")
+
+    reader = SharedOrderBookReader(SYMBOL, prefix=PREFIX)
+
+    print("Read latency (same process, no writer):")
+
+    def _view() -> Optional[float]:
+        view = reader.view()
+
+        with view.bids as bids, view.asks as asks:
+            spread = asks[0] - bids[0]
+
+        return spread if reader.validate(view.sequence) else None
+
+    for name, f in (
+        ("snapshot()", reader.snapshot),
+        ("best()", reader.best),
+        ("view() + validate()", _view),
+    ):
+        cost = min(timeit.repeat(f, repeat=REPEAT, number=NUMBER)) / NUMBER
+
+        print(f"  {name:<20} {cost * 1e9:>9.0f} ns")
+
+    reader.close()
+
+    process = subprocess.Popen(
+        [sys.executable, "-c", _READER, SYMBOL, PREFIX, str(DURATION)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    assert process.stdout is not None and process.stdout.readline() == "ready\n"
+
+    start, updated = time.perf_counter(), 0
+
+    while time.perf_counter() - start < DURATION:
+        _throughput()
+
+        updated += UPDATES
+
+    rate = updated / (time.perf_counter() - start)
+
+    reads, versions = map(int, process.stdout.readline().split())
+
+    process.wait()
+
+    print("Concurrent reader (another process, while updating):")
+
+    print(f"  updates            {rate:>12,.0f} updates/s")
+
+    print(f"  snapshots          {reads / DURATION:>12,.0f} reads/s")
+
+    print(f"  versions observed  {versions:>12,}")
+
+    publisher.close()
+
+
+_benchmark()
@@ -1 +1,9 @@
-from ._client import PUB_REST_HOST, PUB_WSS_HOST, REST_HOST, WSS_HOST, Client
+from ._client import (
+    GATEWAY_HOST,
+    PUB_REST_HOST,
+    PUB_WSS_HOST,
+    REST_HOST,
+    WSS_HOST,
+    Client,
+    GatewayClient,
+)
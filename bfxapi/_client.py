@@ -1,12 +1,16 @@
-from typing import TYPE_CHECKING, List, Optional
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, List, Optional
 
+from bfxapi._utils.json_codec import JSONCodec
 from bfxapi._utils.logging import ColorLogger
 from bfxapi.exceptions import IncompleteCredentialError
 from bfxapi.rest import BfxRestInterface
-from bfxapi.websocket import BfxWebSocketClient
+from bfxapi.websocket import BfxWebSocketClient, ConfFlag, Probe
 
 if TYPE_CHECKING:
     from bfxapi.websocket._client.bfx_websocket_client import _Credentials
+    from bfxapi.websocket._client.bfx_websocket_recovery import Priority
+    from bfxapi.websocket._event_emitter import Dispatch
 
 REST_HOST = "https://api.bitfinex.com/v2"
 WSS_HOST = "wss://api.bitfinex.com/ws/2"
@@ -14,6 +18,8 @@ WSS_HOST = "wss://api.bitfinex.com/ws/2"
 PUB_REST_HOST = "https://api-pub.bitfinex.com/v2"
 PUB_WSS_HOST = "wss://api-pub.bitfinex.com/ws/2"
 
+GATEWAY_HOST = "ws://127.0.0.1:8765"
+
 
 class Client:
     def __init__(
@@ -26,6 +32,16 @@ class Client:
         filters: Optional[List[str]] = None,
         timeout: Optional[int] = 60 * 15,
         log_filename: Optional[str] = None,
+        codec: Optional[JSONCodec] = None,
+        conf_flags: int = ConfFlag.OB_CHECKSUM,
+        resubscribe_on_gap: bool = False,
+        probe: Optional[Probe] = None,
+        dispatch: "Dispatch" = "schedule",
+        handler_timeout: Optional[float] = None,
+        shards: int = 0,
+        executor: Optional[Executor] = None,
+        recovery_rate: Optional[int] = None,
+        recovery_priority: Optional["Priority"] = None,
     ) -> None:
         credentials: Optional["_Credentials"] = None
 
@@ -44,7 +60,9 @@ class Client:
                 "You must provide both API-KEY and API-SECRET (missing API-SECRET)."
             )
 
-        self.rest = BfxRestInterface(rest_host, api_key, api_secret)
+        self.rest = BfxRestInterface(
+            rest_host, api_key, api_secret, codec=codec, executor=executor
+        )
 
         logger = ColorLogger("bfxapi", level="INFO")
 
@@ -52,5 +70,50 @@ class Client:
             logger.register(filename=log_filename)
 
         self.wss = BfxWebSocketClient(
-            wss_host, credentials=credentials, timeout=timeout, logger=logger
+            wss_host,
+            credentials=self._wss_credentials(credentials),
+            timeout=timeout,
+            logger=logger,
+            codec=codec,
+            conf_flags=conf_flags,
+            resubscribe_on_gap=resubscribe_on_gap,
+            probe=probe,
+            dispatch=dispatch,
+            handler_timeout=handler_timeout,
+            shards=shards,
+            executor=executor,
+            recovery_rate=recovery_rate,
+            recovery_priority=recovery_priority,
         )
+
+    @staticmethod
+    def _wss_credentials(
+        credentials: Optional["_Credentials"],
+    ) -> Optional["_Credentials"]:
+        return credentials
+
+
+class GatewayClient(Client):
+    """
+    A Client whose websocket connects to a BfxWebSocketGateway (see
+    BfxWebSocketGateway.serve) instead of the exchange.
+
+    The gateway only serves public channels: credentials (if any) are only
+    used by the REST interface.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        *,
+        wss_host: str = GATEWAY_HOST,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(api_key, api_secret, wss_host=wss_host, **kwargs)
+
+    @staticmethod
+    def _wss_credentials(
+        credentials: Optional["_Credentials"],
+    ) -> Optional["_Credentials"]:
+        return None
@@ -0,0 +1,178 @@
+import math
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, List, Optional, cast
+
+# Upper bounds of the buckets (in milliseconds): 4 buckets per power of
+# two, from 0.1 ms up to ~105 seconds (larger values go to the last one).
+_BOUNDS: List[float] = [0.1 * 2 ** (index / 4) for index in range(81)]
+
+
+class Histogram:
+    """
+    Rolling histogram of the last <window> samples (in milliseconds).
+
+    Samples are counted in log-linear buckets, so recording is O(1) and
+    percentiles are approximated by the upper bound of their bucket
+    (within ~19% of the exact value).
+    """
+
+    def __init__(self, window: int = 1_024) -> None:
+        self.__window = window
+
+        self.__samples: Deque[float] = deque()
+
+        self.__counts = [0] * (len(_BOUNDS) + 1)
+
+        self.__sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self.__samples)
+
+    @property
+    def window(self) -> int:
+        return self.__window
+
+    @property
+    def mean(self) -> Optional[float]:
+        if len(self.__samples) == 0:
+            return None
+
+        return self.__sum / len(self.__samples)
+
+    @property
+    def last(self) -> Optional[float]:
+        if len(self.__samples) == 0:
+            return None
+
+        return self.__samples[-1]
+
+    def record(self, value: float) -> None:
+        self.__samples.append(value)
+
+        self.__counts[bisect_left(_BOUNDS, value)] += 1
+
+        self.__sum += value
+
+        if len(self.__samples) > self.__window:
+            evicted = self.__samples.popleft()
+
+            self.__counts[bisect_left(_BOUNDS, evicted)] -= 1
+
+            self.__sum -= evicted
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if len(self.__samples) == 0:
+            return None
+
+        rank, total = max(1, math.ceil(percentile / 100 * len(self.__samples))), 0
+
+        for index, count in enumerate(self.__counts):
+            total += count
+
+            if total >= rank:
+                if index < len(_BOUNDS):
+                    return _BOUNDS[index]
+
+                break
+
+        return max(self.__samples)
+
+    def clear(self) -> None:
+        self.__samples.clear()
+
+        self.__counts = [0] * (len(_BOUNDS) + 1)
+
+        self.__sum = 0.0
+
+
+class HdrHistogram:
+    """
+    Cumulative histogram of non-negative integers (e.g. nanoseconds), with
+    the layout of an HDR histogram: values below 2 ** <precision> are
+    counted exactly, larger ones in sub-buckets of relative width
+    2 ** (1 - <precision>) (~3% with the default precision).
+
+    Recording is O(1) (a bit_length and a shift) and memory only grows
+    with the logarithm of the largest recorded value.
+    """
+
+    def __init__(self, precision: int = 6) -> None:
+        self.__precision, self.__half = precision, 1 << (precision - 1)
+
+        self.__counts: List[int] = []
+
+        self.__count, self.__sum = 0, 0
+
+        self.__min: Optional[int] = None
+
+        self.__max: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def min(self) -> Optional[int]:
+        return self.__min
+
+    @property
+    def max(self) -> Optional[int]:
+        return self.__max
+
+    @property
+    def mean(self) -> Optional[float]:
+        if self.__count == 0:
+            return None
+
+        return self.__sum / self.__count
+
+    def record(self, value: int) -> None:
+        value = max(value, 0)
+
+        shift = max(value.bit_length() - self.__precision, 0)
+
+        index = shift * self.__half + (value >> shift)
+
+        if index >= len(self.__counts):
+            self.__counts.extend([0] * (index + 1 - len(self.__counts)))
+
+        self.__counts[index] += 1
+
+        self.__count, self.__sum = self.__count + 1, self.__sum + value
+
+        if self.__min is None or value < self.__min:
+            self.__min = value
+
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    def percentile(self, percentile: float) -> Optional[int]:
+        if self.__count == 0:
+            return None
+
+        rank, total = max(1, math.ceil(percentile / 100 * self.__count)), 0
+
+        for index, count in enumerate(self.__counts):
+            total += count
+
+            if total >= rank:
+                return min(self.__highest(index), cast(int, self.__max))
+
+        return self.__max
+
+    def clear(self) -> None:
+        self.__counts.clear()
+
+        self.__count, self.__sum, self.__min, self.__max = 0, 0, None, None
+
+    def __highest(self, index: int) -> int:
+        """
+        Return the highest value counted in the bucket at <index>.
+        """
+
+        if index < 2 * self.__half:
+            return index
+
+        shift = index // self.__half - 1
+
+        return ((index - shift * self.__half + 1) << shift) - 1
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Union
+
+from bfxapi._utils.json_decoder import JSONDecoder, _to_snake_case
+from bfxapi._utils.json_encoder import JSONEncoder, _adapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+_Data = Union[str, bytes]
+
+
+class JSONCodec:
+    """
+    Default codec, based on the json module of the standard library.
+
+    Subclasses can override <loads> and <dumps> to plug in a faster
+    JSON implementation, as long as they keep the same semantics:
+    <snake_case> translates every object key to snake case and <adapt>
+    applies the encoding rules of bfxapi._utils.json_encoder._adapter.
+    """
+
+    def loads(self, data: _Data, *, snake_case: bool = False) -> Any:
+        if snake_case:
+            return json.loads(data, cls=JSONDecoder)
+
+        return json.loads(data)
+
+    def dumps(self, data: Any, *, adapt: bool = False) -> str:
+        if adapt:
+            return json.dumps(data, cls=JSONEncoder)
+
+        return json.dumps(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec based on orjson (requires bitfinex-api-py[orjson]).
+    """
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson (pip install bitfinex-api-py[orjson])."
+            )
+
+    def loads(self, data: _Data, *, snake_case: bool = False) -> Any:
+        obj = orjson.loads(data)
+
+        # Frames without objects (e.g. every channel message) skip the walk
+        if snake_case and _has_object(data):
+            return _snake_case_keys(obj)
+
+        return obj
+
+    def dumps(self, data: Any, *, adapt: bool = False) -> str:
+        if adapt:
+            data = _adapter(data)
+
+        return orjson.dumps(data).decode("utf-8")
+
+
+def _has_object(data: _Data) -> bool:
+    if isinstance(data, bytes):
+        return b"{" in data
+
+    return "{" in data
+
+
+def _snake_case_keys(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {
+            _to_snake_case(key): _snake_case_keys(value) for key, value in obj.items()
+        }
+
+    if isinstance(obj, list):
+        return [_snake_case_keys(sub_obj) for sub_obj in obj]
+
+    return obj
+
+
+def get_default_codec() -> JSONCodec:
+    """
+    Return an OrjsonCodec if orjson is installed, a JSONCodec otherwise.
+    """
+
+    if orjson is not None:
+        return OrjsonCodec()
+
+    return JSONCodec()
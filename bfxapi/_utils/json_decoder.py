@@ -1,10 +1,14 @@
 import json
 import re
+from functools import lru_cache
 from typing import Any, Dict
 
+_CAMEL_CASE_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
 
+
+@lru_cache(maxsize=1024)
 def _to_snake_case(string: str) -> str:
-    return re.sub(r"(?<!^)(?=[A-Z])", "_", string).lower()
+    return _CAMEL_CASE_BOUNDARY.sub("_", string).lower()
 
 
 def _object_hook(data: Dict[str, Any]) -> Any:
@@ -0,0 +1,33 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional
+
+
+class RateLimiter:
+    """
+    Allow at most <limit> acquisitions in any window of <period> seconds.
+    """
+
+    def __init__(self, limit: int, period: float) -> None:
+        self.__limit, self.__period = limit, period
+
+        self.__acquisitions: Deque[float] = deque()
+
+        # Created lazily: before 3.10, locks are bound to the current loop
+        self.__lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            acquisitions, now = self.__acquisitions, time.monotonic()
+
+            while acquisitions and now - acquisitions[0] >= self.__period:
+                acquisitions.popleft()
+
+            if len(acquisitions) >= self.__limit:
+                await asyncio.sleep(self.__period - (now - acquisitions.popleft()))
+
+            acquisitions.append(time.monotonic())
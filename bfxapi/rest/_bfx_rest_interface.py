@@ -1,5 +1,7 @@
+from concurrent.futures import Executor
 from typing import Optional
 
+from bfxapi._utils.json_codec import JSONCodec
 from bfxapi.rest._interfaces import (
     RestAuthEndpoints,
     RestMerchantEndpoints,
@@ -9,12 +11,28 @@ from bfxapi.rest._interfaces import (
 
 class BfxRestInterface:
     def __init__(
-        self, host: str, api_key: Optional[str] = None, api_secret: Optional[str] = None
+        self,
+        host: str,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        *,
+        codec: Optional[JSONCodec] = None,
+        executor: Optional[Executor] = None,
     ):
-        self.auth = RestAuthEndpoints(host=host, api_key=api_key, api_secret=api_secret)
+        self.auth = RestAuthEndpoints(
+            host=host,
+            api_key=api_key,
+            api_secret=api_secret,
+            codec=codec,
+            executor=executor,
+        )
 
         self.merchant = RestMerchantEndpoints(
-            host=host, api_key=api_key, api_secret=api_secret
+            host=host,
+            api_key=api_key,
+            api_secret=api_secret,
+            codec=codec,
+            executor=executor,
         )
 
-        self.public = RestPublicEndpoints(host=host)
+        self.public = RestPublicEndpoints(host=host, codec=codec, executor=executor)
@@ -1,10 +1,28 @@
-from typing import Optional
+from concurrent.futures import Executor
+from typing import Any, List, Optional, TypeVar
+
+from bfxapi._utils.json_codec import JSONCodec
+from bfxapi.types.labeler import _Serializer, _Type
+from bfxapi.types.serializers import _parse_all
 
 from .middleware import Middleware
 
+T = TypeVar("T", bound=_Type)
+
 
 class Interface:
     def __init__(
-        self, host: str, api_key: Optional[str] = None, api_secret: Optional[str] = None
+        self,
+        host: str,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        *,
+        codec: Optional[JSONCodec] = None,
+        executor: Optional[Executor] = None,
     ):
-        self._m = Middleware(host, api_key, api_secret)
+        self._m = Middleware(host, api_key, api_secret, codec=codec)
+
+        self.__executor = executor
+
+    def _parse_all(self, serializer: _Serializer[T], data: List[Any]) -> List[T]:
+        return _parse_all(serializer, data, self.__executor)
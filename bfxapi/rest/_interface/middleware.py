@@ -1,14 +1,12 @@
 import hashlib
 import hmac
-import json
 from datetime import datetime
 from enum import IntEnum
 from typing import TYPE_CHECKING, Any, List, NoReturn, Optional
 
 import requests
 
-from bfxapi._utils.json_decoder import JSONDecoder
-from bfxapi._utils.json_encoder import JSONEncoder
+from bfxapi._utils.json_codec import JSONCodec, get_default_codec
 from bfxapi.exceptions import InvalidCredentialError
 from bfxapi.rest.exceptions import GenericError, RequestParameterError
 
@@ -27,10 +25,17 @@ class Middleware:
     __TIMEOUT = 30
 
     def __init__(
-        self, host: str, api_key: Optional[str] = None, api_secret: Optional[str] = None
+        self,
+        host: str,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        *,
+        codec: Optional[JSONCodec] = None,
     ):
         self.__host = host
 
+        self.__codec = codec or get_default_codec()
+
         self.__api_key = api_key
 
         self.__api_secret = api_secret
@@ -48,7 +53,7 @@ class Middleware:
             timeout=Middleware.__TIMEOUT,
         )
 
-        data = request.json(cls=JSONDecoder)
+        data = self.__codec.loads(request.content, snake_case=True)
 
         if isinstance(data, list) and len(data) > 0 and data[0] == "error":
             self.__handle_error(data)
@@ -61,7 +66,7 @@ class Middleware:
         body: Optional[Any] = None,
         params: Optional["_Params"] = None,
     ) -> Any:
-        _body = body and json.dumps(body, cls=JSONEncoder) or None
+        _body = body and self.__codec.dumps(body, adapt=True) or None
 
         headers = {"Accept": "application/json", "Content-Type": "application/json"}
 
@@ -79,7 +84,7 @@ class Middleware:
             timeout=Middleware.__TIMEOUT,
         )
 
-        data = request.json(cls=JSONDecoder)
+        data = self.__codec.loads(request.content, snake_case=True)
 
         if isinstance(data, list) and len(data) > 0 and data[0] == "error":
             self.__handle_error(data)
@@ -44,10 +44,9 @@ class RestAuthEndpoints(Interface):
         return serializers.UserInfo.parse(*self._m.post("auth/r/info/user"))
 
     def get_login_history(self) -> List[LoginHistory]:
-        return [
-            serializers.LoginHistory.parse(*sub_data)
-            for sub_data in self._m.post("auth/r/logins/hist")
-        ]
+        return self._parse_all(
+            serializers.LoginHistory, self._m.post("auth/r/logins/hist")
+        )
 
     def get_balance_available_for_orders_or_offers(
         self,
@@ -65,10 +64,7 @@ class RestAuthEndpoints(Interface):
         )
 
     def get_wallets(self) -> List[Wallet]:
-        return [
-            serializers.Wallet.parse(*sub_data)
-            for sub_data in self._m.post("auth/r/wallets")
-        ]
+        return self._parse_all(serializers.Wallet, self._m.post("auth/r/wallets"))
 
     def get_orders(
         self, *, symbol: Optional[str] = None, ids: Optional[List[str]] = None
@@ -78,10 +74,9 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/orders/{symbol}"
 
-        return [
-            serializers.Order.parse(*sub_data)
-            for sub_data in self._m.post(endpoint, body={"id": ids})
-        ]
+        return self._parse_all(
+            serializers.Order, self._m.post(endpoint, body={"id": ids})
+        )
 
     def submit_order(
         self,
@@ -198,16 +193,12 @@ class RestAuthEndpoints(Interface):
 
         body = {"id": ids, "start": start, "end": end, "limit": limit}
 
-        return [
-            serializers.Order.parse(*sub_data)
-            for sub_data in self._m.post(endpoint, body=body)
-        ]
+        return self._parse_all(serializers.Order, self._m.post(endpoint, body=body))
 
     def get_order_trades(self, symbol: str, id: int) -> List[OrderTrade]:
-        return [
-            serializers.OrderTrade.parse(*sub_data)
-            for sub_data in self._m.post(f"auth/r/order/{symbol}:{id}/trades")
-        ]
+        return self._parse_all(
+            serializers.OrderTrade, self._m.post(f"auth/r/order/{symbol}:{id}/trades")
+        )
 
     def get_trades_history(
         self,
@@ -225,10 +216,7 @@ class RestAuthEndpoints(Interface):
 
         body = {"sort": sort, "start": start, "end": end, "limit": limit}
 
-        return [
-            serializers.Trade.parse(*sub_data)
-            for sub_data in self._m.post(endpoint, body=body)
-        ]
+        return self._parse_all(serializers.Trade, self._m.post(endpoint, body=body))
 
     def get_ledgers(
         self,
@@ -246,10 +234,7 @@ class RestAuthEndpoints(Interface):
 
         body = {"category": category, "start": start, "end": end, "limit": limit}
 
-        return [
-            serializers.Ledger.parse(*sub_data)
-            for sub_data in self._m.post(endpoint, body=body)
-        ]
+        return self._parse_all(serializers.Ledger, self._m.post(endpoint, body=body))
 
     def get_base_margin_info(self) -> BaseMarginInfo:
         return serializers.BaseMarginInfo.parse(
@@ -262,16 +247,12 @@ class RestAuthEndpoints(Interface):
         )
 
     def get_all_symbols_margin_info(self) -> List[SymbolMarginInfo]:
-        return [
-            serializers.SymbolMarginInfo.parse(*sub_data)
-            for sub_data in self._m.post("auth/r/info/margin/sym_all")
-        ]
+        return self._parse_all(
+            serializers.SymbolMarginInfo, self._m.post("auth/r/info/margin/sym_all")
+        )
 
     def get_positions(self) -> List[Position]:
-        return [
-            serializers.Position.parse(*sub_data)
-            for sub_data in self._m.post("auth/r/positions")
-        ]
+        return self._parse_all(serializers.Position, self._m.post("auth/r/positions"))
 
     def claim_position(
         self, id: int, *, amount: Optional[Union[str, float, Decimal]] = None
@@ -306,13 +287,13 @@ class RestAuthEndpoints(Interface):
         end: Optional[str] = None,
         limit: Optional[int] = None,
     ) -> List[PositionHistory]:
-        return [
-            serializers.PositionHistory.parse(*sub_data)
-            for sub_data in self._m.post(
+        return self._parse_all(
+            serializers.PositionHistory,
+            self._m.post(
                 "auth/r/positions/hist",
                 body={"start": start, "end": end, "limit": limit},
-            )
-        ]
+            ),
+        )
 
     def get_positions_snapshot(
         self,
@@ -321,13 +302,13 @@ class RestAuthEndpoints(Interface):
         end: Optional[str] = None,
         limit: Optional[int] = None,
     ) -> List[PositionSnapshot]:
-        return [
-            serializers.PositionSnapshot.parse(*sub_data)
-            for sub_data in self._m.post(
+        return self._parse_all(
+            serializers.PositionSnapshot,
+            self._m.post(
                 "auth/r/positions/snap",
                 body={"start": start, "end": end, "limit": limit},
-            )
-        ]
+            ),
+        )
 
     def get_positions_audit(
         self,
@@ -339,10 +320,9 @@ class RestAuthEndpoints(Interface):
     ) -> List[PositionAudit]:
         body = {"ids": ids, "start": start, "end": end, "limit": limit}
 
-        return [
-            serializers.PositionAudit.parse(*sub_data)
-            for sub_data in self._m.post("auth/r/positions/audit", body=body)
-        ]
+        return self._parse_all(
+            serializers.PositionAudit, self._m.post("auth/r/positions/audit", body=body)
+        )
 
     def set_derivative_position_collateral(
         self, symbol: str, collateral: Union[str, float, Decimal]
@@ -369,10 +349,7 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/offers/{symbol}"
 
-        return [
-            serializers.FundingOffer.parse(*sub_data)
-            for sub_data in self._m.post(endpoint)
-        ]
+        return self._parse_all(serializers.FundingOffer, self._m.post(endpoint))
 
     def submit_funding_offer(
         self,
@@ -462,12 +439,10 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/offers/{symbol}/hist"
 
-        return [
-            serializers.FundingOffer.parse(*sub_data)
-            for sub_data in self._m.post(
-                endpoint, body={"start": start, "end": end, "limit": limit}
-            )
-        ]
+        return self._parse_all(
+            serializers.FundingOffer,
+            self._m.post(endpoint, body={"start": start, "end": end, "limit": limit}),
+        )
 
     def get_funding_loans(self, *, symbol: Optional[str] = None) -> List[FundingLoan]:
         if symbol is None:
@@ -475,10 +450,7 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/loans/{symbol}"
 
-        return [
-            serializers.FundingLoan.parse(*sub_data)
-            for sub_data in self._m.post(endpoint)
-        ]
+        return self._parse_all(serializers.FundingLoan, self._m.post(endpoint))
 
     def get_funding_loans_history(
         self,
@@ -493,12 +465,10 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/loans/{symbol}/hist"
 
-        return [
-            serializers.FundingLoan.parse(*sub_data)
-            for sub_data in self._m.post(
-                endpoint, body={"start": start, "end": end, "limit": limit}
-            )
-        ]
+        return self._parse_all(
+            serializers.FundingLoan,
+            self._m.post(endpoint, body={"start": start, "end": end, "limit": limit}),
+        )
 
     def get_funding_credits(
         self, *, symbol: Optional[str] = None
@@ -508,10 +478,7 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/credits/{symbol}"
 
-        return [
-            serializers.FundingCredit.parse(*sub_data)
-            for sub_data in self._m.post(endpoint)
-        ]
+        return self._parse_all(serializers.FundingCredit, self._m.post(endpoint))
 
     def get_funding_credits_history(
         self,
@@ -526,12 +493,10 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/funding/credits/{symbol}/hist"
 
-        return [
-            serializers.FundingCredit.parse(*sub_data)
-            for sub_data in self._m.post(
-                endpoint, body={"start": start, "end": end, "limit": limit}
-            )
-        ]
+        return self._parse_all(
+            serializers.FundingCredit,
+            self._m.post(endpoint, body={"start": start, "end": end, "limit": limit}),
+        )
 
     def get_funding_trades_history(
         self,
@@ -549,10 +514,9 @@ class RestAuthEndpoints(Interface):
 
         body = {"sort": sort, "start": start, "end": end, "limit": limit}
 
-        return [
-            serializers.FundingTrade.parse(*sub_data)
-            for sub_data in self._m.post(endpoint, body=body)
-        ]
+        return self._parse_all(
+            serializers.FundingTrade, self._m.post(endpoint, body=body)
+        )
 
     def get_funding_info(self, key: str) -> FundingInfo:
         return serializers.FundingInfo.parse(
@@ -626,9 +590,7 @@ class RestAuthEndpoints(Interface):
         else:
             endpoint = f"auth/r/movements/{currency}/hist"
 
-        return [
-            serializers.Movement.parse(*sub_data)
-            for sub_data in self._m.post(
-                endpoint, body={"start": start, "end": end, "limit": limit}
-            )
-        ]
+        return self._parse_all(
+            serializers.Movement,
+            self._m.post(endpoint, body={"start": start, "end": end, "limit": limit}),
+        )
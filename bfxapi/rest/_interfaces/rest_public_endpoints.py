@@ -96,9 +96,9 @@ class RestPublicEndpoints(Interface):
         end: Optional[str] = None,
         limit: Optional[int] = None,
     ) -> List[TickersHistory]:
-        return [
-            serializers.TickersHistory.parse(*sub_data)
-            for sub_data in self._m.get(
+        return self._parse_all(
+            serializers.TickersHistory,
+            self._m.get(
                 "tickers/hist",
                 params={
                     "symbols": ",".join(symbols),
@@ -106,8 +106,8 @@ class RestPublicEndpoints(Interface):
                     "end": end,
                     "limit": limit,
                 },
-            )
-        ]
+            ),
+        )
 
     def get_t_trades(
         self,
@@ -120,7 +120,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[TradingPairTrade]:
         params = {"limit": limit, "start": start, "end": end, "sort": sort}
         data = self._m.get(f"trades/{pair}/hist", params=params)
-        return [serializers.TradingPairTrade.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.TradingPairTrade, data)
 
     def get_f_trades(
         self,
@@ -133,7 +133,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[FundingCurrencyTrade]:
         params = {"limit": limit, "start": start, "end": end, "sort": sort}
         data = self._m.get(f"trades/{currency}/hist", params=params)
-        return [serializers.FundingCurrencyTrade.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.FundingCurrencyTrade, data)
 
     def get_t_book(
         self,
@@ -142,10 +142,10 @@ class RestPublicEndpoints(Interface):
         *,
         len: Optional[Literal[1, 25, 100]] = None,
     ) -> List[TradingPairBook]:
-        return [
-            serializers.TradingPairBook.parse(*sub_data)
-            for sub_data in self._m.get(f"book/{pair}/{precision}", params={"len": len})
-        ]
+        return self._parse_all(
+            serializers.TradingPairBook,
+            self._m.get(f"book/{pair}/{precision}", params={"len": len}),
+        )
 
     def get_f_book(
         self,
@@ -154,28 +154,26 @@ class RestPublicEndpoints(Interface):
         *,
         len: Optional[Literal[1, 25, 100]] = None,
     ) -> List[FundingCurrencyBook]:
-        return [
-            serializers.FundingCurrencyBook.parse(*sub_data)
-            for sub_data in self._m.get(
-                f"book/{currency}/{precision}", params={"len": len}
-            )
-        ]
+        return self._parse_all(
+            serializers.FundingCurrencyBook,
+            self._m.get(f"book/{currency}/{precision}", params={"len": len}),
+        )
 
     def get_t_raw_book(
         self, pair: str, *, len: Optional[Literal[1, 25, 100]] = None
     ) -> List[TradingPairRawBook]:
-        return [
-            serializers.TradingPairRawBook.parse(*sub_data)
-            for sub_data in self._m.get(f"book/{pair}/R0", params={"len": len})
-        ]
+        return self._parse_all(
+            serializers.TradingPairRawBook,
+            self._m.get(f"book/{pair}/R0", params={"len": len}),
+        )
 
     def get_f_raw_book(
         self, currency: str, *, len: Optional[Literal[1, 25, 100]] = None
     ) -> List[FundingCurrencyRawBook]:
-        return [
-            serializers.FundingCurrencyRawBook.parse(*sub_data)
-            for sub_data in self._m.get(f"book/{currency}/R0", params={"len": len})
-        ]
+        return self._parse_all(
+            serializers.FundingCurrencyRawBook,
+            self._m.get(f"book/{currency}/R0", params={"len": len}),
+        )
 
     def get_stats_hist(
         self,
@@ -188,7 +186,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[Statistic]:
         params = {"sort": sort, "start": start, "end": end, "limit": limit}
         data = self._m.get(f"stats1/{resource}/hist", params=params)
-        return [serializers.Statistic.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.Statistic, data)
 
     def get_stats_last(
         self,
@@ -215,7 +213,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[Candle]:
         params = {"sort": sort, "start": start, "end": end, "limit": limit}
         data = self._m.get(f"candles/trade:{tf}:{symbol}/hist", params=params)
-        return [serializers.Candle.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.Candle, data)
 
     def get_candles_last(
         self,
@@ -258,7 +256,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[DerivativesStatus]:
         params = {"sort": sort, "start": start, "end": end, "limit": limit}
         data = self._m.get(f"status/deriv/{key}/hist", params=params)
-        return [serializers.DerivativesStatus.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.DerivativesStatus, data)
 
     def get_liquidations(
         self,
@@ -284,7 +282,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[Candle]:
         params = {"sort": sort, "start": start, "end": end, "limit": limit}
         data = self._m.get(f"candles/trade:{tf}:{symbol}/hist", params=params)
-        return [serializers.Candle.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.Candle, data)
 
     def get_leaderboards_hist(
         self,
@@ -297,7 +295,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[Leaderboard]:
         params = {"sort": sort, "start": start, "end": end, "limit": limit}
         data = self._m.get(f"rankings/{resource}/hist", params=params)
-        return [serializers.Leaderboard.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.Leaderboard, data)
 
     def get_leaderboards_last(
         self,
@@ -322,7 +320,7 @@ class RestPublicEndpoints(Interface):
     ) -> List[FundingStatistic]:
         params = {"start": start, "end": end, "limit": limit}
         data = self._m.get(f"funding/stats/{symbol}/hist", params=params)
-        return [serializers.FundingStatistic.parse(*sub_data) for sub_data in data]
+        return self._parse_all(serializers.FundingStatistic, data)
 
     def get_pulse_profile_details(self, nickname: str) -> PulseProfile:
         return serializers.PulseProfile.parse(*self._m.get(f"pulse/profile/{nickname}"))
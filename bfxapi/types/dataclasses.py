@@ -1,16 +1,18 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional
 
-from .labeler import _Type, compose, partial
+from .labeler import _Type, compose, partial, slots
 
 # region Dataclass definitions for types of public use
 
 
+@slots
 @dataclass
 class PlatformStatus(_Type):
     status: int
 
 
+@slots
 @dataclass
 class TradingPairTicker(_Type):
     bid: float
@@ -25,6 +27,7 @@ class TradingPairTicker(_Type):
     low: float
 
 
+@slots
 @dataclass
 class FundingCurrencyTicker(_Type):
     frr: float
@@ -43,6 +46,7 @@ class FundingCurrencyTicker(_Type):
     frr_amount_available: float
 
 
+@slots
 @dataclass
 class TickersHistory(_Type):
     symbol: str
@@ -51,6 +55,7 @@ class TickersHistory(_Type):
     mts: int
 
 
+@slots
 @dataclass
 class TradingPairTrade(_Type):
     id: int
@@ -59,6 +64,7 @@ class TradingPairTrade(_Type):
     price: float
 
 
+@slots
 @dataclass
 class FundingCurrencyTrade(_Type):
     id: int
@@ -68,6 +74,7 @@ class FundingCurrencyTrade(_Type):
     period: int
 
 
+@slots
 @dataclass
 class TradingPairBook(_Type):
     price: float
@@ -75,6 +82,7 @@ class TradingPairBook(_Type):
     amount: float
 
 
+@slots
 @dataclass
 class FundingCurrencyBook(_Type):
     rate: float
@@ -83,6 +91,7 @@ class FundingCurrencyBook(_Type):
     amount: float
 
 
+@slots
 @dataclass
 class TradingPairRawBook(_Type):
     order_id: int
@@ -90,6 +99,7 @@ class TradingPairRawBook(_Type):
     amount: float
 
 
+@slots
 @dataclass
 class FundingCurrencyRawBook(_Type):
     offer_id: int
@@ -98,12 +108,14 @@ class FundingCurrencyRawBook(_Type):
     amount: float
 
 
+@slots
 @dataclass
 class Statistic(_Type):
     mts: int
     value: float
 
 
+@slots
 @dataclass
 class Candle(_Type):
     mts: int
@@ -114,6 +126,7 @@ class Candle(_Type):
     volume: float
 
 
+@slots
 @dataclass
 class DerivativesStatus(_Type):
     mts: int
@@ -130,6 +143,7 @@ class DerivativesStatus(_Type):
     clamp_max: float
 
 
+@slots
 @dataclass
 class Liquidation(_Type):
     pos_id: int
@@ -142,6 +156,7 @@ class Liquidation(_Type):
     liquidation_price: float
 
 
+@slots
 @dataclass
 class Leaderboard(_Type):
     mts: int
@@ -151,6 +166,7 @@ class Leaderboard(_Type):
     twitter_handle: Optional[str]
 
 
+@slots
 @dataclass
 class FundingStatistic(_Type):
     mts: int
@@ -161,6 +177,7 @@ class FundingStatistic(_Type):
     funding_below_threshold: float
 
 
+@slots
 @dataclass
 class PulseProfile(_Type):
     puid: str
@@ -174,6 +191,7 @@ class PulseProfile(_Type):
     tipping_status: int
 
 
+@slots
 @dataclass
 class PulseMessage(_Type):
     pid: str
@@ -192,18 +210,21 @@ class PulseMessage(_Type):
     comments: int
 
 
+@slots
 @dataclass
 class TradingMarketAveragePrice(_Type):
     price_avg: float
     amount: float
 
 
+@slots
 @dataclass
 class FundingMarketAveragePrice(_Type):
     rate_avg: float
     amount: float
 
 
+@slots
 @dataclass
 class FxRate(_Type):
     current_rate: float
@@ -214,6 +235,7 @@ class FxRate(_Type):
 # region Dataclass definitions for types of auth use
 
 
+@slots
 @dataclass
 class UserInfo(_Type):
     id: int
@@ -246,6 +268,7 @@ class UserInfo(_Type):
     is_merchant_enterprise: int
 
 
+@slots
 @dataclass
 class LoginHistory(_Type):
     id: int
@@ -254,11 +277,13 @@ class LoginHistory(_Type):
     extra_info: Dict[str, Any]
 
 
+@slots
 @dataclass
 class BalanceAvailable(_Type):
     amount: float
 
 
+@slots
 @dataclass
 class Order(_Type):
     id: int
@@ -285,6 +310,7 @@ class Order(_Type):
     meta: Dict[str, Any]
 
 
+@slots
 @dataclass
 class Position(_Type):
     symbol: str
@@ -306,6 +332,7 @@ class Position(_Type):
     meta: Dict[str, Any]
 
 
+@slots
 @dataclass
 class Trade(_Type):
     id: int
@@ -322,6 +349,7 @@ class Trade(_Type):
     cid: int
 
 
+@slots
 @dataclass()
 class FundingTrade(_Type):
     id: int
@@ -333,6 +361,7 @@ class FundingTrade(_Type):
     period: int
 
 
+@slots
 @dataclass
 class OrderTrade(_Type):
     id: int
@@ -347,6 +376,7 @@ class OrderTrade(_Type):
     cid: int
 
 
+@slots
 @dataclass
 class Ledger(_Type):
     id: int
@@ -357,6 +387,7 @@ class Ledger(_Type):
     description: str
 
 
+@slots
 @dataclass
 class FundingOffer(_Type):
     id: int
@@ -375,6 +406,7 @@ class FundingOffer(_Type):
     renew: int
 
 
+@slots
 @dataclass
 class FundingCredit(_Type):
     id: int
@@ -397,6 +429,7 @@ class FundingCredit(_Type):
     position_pair: str
 
 
+@slots
 @dataclass
 class FundingLoan(_Type):
     id: int
@@ -418,6 +451,7 @@ class FundingLoan(_Type):
     no_close: int
 
 
+@slots
 @dataclass
 class FundingAutoRenew(_Type):
     currency: str
@@ -426,6 +460,7 @@ class FundingAutoRenew(_Type):
     threshold: float
 
 
+@slots
 @dataclass()
 class FundingInfo(_Type):
     symbol: str
@@ -435,6 +470,7 @@ class FundingInfo(_Type):
     duration_lend: float
 
 
+@slots
 @dataclass
 class Wallet(_Type):
     wallet_type: str
@@ -446,6 +482,7 @@ class Wallet(_Type):
     trade_details: Dict[str, Any]
 
 
+@slots
 @dataclass
 class Transfer(_Type):
     mts: int
@@ -456,6 +493,7 @@ class Transfer(_Type):
     amount: int
 
 
+@slots
 @dataclass
 class Withdrawal(_Type):
     withdrawal_id: int
@@ -466,6 +504,7 @@ class Withdrawal(_Type):
     withdrawal_fee: float
 
 
+@slots
 @dataclass
 class DepositAddress(_Type):
     method: str
@@ -474,6 +513,7 @@ class DepositAddress(_Type):
     pool_address: str
 
 
+@slots
 @dataclass
 class LightningNetworkInvoice(_Type):
     invoice_hash: str
@@ -481,6 +521,7 @@ class LightningNetworkInvoice(_Type):
     amount: str
 
 
+@slots
 @dataclass
 class Movement(_Type):
     id: str
@@ -496,6 +537,7 @@ class Movement(_Type):
     withdraw_transaction_note: str
 
 
+@slots
 @dataclass
 class SymbolMarginInfo(_Type):
     symbol: str
@@ -505,6 +547,7 @@ class SymbolMarginInfo(_Type):
     sell: float
 
 
+@slots
 @dataclass
 class BaseMarginInfo(_Type):
     user_pl: float
@@ -514,6 +557,7 @@ class BaseMarginInfo(_Type):
     margin_min: float
 
 
+@slots
 @dataclass
 class PositionClaim(_Type):
     symbol: str
@@ -531,6 +575,7 @@ class PositionClaim(_Type):
     meta: Dict[str, Any]
 
 
+@slots
 @dataclass
 class PositionIncreaseInfo(_Type):
     max_pos: int
@@ -547,6 +592,7 @@ class PositionIncreaseInfo(_Type):
     funding_required_currency: str
 
 
+@slots
 @dataclass
 class PositionIncrease(_Type):
     symbol: str
@@ -554,6 +600,7 @@ class PositionIncrease(_Type):
     base_price: float
 
 
+@slots
 @dataclass
 class PositionHistory(_Type):
     symbol: str
@@ -567,6 +614,7 @@ class PositionHistory(_Type):
     mts_update: int
 
 
+@slots
 @dataclass
 class PositionSnapshot(_Type):
     symbol: str
@@ -580,6 +628,7 @@ class PositionSnapshot(_Type):
     mts_update: int
 
 
+@slots
 @dataclass
 class PositionAudit(_Type):
     symbol: str
@@ -597,17 +646,20 @@ class PositionAudit(_Type):
     meta: Dict[str, Any]
 
 
+@slots
 @dataclass
 class DerivativePositionCollateral(_Type):
     status: int
 
 
+@slots
 @dataclass
 class DerivativePositionCollateralLimits(_Type):
     min_collateral: float
     max_collateral: float
 
 
+@slots
 @dataclass
 class BalanceInfo(_Type):
     aum: float
@@ -619,6 +671,7 @@ class BalanceInfo(_Type):
 # region Dataclass definitions for types of merchant use
 
 
+@slots
 @compose(dataclass, partial)
 class InvoiceSubmission(_Type):
     id: str
@@ -659,6 +712,7 @@ class InvoiceSubmission(_Type):
 
         return InvoiceSubmission(**data)
 
+    @slots
     @compose(dataclass, partial)
     class CustomerInfo:
         nationality: str
@@ -672,6 +726,7 @@ class InvoiceSubmission(_Type):
         email: str
         tos_accepted: bool
 
+    @slots
     @compose(dataclass, partial)
     class Invoice:
         amount: float
@@ -681,6 +736,7 @@ class InvoiceSubmission(_Type):
         address: str
         ext: Dict[str, Any]
 
+    @slots
     @compose(dataclass, partial)
     class Payment:
         txid: str
@@ -697,6 +753,7 @@ class InvoiceSubmission(_Type):
         amount_diff: str
 
 
+@slots
 @dataclass
 class InvoicePage(_Type):
     page: int
@@ -715,12 +772,14 @@ class InvoicePage(_Type):
         return InvoicePage(**data)
 
 
+@slots
 @dataclass
 class InvoiceStats(_Type):
     time: str
     count: float
 
 
+@slots
 @dataclass
 class CurrencyConversion(_Type):
     base_ccy: str
@@ -728,6 +787,7 @@ class CurrencyConversion(_Type):
     created: int
 
 
+@slots
 @dataclass
 class MerchantDeposit(_Type):
     id: int
@@ -742,6 +802,7 @@ class MerchantDeposit(_Type):
     pay_method: str
 
 
+@slots
 @dataclass
 class MerchantUnlinkedDeposit(_Type):
     id: int
@@ -1,7 +1,22 @@
-from typing import Any, Dict, Generic, Iterable, List, Tuple, Type, TypeVar, cast
+from dataclasses import fields
+from keyword import iskeyword
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 T = TypeVar("T", bound="_Type")
 
+_C = TypeVar("_C", bound=type)
+
 
 def compose(*decorators):
     def wrapper(function):
@@ -33,11 +48,32 @@ def partial(cls):
     return cls
 
 
+def slots(cls: _C) -> _C:
+    """
+    Rebuild a dataclass with __slots__ (backport of @dataclass(slots=True)).
+
+    Must be applied on top of @dataclass (or of compose(dataclass, partial)):
+    instances of the returned class don't carry a per-instance __dict__.
+    """
+
+    names = tuple(field.name for field in fields(cls))
+
+    # __qualname__ isn't part of __dict__ (nested types must keep it for pickle)
+    namespace = dict(cls.__dict__, __slots__=names, __qualname__=cls.__qualname__)
+
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+
+    return cast(_C, type(cls)(cls.__name__, cls.__bases__, namespace))
+
+
 class _Type:
     """
     Base class for any dataclass serializable by the _Serializer generic class.
     """
 
+    __slots__ = ()
+
 
 class _Serializer(Generic[T]):
     def __init__(
@@ -45,35 +81,92 @@ class _Serializer(Generic[T]):
     ):
         self.name, self.klass, self.__labels, self.__flat = name, klass, labels, flat
 
-    def _serialize(self, *args: Any) -> Iterable[Tuple[str, Any]]:
-        if self.__flat:
-            args = tuple(_Serializer.__flatten(list(args)))
+        key = (name, klass, tuple(labels), flat)
 
-        if len(self.__labels) > len(args):
-            raise AssertionError(
-                f"{self.name} -> <labels> and <*args> "
-                "arguments should contain the same amount of elements."
-            )
+        if key not in _COMPILED:
+            _COMPILED[key] = _compile(name, klass, labels, flat)
+
+        self._serialize, parse = _COMPILED[key]
 
-        for index, label in enumerate(self.__labels):
-            if label != "_PLACEHOLDER":
-                yield label, args[index]
+        if type(self).parse is _Serializer.parse:
+            self.parse = parse  # type: ignore[method-assign]
 
     def parse(self, *values: Any) -> T:
-        return cast(T, self.klass(**dict(self._serialize(*values))))
+        return cast(T, self.klass(**self._serialize(*values)))
 
     def get_labels(self) -> List[str]:
         return [label for label in self.__labels if label != "_PLACEHOLDER"]
 
-    @classmethod
-    def __flatten(cls, array: List[Any]) -> List[Any]:
-        if len(array) == 0:
-            return array
 
-        if isinstance(array[0], list):
-            return cls.__flatten(array[0]) + cls.__flatten(array[1:])
+_Compiled = Tuple[Callable[..., Dict[str, Any]], Callable[..., Any]]
+
+_COMPILED: Dict[Tuple[str, Type[_Type], Tuple[str, ...], bool], _Compiled] = {}
+
+
+def _compile(name: str, klass: Type[_Type], labels: List[str], flat: bool) -> _Compiled:
+    """
+    Generate specialised <_serialize> and <parse> functions for a type.
+
+    Index positions are resolved once (skipping the _PLACEHOLDER labels),
+    so parsing a message neither scans the labels nor builds intermediate
+    generators: it is a single call with fixed argument lookups.
+    """
+
+    fields = [
+        (label, index) for index, label in enumerate(labels) if label != "_PLACEHOLDER"
+    ]
+
+    items = ", ".join(f"{label!r}: args[{index}]" for label, index in fields)
+
+    if all(label.isidentifier() and not iskeyword(label) for label, _ in fields):
+        kwargs = ", ".join(f"{label}=args[{index}]" for label, index in fields)
+    else:
+        kwargs = f"**{{{items}}}"
+
+    prologue = (
+        ("    args = _flatten(args)\n" if flat else "")
+        + f"    if len(args) < {len(labels)}:\n"
+        + "        raise AssertionError(message)\n"
+    )
+
+    source = (
+        f"def _serialize(*args):\n{prologue}    return {{{items}}}\n"
+        f"def parse(*args):\n{prologue}    return klass({kwargs})\n"
+    )
+
+    namespace: Dict[str, Any] = {
+        "_flatten": _flatten,
+        "klass": klass,
+        "message": f"{name} -> <labels> and <*args> "
+        "arguments should contain the same amount of elements.",
+    }
+
+    exec(source, namespace)
+
+    return namespace["_serialize"], namespace["parse"]
+
+
+def _flatten(array: Sequence[Any]) -> List[Any]:
+    """
+    Iteratively flatten nested lists (depth-first, left to right).
+    """
+
+    flat: List[Any] = []
+
+    stack = [iter(array)]
+
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+
+                break
+
+            flat.append(item)
+        else:
+            stack.pop()
 
-        return array[:1] + cls.__flatten(array[1:])
+    return flat
 
 
 class _RecursiveSerializer(_Serializer, Generic[T]):
@@ -91,7 +184,7 @@ class _RecursiveSerializer(_Serializer, Generic[T]):
         self.serializers = serializers
 
     def parse(self, *values: Any) -> T:
-        serialization = dict(self._serialize(*values))
+        serialization = self._serialize(*values)
 
         for key in serialization:
             if key in self.serializers.keys():
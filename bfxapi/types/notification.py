@@ -1,11 +1,12 @@
 from dataclasses import dataclass
 from typing import Any, Generic, List, Optional, TypeVar, cast
 
-from .labeler import _Serializer, _Type
+from .labeler import _Serializer, _Type, slots
 
 T = TypeVar("T")
 
 
+@slots
 @dataclass
 class Notification(_Type, Generic[T]):
     mts: int
@@ -37,9 +38,7 @@ class _Notification(_Serializer, Generic[T]):
         self.serializer, self.is_iterable = serializer, is_iterable
 
     def parse(self, *values: Any) -> Notification[T]:
-        notification = cast(
-            Notification[T], Notification(**dict(self._serialize(*values)))
-        )
+        notification = cast(Notification[T], Notification(**self._serialize(*values)))
 
         if isinstance(self.serializer, _Serializer):
             data = cast(List[Any], notification.data)
@@ -1,11 +1,18 @@
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Any, List, Optional, TypeVar
+
 from . import dataclasses
 from .labeler import (  # noqa: F401
     _Serializer,
+    _Type,
     generate_labeler_serializer,
     generate_recursive_serializer,
 )
 from .notification import _Notification  # noqa: F401
 
+T = TypeVar("T", bound=_Type)
+
 __serializers__ = [
     "PlatformStatus",
     "TradingPairTicker",
@@ -911,3 +918,51 @@ BalanceInfo = generate_labeler_serializer(
 )
 
 # endregion
+
+# region Bulk parsing (optionally in a pool of workers)
+
+# Smaller batches are parsed in place: offloading them costs more than parsing
+_OFFLOAD_MIN_ITEMS = 100
+
+_CHUNK_SIZE = 500
+
+
+def _parse_many(name: str, items: List[List[Any]]) -> List[Any]:
+    """
+    Parse each of <items> with the serializer called <name>.
+
+    Serializers are looked up by name, so that this function (and its
+    arguments) can be sent to a process pool.
+    """
+
+    parse = globals()[name].parse
+
+    return [parse(*item) for item in items]
+
+
+def _parse_all(
+    serializer: _Serializer[T], items: List[List[Any]], executor: Optional[Executor]
+) -> List[T]:
+    """
+    Parse each of <items> with <serializer>: large batches are split in
+    chunks and parsed by <executor> (if any), e.g. a ProcessPoolExecutor.
+    """
+
+    if executor is None or len(items) < _OFFLOAD_MIN_ITEMS:
+        parse = serializer.parse
+
+        return [parse(*item) for item in items]
+
+    chunks = [
+        items[index : index + _CHUNK_SIZE]
+        for index in range(0, len(items), _CHUNK_SIZE)
+    ]
+
+    return [
+        item
+        for chunk in executor.map(_parse_many, repeat(serializer.name), chunks)
+        for item in chunk
+    ]
+
+
+# endregion
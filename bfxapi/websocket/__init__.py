@@ -1 +1,14 @@
-from ._client import BfxWebSocketClient
+from ._client import BfxWebSocketClient, BfxWebSocketGateway, BfxWebSocketStream, Update
+from ._order_book import (
+    BookSnapshot,
+    BookView,
+    OrderBook,
+    OrderBookManager,
+    RawOrderBook,
+    SharedOrderBookPublisher,
+    SharedOrderBookReader,
+)
+from .flags import ConfFlag
+from .metrics import PrometheusExporter
+from .probe import Probe, Stages
+from .timestamps import Timestamps, get_timestamps
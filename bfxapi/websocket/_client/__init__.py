@@ -1 +1,3 @@
 from .bfx_websocket_client import BfxWebSocketClient
+from .bfx_websocket_gateway import BfxWebSocketGateway
+from .bfx_websocket_stream import BfxWebSocketStream, Update
@@ -1,17 +1,36 @@
 import asyncio
-import json
+import itertools
+import time
 import uuid
-from typing import Any, Dict, List, Optional, cast
+from collections import Counter
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, cast
 
-import websockets.client
-from pyee import EventEmitter
-
-from bfxapi._utils.json_decoder import JSONDecoder
+from bfxapi._utils.histogram import Histogram
+from bfxapi._utils.json_codec import JSONCodec
 from bfxapi.websocket._connection import Connection
-from bfxapi.websocket._handlers import PublicChannelsHandler
-from bfxapi.websocket.subscriptions import Subscription
+from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket._handlers import ChannelState, Conflator, PublicChannelsHandler
+from bfxapi.websocket._handlers.public_channels_handler import (
+    Handler,
+    Holders,
+    ParseState,
+)
+from bfxapi.websocket.exceptions import SubscriptionError
+from bfxapi.websocket.flags import ConfFlag
+from bfxapi.websocket.metrics import BucketStats, SubscriptionStats
+from bfxapi.websocket.probe import Probe
+from bfxapi.websocket.subscriptions import Subscription, _params
+from bfxapi.websocket.timestamps import _TIMESTAMPS, Timestamps
+
+from .bfx_websocket_stream import BfxWebSocketStream, Overflow
+
+if TYPE_CHECKING:
+    from .bfx_websocket_recovery import RecoveryScheduler
 
-_CHECKSUM_FLAG_VALUE = 131_072
+
+# Stable ids of the buckets (e.g. for the labels of their metrics)
+_IDS = itertools.count()
 
 
 def _strip(message: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
@@ -21,16 +40,65 @@ def _strip(message: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
 class BfxWebSocketBucket(Connection):
     __MAXIMUM_SUBSCRIPTIONS_AMOUNT = 25
 
-    def __init__(self, host: str, event_emitter: EventEmitter) -> None:
+    def __init__(
+        self,
+        host: str,
+        event_emitter: BfxEventEmitter,
+        codec: JSONCodec,
+        conf_flags: int = ConfFlag.OB_CHECKSUM,
+        *,
+        resubscribe_on_gap: bool = False,
+        probe: Optional[Probe] = None,
+        executor: Optional[Executor] = None,
+        recovery: Optional["RecoveryScheduler"] = None,
+        on_refused: Optional[Callable[[str], None]] = None,
+    ) -> None:
         super().__init__(host)
 
-        self.__event_emitter = event_emitter
-        self.__pendings: List[Dict[str, Any]] = []
+        self.__id = next(_IDS)
+
+        self.__event_emitter, self.__codec = event_emitter, codec
+        self.__conf_flags = conf_flags
+        self.__resubscribe_on_gap, self.__probe = resubscribe_on_gap, probe
+        self.__recovery, self.__on_refused = recovery, on_refused
+        self.__pendings: Dict[str, Dict[str, Any]] = {}
         self.__subscriptions: Dict[int, Subscription] = {}
+        self.__chan_ids: Dict[str, int] = {}
+        self.__handlers: Dict[int, Handler] = {}
+        self.__states: Dict[int, ChannelState] = {}
+        self.__parsing: Dict[int, ParseState] = {}
+
+        # Upstream sub_id -> sub_ids sharing its channel (itself included)
+        self.__holders: Dict[str, List[str]] = {}
+        self.__upstreams: Dict[str, str] = {}
+
+        self.__confirmations: Dict[str, "asyncio.Future[Subscription]"] = {}
+
+        self.__raw: Set[str] = set()
+
+        self.__conflated: Set[str] = set()
+        self.__conflator = Conflator()
+
+        # Public sequence numbers are shared by all channels of a connection
+        self.__sequencing = bool(conf_flags & ConfFlag.SEQ_ALL)
+        self.__sequence: Optional[int] = None
+
+        self.__timestamping = bool(conf_flags & ConfFlag.TIMESTAMP)
+        self.__latencies: Dict[int, Histogram] = {}
+
+        self.__created = time.monotonic()
+        self.__messages, self.__bytes = 0, 0
+        self.__counts: Counter[int] = Counter()
+        self.__subscribed_at: Dict[int, float] = {}
+
+        self.__streams: Dict[str, BfxWebSocketStream] = {}
+        self.__blocking: List[BfxWebSocketStream] = []
 
         self.__condition = asyncio.locks.Condition()
 
-        self.__handler = PublicChannelsHandler(event_emitter=self.__event_emitter)
+        self.__handler = PublicChannelsHandler(
+            event_emitter=self.__event_emitter, probe=probe, executor=executor
+        )
 
     @property
     def count(self) -> int:
@@ -40,35 +108,185 @@ class BfxWebSocketBucket(Connection):
     def is_full(self) -> bool:
         return self.count == BfxWebSocketBucket.__MAXIMUM_SUBSCRIPTIONS_AMOUNT
 
+    @property
+    def available(self) -> int:
+        return BfxWebSocketBucket.__MAXIMUM_SUBSCRIPTIONS_AMOUNT - self.count
+
     @property
     def ids(self) -> List[str]:
-        return [pending["subId"] for pending in self.__pendings] + [
-            subscription["sub_id"] for subscription in self.__subscriptions.values()
-        ]
+        return list(
+            dict.fromkeys([*self.__pendings, *self.__chan_ids, *self.__upstreams])
+        )
 
     async def start(self) -> None:
-        async with websockets.client.connect(self._host) as websocket:
+        async with Connection._connect(self._host) as websocket:
             self._websocket = websocket
 
+            self.__sequence = None
+
             await self.__recover_state()
 
             async with self.__condition:
                 self.__condition.notify(1)
 
+            probe, counts, blocking = self.__probe, self.__counts, self.__blocking
+
+            emitter, states = self.__event_emitter, self.__states
+
+            # Frames are only timestamped for get_timestamps and the probe
+            timed = self.__timestamping or probe is not None
+
             async for _message in self._websocket:
-                message = json.loads(_message, cls=JSONDecoder)
+                if timed:
+                    received = time.time() * 1_000
+
+                self.__messages += 1
+
+                self.__bytes += len(_message)
+
+                if probe is not None:
+                    started = time.perf_counter_ns()
+
+                message = self.__codec.loads(_message, snake_case=True)
+
+                if probe is not None:
+                    probe._decoded(started, time.perf_counter_ns())
 
                 if isinstance(message, dict):
                     if message["event"] == "subscribed":
                         self.__on_subscribed(message)
+                    elif message["event"] == "error":
+                        self.__on_error(message)
 
                 if isinstance(message, list):
-                    if (
-                        (chan_id := cast(int, message[0]))
-                        and (subscription := self.__subscriptions.get(chan_id))
-                        and (message[1] != Connection._HEARTBEAT)
+                    timestamp: Optional[int] = None
+
+                    # The timestamp (if any) is always the last element
+                    if self.__timestamping and message[1] != Connection._HEARTBEAT:
+                        timestamp = cast(int, message.pop())
+
+                        if (histogram := self.__latencies.get(message[0])) is not None:
+                            histogram.record(received - timestamp)
+
+                    if self.__sequencing:
+                        self.__check_sequence(message)
+
+                    if timed:
+                        _TIMESTAMPS.set(Timestamps(timestamp, received))
+
+                    counts[message[0]] += 1
+
+                    if (handler := self.__handlers.get(message[0])) and (
+                        message[1] != Connection._HEARTBEAT
                     ):
-                        self.__handler.handle(subscription, message[1:])
+                        if (state := states.get(message[0])) is not None:
+                            state.apply(message)
+
+                        handler(message)
+
+                # Inline dispatch: await coroutine handlers before reading on
+                if emitter._pending:
+                    await emitter._drain()
+
+                # Stop reading frames until blocking streams have room again
+                for stream in blocking:
+                    if stream.full:
+                        await stream._wait_writable()
+
+    def __resolve(self, chan_id: int) -> None:
+        subscription = self.__subscriptions[chan_id]
+
+        sub_id = subscription["sub_id"]
+
+        sink, holders = None, self.__holders.get(sub_id, [sub_id])
+
+        # Rebuilt handlers (e.g. once holders change) keep parsing where they were
+        if (state := self.__parsing.get(chan_id)) is None:
+            state = self.__parsing[chan_id] = ParseState()
+
+        if holders == [sub_id]:
+            if (stream := self.__streams.get(sub_id)) is not None:
+                sink = stream._put
+
+            handler = self.__handler.resolve(
+                subscription, raw=sub_id in self.__raw, sink=sink, state=state
+            )
+        else:
+            handler = self.__handler.resolve(
+                subscription,
+                raw=sub_id in self.__raw,
+                holders=self.__sinks(subscription),
+                state=state,
+            )
+
+        if handler:
+            if sub_id in self.__conflated:
+                handler = self.__conflator.wrap(chan_id, subscription, handler)
+
+            self.__handlers[chan_id] = handler
+        else:
+            self.__handlers.pop(chan_id, None)
+
+    def __sinks(self, subscription: Subscription) -> Holders:
+        sinks = []
+
+        for holder in self.__holders_of(subscription):
+            stream = self.__streams.get(holder["sub_id"])
+
+            sinks.append((holder, stream._put if stream is not None else None))
+
+        return sinks
+
+    def __holders_of(self, subscription: Subscription) -> List[Subscription]:
+        sub_id = subscription["sub_id"]
+
+        if (holders := self.__holders.get(sub_id, [sub_id])) == [sub_id]:
+            return [subscription]
+
+        return [
+            cast(Subscription, dict(subscription, sub_id=holder)) for holder in holders
+        ]
+
+    def __check_sequence(self, message: List[Any]) -> None:
+        if message[1] == Connection._HEARTBEAT:
+            sequence = cast(int, message[2])
+        else:
+            sequence = cast(int, message.pop())
+
+        if self.__sequence is not None and sequence != self.__sequence + 1:
+            self.__on_sequence_gap(self.__sequence + 1, sequence)
+
+        self.__sequence = sequence
+
+    def __on_sequence_gap(self, expected: int, received: int) -> None:
+        # Any channel of the connection could have lost (or reordered) frames
+        subscriptions = list(self.__subscriptions.values())
+
+        for subscription in subscriptions:
+            for holder in self.__holders_of(subscription):
+                self.__event_emitter.emit("sequence_gap", holder, expected, received)
+
+        if self.__resubscribe_on_gap:
+            task = asyncio.ensure_future(
+                self.__resubscribe_all(
+                    [subscription["sub_id"] for subscription in subscriptions]
+                )
+            )
+
+            task.add_done_callback(self.__on_resubscribe_done)
+
+    async def __resubscribe_all(self, sub_ids: List[str]) -> None:
+        for sub_id in sub_ids:
+            # Subscriptions could have been removed (or restarted) meanwhile
+            if sub_id in self.__holders and sub_id in self.__chan_ids:
+                for holder in self.__holders[sub_id]:
+                    self.__event_emitter._forget(holder)
+
+                await self.__resubscribe(sub_id)
+
+    def __on_resubscribe_done(self, task: "asyncio.Future[None]") -> None:
+        if not task.cancelled() and (exception := task.exception()):
+            self.__event_emitter.emit("error", exception)
 
     def __on_subscribed(self, message: Dict[str, Any]) -> None:
         chan_id = cast(int, message["chan_id"])
@@ -77,74 +295,442 @@ class BfxWebSocketBucket(Connection):
             Subscription, _strip(message, keys=["chan_id", "event", "pair", "currency"])
         )
 
-        self.__pendings = [
-            pending
-            for pending in self.__pendings
-            if pending["subId"] != message["sub_id"]
-        ]
+        self.__pendings.pop(message["sub_id"], None)
+
+        if self.__recovery is not None:
+            self.__recovery._on_answer(message["sub_id"])
 
         self.__subscriptions[chan_id] = subscription
 
-        self.__event_emitter.emit("subscribed", subscription)
+        self.__chan_ids[subscription["sub_id"]] = chan_id
+
+        self.__counts[chan_id], self.__subscribed_at[chan_id] = 0, time.monotonic()
+
+        # Only shared channels keep a state (for their late holders)
+        if (
+            len(self.__holders.get(message["sub_id"], [])) > 1
+            and (params := _params(subscription)) is not None
+        ):
+            self.__states[chan_id] = ChannelState(
+                params, bulk_updates=bool(self.__conf_flags & ConfFlag.BULK_UPDATES)
+            )
+
+        self.__resolve(chan_id)
+
+        if self.__timestamping:
+            self.__latencies[chan_id] = Histogram()
+
+        for holder in self.__holders_of(subscription):
+            self.__event_emitter.emit("subscribed", holder)
+
+            self.__confirm(holder)
+
+    def __on_error(self, message: Dict[str, Any]) -> None:
+        if (sub_id := message.get("sub_id")) not in self.__pendings:
+            # Otherwise, the pending subscription with the same parameters
+            if (params := _params(message)) is None:
+                return
+
+            for pending in self.__pendings.values():
+                if _params(pending) == params:
+                    sub_id = pending["subId"]
+
+                    break
+            else:
+                return
+
+        del self.__pendings[sub_id]
+
+        if self.__recovery is not None:
+            self.__recovery._on_answer(sub_id, failed=True)
+
+        self.__raw.discard(sub_id)
+
+        self.__conflated.discard(sub_id)
+
+        for holder in self.__holders.pop(sub_id, [sub_id]):
+            self.__upstreams.pop(holder, None)
+
+            if (stream := self.__streams.get(holder)) is not None:
+                stream.close()
+
+            # E.g. refused again after a reconnection
+            if self.__on_refused is not None:
+                self.__on_refused(holder)
+
+            error = SubscriptionError(holder, message.get("code"), message.get("msg"))
+
+            if (future := self.__confirmations.pop(holder, None)) is None:
+                self.__event_emitter.emit("error", error)
+            elif not future.done():
+                future.set_exception(error)
+
+    def confirmation(self, sub_id: str) -> "asyncio.Future[Subscription]":
+        """
+        Return a future resolved with the subscription <sub_id> once the
+        exchange confirms it (or failed with a SubscriptionError).
+        """
+
+        future = asyncio.get_event_loop().create_future()
+
+        self.__confirmations[sub_id] = future
+
+        return future
+
+    def __confirm(self, subscription: Subscription) -> None:
+        future = self.__confirmations.pop(subscription["sub_id"], None)
+
+        if future is not None and not future.done():
+            future.set_result(subscription)
 
     async def __recover_state(self) -> None:
-        for pending in self.__pendings:
-            await self._websocket.send(message=json.dumps(pending))
+        # Flags only apply to the frames sent after the server receives them.
+        await self.__set_config(self.__conf_flags)
 
         for chan_id in list(self.__subscriptions.keys()):
             subscription = self.__subscriptions.pop(chan_id)
 
-            await self.subscribe(**subscription)
+            del self.__chan_ids[subscription["sub_id"]]
+
+            self.__forget(chan_id)
 
-        await self.__set_config([_CHECKSUM_FLAG_VALUE])
+            self.__register(**subscription)
 
-    async def __set_config(self, flags: List[int]) -> None:
-        await self._websocket.send(json.dumps({"event": "conf", "flags": sum(flags)}))
+        requests = list(self.__pendings.values())
+
+        if self.__recovery is not None:
+            return self.__recovery.schedule(self, requests)
+
+        for request in requests:
+            await self._websocket.send(message=self.__codec.dumps(request))
+
+    async def _resend(self, request: Dict[str, Any]) -> bool:
+        """
+        Send again the subscribe <request> scheduled by the recovery, unless
+        it isn't pending anymore.
+        """
+
+        if self.__pendings.get(request["subId"]) is not request:
+            return False
+
+        await self._websocket.send(message=self.__codec.dumps(request))
+
+        return True
+
+    async def __set_config(self, flags: int) -> None:
+        await self._websocket.send(
+            self.__codec.dumps({"event": "conf", "flags": int(flags)})
+        )
 
     @Connection._require_websocket_connection
     async def subscribe(
-        self, channel: str, sub_id: Optional[str] = None, **kwargs: Any
+        self,
+        channel: str,
+        sub_id: Optional[str] = None,
+        *,
+        raw: Optional[bool] = None,
+        conflate: Optional[bool] = None,
+        **kwargs: Any,
     ) -> None:
+        subscription = self.__register(
+            channel, sub_id, raw=raw, conflate=conflate, **kwargs
+        )
+
+        await self._websocket.send(message=self.__codec.dumps(subscription))
+
+    def __register(
+        self,
+        channel: str,
+        sub_id: Optional[str] = None,
+        *,
+        raw: Optional[bool] = None,
+        conflate: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
         subscription: Dict[str, Any] = {
             **kwargs,
             "event": "subscribe",
             "channel": channel,
         }
 
-        subscription["subId"] = sub_id or str(uuid.uuid4())
+        subscription["subId"] = sub_id = sub_id or str(uuid.uuid4())
+
+        if raw is not None:
+            if raw:
+                self.__raw.add(subscription["subId"])
+            else:
+                self.__raw.discard(subscription["subId"])
+
+        if conflate is not None:
+            if conflate:
+                self.__conflated.add(subscription["subId"])
+            else:
+                self.__conflated.discard(subscription["subId"])
+
+        if sub_id not in self.__holders:
+            self.__holders[sub_id] = [sub_id]
+
+            self.__upstreams[sub_id] = sub_id
+
+        self.__pendings[sub_id] = subscription
+
+        return subscription
+
+    def share(self, upstream: str, sub_id: str) -> None:
+        """
+        Add <sub_id> as a holder of the channel of <upstream>: its frames are
+        parsed once and their events emitted for each holder. A holder joining
+        an active channel gets a snapshot rebuilt from the channel's state.
+        """
+
+        # The upstream subscription could be sent right after
+        if upstream not in self.__holders:
+            self.__holders[upstream], self.__upstreams[upstream] = [upstream], upstream
+
+        self.__holders[upstream].append(sub_id)
+
+        self.__upstreams[sub_id] = upstream
+
+        if (chan_id := self.__chan_ids.get(upstream)) is not None:
+            self.__join(chan_id, self.__subscriptions[chan_id], sub_id)
+
+    def refcount(self, sub_id: str) -> int:
+        upstream = self.__upstreams.get(sub_id, sub_id)
+
+        return len(self.__holders.get(upstream, [sub_id]))
 
-        self.__pendings.append(subscription)
+    def __join(self, chan_id: int, subscription: Subscription, sub_id: str) -> None:
+        # The holders must have been sent the conflated updates first
+        self.__conflator.flush(chan_id)
 
-        await self._websocket.send(message=json.dumps(subscription))
+        # The channel wasn't shared until now: its state is rebuilt from a
+        # fresh snapshot, sent to all of its holders
+        if chan_id not in self.__states and _params(subscription) is not None:
+            task = asyncio.ensure_future(
+                self.__resubscribe_all([subscription["sub_id"]])
+            )
+
+            return task.add_done_callback(self.__on_resubscribe_done)
+
+        holder = cast(Subscription, dict(subscription, sub_id=sub_id))
+
+        self.__event_emitter.emit("subscribed", holder)
+
+        self.__confirm(holder)
+
+        stream = self.__streams.get(sub_id)
+
+        if (state := self.__states.get(chan_id)) is not None and (
+            handler := self.__handler.resolve(
+                holder,
+                raw=subscription["sub_id"] in self.__raw,
+                sink=stream._put if stream is not None else None,
+                offload=False,
+            )
+        ):
+            for payload in state.payloads():
+                handler([chan_id, *payload])
+
+        self.__resolve(chan_id)
 
     @Connection._require_websocket_connection
     async def unsubscribe(self, sub_id: str) -> None:
-        for chan_id, subscription in list(self.__subscriptions.items()):
-            if subscription["sub_id"] == sub_id:
-                unsubscription = {"event": "unsubscribe", "chanId": chan_id}
+        if (upstream := self.__upstreams.get(sub_id)) is None:
+            return
+
+        holders = self.__holders[upstream]
+
+        if len(holders) > 1:
+            return self.__leave(upstream, sub_id)
+
+        for holder in holders:
+            if (stream := self.__streams.get(holder)) is not None:
+                stream.close()
+
+            self.__upstreams.pop(holder, None)
+
+        self.__holders.pop(upstream, None)
+
+        await self.__unsubscribe(upstream)
+
+    def __leave(self, upstream: str, sub_id: str) -> None:
+        (holders := self.__holders[upstream]).remove(sub_id)
+
+        del self.__upstreams[sub_id]
+
+        if (stream := self.__streams.get(sub_id)) is not None:
+            stream.close()
+
+        # The channel is kept under another holder: <sub_id> can be used again
+        if sub_id == upstream:
+            self.__rekey(upstream, upstream := holders[0])
+
+        if len(holders) == 1 and (chan_id := self.__chan_ids.get(upstream)) is not None:
+            self.__states.pop(chan_id, None)
+
+        self.__refresh(upstream)
+
+    def __rekey(self, sub_id: str, upstream: str) -> None:
+        self.__holders[upstream] = holders = self.__holders.pop(sub_id)
+
+        for holder in holders:
+            self.__upstreams[holder] = upstream
+
+        for sub_ids in (self.__raw, self.__conflated):
+            if sub_id in sub_ids:
+                sub_ids.remove(sub_id)
 
-                del self.__subscriptions[chan_id]
+                sub_ids.add(upstream)
 
-                await self._websocket.send(message=json.dumps(unsubscription))
+        if (chan_id := self.__chan_ids.pop(sub_id, None)) is not None:
+            self.__chan_ids[upstream] = chan_id
+
+            self.__subscriptions[chan_id] = cast(
+                Subscription, dict(self.__subscriptions[chan_id], sub_id=upstream)
+            )
+
+        if (request := self.__pendings.pop(sub_id, None)) is not None:
+            request["subId"] = upstream
+
+            self.__pendings[upstream] = request
+
+    def upstream(self, sub_id: str) -> Optional[str]:
+        """
+        Return the sub_id the channel of <sub_id> is subscribed with.
+        """
+
+        return self.__upstreams.get(sub_id)
+
+    async def __unsubscribe(self, sub_id: str) -> None:
+        if (chan_id := self.__chan_ids.pop(sub_id, None)) is not None:
+            unsubscription = {"event": "unsubscribe", "chanId": chan_id}
+
+            del self.__subscriptions[chan_id]
+
+            self.__forget(chan_id)
+
+            self.__raw.discard(sub_id)
+
+            self.__conflated.discard(sub_id)
+
+            await self._websocket.send(message=self.__codec.dumps(unsubscription))
 
     @Connection._require_websocket_connection
     async def resubscribe(self, sub_id: str) -> None:
-        for subscription in list(self.__subscriptions.values()):
-            if subscription["sub_id"] == sub_id:
-                await self.unsubscribe(sub_id)
+        if (upstream := self.__upstreams.get(sub_id)) is not None:
+            await self.__resubscribe(upstream)
+
+    async def __resubscribe(self, sub_id: str) -> None:
+        if (chan_id := self.__chan_ids.get(sub_id)) is not None:
+            subscription = self.__subscriptions[chan_id]
 
-                await self.subscribe(**subscription)
+            raw, conflate = sub_id in self.__raw, sub_id in self.__conflated
+
+            # Holders (and their streams) are kept
+            await self.__unsubscribe(sub_id)
+
+            await self.subscribe(**subscription, raw=raw, conflate=conflate)
 
     @Connection._require_websocket_connection
     async def close(self, code: int = 1000, reason: str = "") -> None:
+        for stream in list(self.__streams.values()):
+            stream.close()
+
+        for future in self.__confirmations.values():
+            future.cancel()
+
+        self.__confirmations.clear()
+
+        if self.__recovery is not None:
+            self.__recovery.discard(self)
+
         await self._websocket.close(code, reason)
 
-    def has(self, sub_id: str) -> bool:
-        for subscription in self.__subscriptions.values():
-            if subscription["sub_id"] == sub_id:
-                return True
+    def stream(
+        self, sub_id: str, *, maxsize: int = 1_024, overflow: Overflow = "block"
+    ) -> BfxWebSocketStream:
+        if (stream := self.__streams.get(sub_id)) is not None:
+            stream.close()
+
+        stream = BfxWebSocketStream(
+            sub_id, maxsize=maxsize, overflow=overflow, on_close=self.__on_stream_close
+        )
+
+        self.__streams[sub_id] = stream
+
+        if overflow == "block":
+            self.__blocking.append(stream)
 
-        return False
+        self.__refresh(self.__upstreams.get(sub_id, sub_id))
+
+        return stream
+
+    def __on_stream_close(self, stream: BfxWebSocketStream) -> None:
+        if stream in self.__blocking:
+            self.__blocking.remove(stream)
+
+        if self.__streams.get(stream.sub_id) is stream:
+            del self.__streams[stream.sub_id]
+
+            self.__refresh(self.__upstreams.get(stream.sub_id, stream.sub_id))
+
+    def __refresh(self, sub_id: str) -> None:
+        if (chan_id := self.__chan_ids.get(sub_id)) is not None:
+            self.__resolve(chan_id)
+
+    def stats(self) -> BucketStats:
+        now = time.monotonic()
+
+        subscriptions: List[SubscriptionStats] = [
+            {
+                "sub_id": subscription["sub_id"],
+                "channel": subscription["channel"],
+                "messages": self.__counts[chan_id],
+                "conflated": self.__conflator.conflated(chan_id),
+                "rate": self.__counts[chan_id]
+                / max(now - self.__subscribed_at[chan_id], 1e-9),
+            }
+            for chan_id, subscription in self.__subscriptions.items()
+        ]
+
+        return {
+            "id": self.__id,
+            "open": self.open,
+            "messages": self.__messages,
+            "bytes": self.__bytes,
+            "rate": self.__messages / max(now - self.__created, 1e-9),
+            "pendings": len(self.__pendings),
+            "subscriptions": subscriptions,
+        }
+
+    def __forget(self, chan_id: int) -> None:
+        self.__handlers.pop(chan_id, None)
+
+        self.__states.pop(chan_id, None)
+
+        if (state := self.__parsing.pop(chan_id, None)) is not None:
+            state.close()
+
+        self.__conflator.discard(chan_id)
+
+        self.__latencies.pop(chan_id, None)
+
+        self.__counts.pop(chan_id, None)
+
+        self.__subscribed_at.pop(chan_id, None)
+
+    def latency(self, sub_id: str) -> Optional[Histogram]:
+        if (upstream := self.__upstreams.get(sub_id)) is None or (
+            chan_id := self.__chan_ids.get(upstream)
+        ) is None:
+            return None
+
+        return self.__latencies.get(chan_id)
+
+    def has(self, sub_id: str) -> bool:
+        return (upstream := self.__upstreams.get(sub_id)) is not None and (
+            upstream in self.__chan_ids
+        )
 
     async def wait(self) -> None:
         async with self.__condition:
@@ -1,21 +1,35 @@
 import asyncio
-import json
 import random
+import time
 import traceback
+import uuid
 from asyncio import Task
+from concurrent.futures import Executor
 from datetime import datetime
 from logging import Logger
 from socket import gaierror
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import websockets
-import websockets.client
 from websockets.exceptions import ConnectionClosedError, InvalidStatusCode
 
-from bfxapi._utils.json_encoder import JSONEncoder
+from bfxapi._utils.histogram import Histogram
+from bfxapi._utils.json_codec import JSONCodec, get_default_codec
+from bfxapi._utils.rate_limiter import RateLimiter
 from bfxapi.exceptions import InvalidCredentialError
 from bfxapi.websocket._connection import Connection
-from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket._event_emitter import BfxEventEmitter, Dispatch
 from bfxapi.websocket._handlers import AuthEventsHandler
 from bfxapi.websocket.exceptions import (
     ReconnectionTimeoutError,
@@ -24,9 +38,17 @@ from bfxapi.websocket.exceptions import (
     UnknownSubscriptionError,
     VersionMismatchError,
 )
+from bfxapi.websocket.flags import ConfFlag
+from bfxapi.websocket.metrics import ClientStats, StageStats
+from bfxapi.websocket.probe import Probe
+from bfxapi.websocket.subscriptions import Subscription, _params
+from bfxapi.websocket.timestamps import _TIMESTAMPS, Timestamps
 
 from .bfx_websocket_bucket import BfxWebSocketBucket
 from .bfx_websocket_inputs import BfxWebSocketInputs
+from .bfx_websocket_recovery import Priority, RecoveryScheduler
+from .bfx_websocket_shard import BfxWebSocketShard, BfxWebSocketShardedBucket
+from .bfx_websocket_stream import BfxWebSocketStream, Overflow
 
 _Credentials = TypedDict(
     "_Credentials", {"api_key": str, "api_secret": str, "filters": Optional[List[str]]}
@@ -36,9 +58,27 @@ _Reconnection = TypedDict(
     "_Reconnection", {"attempts": int, "reason": str, "timestamp": datetime}
 )
 
+_Bucket = Union[BfxWebSocketBucket, BfxWebSocketShardedBucket]
+
+# Channel parameters, raw and conflate
+_Key = Tuple[Tuple[Tuple[str, str], ...], bool, bool]
+
+# Channel, sub_id, raw, conflate and the other arguments of subscribe
+_Request = Tuple[str, str, bool, bool, Dict[str, Any]]
+
+# The exchange accepts up to 20 connections per minute
+_CONNECTIONS = (20, 60.0)
+
 _DEFAULT_LOGGER = Logger("bfxapi.websocket._client", level=0)
 
 
+def _key(subscription: Dict[str, Any], raw: bool, conflate: bool) -> Optional[_Key]:
+    if (params := _params(subscription)) is None:
+        return None
+
+    return tuple(sorted(params.items())), raw, conflate
+
+
 class _Delay:
     __BACKOFF_MIN = 1.92
 
@@ -75,19 +115,63 @@ class BfxWebSocketClient(Connection):
         credentials: Optional[_Credentials] = None,
         timeout: Optional[int] = 60 * 15,
         logger: Logger = _DEFAULT_LOGGER,
+        codec: Optional[JSONCodec] = None,
+        conf_flags: int = ConfFlag.OB_CHECKSUM,
+        resubscribe_on_gap: bool = False,
+        probe: Optional[Probe] = None,
+        dispatch: Dispatch = "schedule",
+        handler_timeout: Optional[float] = None,
+        shards: int = 0,
+        executor: Optional[Executor] = None,
+        recovery_rate: Optional[int] = None,
+        recovery_priority: Optional[Priority] = None,
     ) -> None:
         super().__init__(host)
 
         self.__credentials, self.__timeout, self.__logger = credentials, timeout, logger
 
-        self.__buckets: Dict[BfxWebSocketBucket, Optional[Task]] = {}
+        self.__codec, self.__conf_flags = codec or get_default_codec(), conf_flags
+
+        self.__resubscribe_on_gap, self.__probe = resubscribe_on_gap, probe
+
+        self.__buckets: Dict[_Bucket, Optional[Task]] = {}
+
+        self.__opening: Optional["asyncio.Future[None]"] = None
+
+        # Bucket of each sub_id (buckets are kept across reconnections)
+        self.__index: Dict[str, _Bucket] = {}
+
+        # Channel key of each sub_id and the (upstream) subscription to share
+        self.__keys: Dict[str, _Key] = {}
+        self.__shares: Dict[_Key, Tuple[BfxWebSocketBucket, str]] = {}
+
+        self.__connections = RateLimiter(*_CONNECTIONS)
+
+        self.__shards_amount, self.__executor = shards, executor
+
+        self.__shards: List[BfxWebSocketShard] = []
 
         self.__reconnection: Optional[_Reconnection] = None
 
-        self.__event_emitter = BfxEventEmitter(loop=None)
+        self.__reconnections, self.__downtime = 0, 0.0
+
+        self.__last_downtime: Optional[float] = None
+
+        self.__event_emitter = BfxEventEmitter(
+            loop=None, dispatch=dispatch, timeout=handler_timeout
+        )
 
         self.__handler = AuthEventsHandler(event_emitter=self.__event_emitter)
 
+        # Subscribe requests sent by the client (and its recovery) per second
+        self.__requests = (
+            RateLimiter(recovery_rate, 1.0) if recovery_rate is not None else None
+        )
+
+        self.__recovery = RecoveryScheduler(
+            self.__event_emitter, limiter=self.__requests, priority=recovery_priority
+        )
+
         self.__inputs = BfxWebSocketInputs(
             handle_websocket_input=self.__handle_websocket_input
         )
@@ -208,7 +292,10 @@ class BfxWebSocketClient(Connection):
                 break
 
     async def __connect(self) -> None:
-        async with websockets.client.connect(self._host) as websocket:
+        # The authenticated connection counts against the same limit
+        await self.__connections.acquire()
+
+        async with Connection._connect(self._host) as websocket:
             if self.__reconnection:
                 self.__logger.warning(
                     "Reconnection attempt successful (no."
@@ -216,17 +303,17 @@ class BfxWebSocketClient(Connection):
                     "connection state..."
                 )
 
-                self.__reconnection = None
+                downtime = datetime.now() - self.__reconnection["timestamp"]
 
-            self._websocket = websocket
+                self.__reconnections += 1
 
-            for bucket in self.__buckets:
-                self.__buckets[bucket] = asyncio.create_task(bucket.start())
+                self.__last_downtime = downtime.total_seconds()
 
-            if len(self.__buckets) == 0 or (
-                await asyncio.gather(*[bucket.wait() for bucket in self.__buckets])
-            ):
-                self.__event_emitter.emit("open")
+                self.__downtime += self.__last_downtime
+
+                self.__reconnection = None
+
+            self._websocket = websocket
 
             if self.__credentials:
                 authentication = Connection._get_authentication_message(
@@ -235,8 +322,25 @@ class BfxWebSocketClient(Connection):
 
                 await self._websocket.send(authentication)
 
+            # Bucket restarts may be throttled: calls on a bucket wait for it
+            for bucket in self.__buckets:
+                self.__buckets[bucket] = asyncio.create_task(self.__restart(bucket))
+
+            if self.__opening is not None:
+                self.__opening.cancel()
+
+            # "open" once the buckets are ready, without holding the frames
+            self.__opening = asyncio.ensure_future(self.__open(list(self.__buckets)))
+
+            timed = (
+                bool(self.__conf_flags & ConfFlag.TIMESTAMP) or self.__probe is not None
+            )
+
             async for _message in self._websocket:
-                message = json.loads(_message)
+                if timed:
+                    received = time.time() * 1_000
+
+                message = self.__codec.loads(_message)
 
                 if isinstance(message, dict):
                     if message["event"] == "info" and "version" in message:
@@ -268,48 +372,330 @@ class BfxWebSocketClient(Connection):
                     and message[0] == 0
                     and message[1] != Connection._HEARTBEAT
                 ):
+                    if timed:
+                        _TIMESTAMPS.set(Timestamps(None, received))
+
                     self.__handler.handle(message[1], message[2])
 
-    async def __new_bucket(self) -> BfxWebSocketBucket:
-        bucket = BfxWebSocketBucket(self._host, self.__event_emitter)
+                if self.__event_emitter._pending:
+                    await self.__event_emitter._drain()
+
+    async def __open(self, buckets: List[_Bucket]) -> None:
+        await asyncio.gather(*[bucket.wait() for bucket in buckets])
+
+        self.__event_emitter.emit("open")
+
+    async def __new_bucket(self) -> _Bucket:
+        bucket = self.__create_bucket()
+
+        await self.__open_bucket(bucket)
+
+        return bucket
+
+    def __create_bucket(self) -> _Bucket:
+        if self.__shards_amount > 0:
+            return self.__new_shard_bucket()
+
+        return BfxWebSocketBucket(
+            self._host,
+            self.__event_emitter,
+            self.__codec,
+            self.__conf_flags,
+            resubscribe_on_gap=self.__resubscribe_on_gap,
+            probe=self.__probe,
+            executor=self.__executor,
+            recovery=self.__recovery,
+            on_refused=self.__release,
+        )
+
+    async def __open_bucket(self, bucket: _Bucket) -> None:
+        await self.__connections.acquire()
 
         self.__buckets[bucket] = asyncio.create_task(bucket.start())
 
         await bucket.wait()
 
-        return bucket
+    async def __restart(self, bucket: _Bucket) -> None:
+        await self.__connections.acquire()
+
+        await bucket.start()
+
+    def __new_shard_bucket(self) -> BfxWebSocketShardedBucket:
+        # Worker processes are started lazily, then buckets are balanced
+        if len(self.__shards) < self.__shards_amount:
+            shard = BfxWebSocketShard(
+                self._host,
+                self.__event_emitter,
+                self.__codec,
+                self.__conf_flags,
+                resubscribe_on_gap=self.__resubscribe_on_gap,
+            )
+
+            self.__shards.append(shard)
+        else:
+            shard = min(self.__shards, key=lambda shard: shard.count)
+
+        return shard.bucket(on_refused=self.__release)
 
     @Connection._require_websocket_connection
     async def subscribe(
-        self, channel: str, sub_id: Optional[str] = None, **kwargs: Any
+        self,
+        channel: str,
+        sub_id: Optional[str] = None,
+        *,
+        raw: bool = False,
+        conflate: bool = False,
+        **kwargs: Any,
     ) -> None:
+        BfxWebSocketClient.__check(channel)
+
+        if sub_id in self.__index:
+            raise SubIdError("sub_id must be unique for all subscriptions.")
+
+        sub_id = sub_id or str(uuid.uuid4())
+
+        key = _key({**kwargs, "channel": channel}, raw, conflate)
+
+        if self.__share(sub_id, key, report=True):
+            return
+
+        for bucket in self.__buckets:
+            if not bucket.is_full:
+                break
+        else:
+            bucket = await self.__new_bucket()
+
+        self.__register(bucket, sub_id, key, report=True)
+
+        await bucket.wait()
+
+        return await bucket.subscribe(
+            channel, sub_id, raw=raw, conflate=conflate, **kwargs
+        )
+
+    @Connection._require_websocket_connection
+    async def subscribe_many(
+        self,
+        subscriptions: Iterable[Mapping[str, Any]],
+        *,
+        rate: Optional[int] = None,
+        on_register: Optional[Callable[[str], None]] = None,
+    ) -> List["asyncio.Future[Subscription]"]:
+        """
+        Subscribe to many channels at once (each one described by the
+        arguments of BfxWebSocketClient::subscribe, channel included).
+
+        Missing buckets are opened concurrently, then the requests of each
+        bucket are sent without waiting for their confirmations (at most
+        <rate> per second for all buckets, if given, and within the limit
+        shared with the recovery).
+
+        <on_register> (if given) is called with the sub_id of each subscription
+        before any of its frames is handled (e.g. to open its stream).
+
+        Return the futures of the confirmations (in the same order): each one
+        is resolved with its subscription, or failed with a SubscriptionError.
+        """
+
+        requests: List[_Request] = []
+
+        for subscription in subscriptions:
+            kwargs = dict(subscription)
+
+            channel, sub_id = kwargs.pop("channel", None), kwargs.pop("sub_id", None)
+
+            BfxWebSocketClient.__check(channel)
+
+            if sub_id in self.__index:
+                raise SubIdError("sub_id must be unique for all subscriptions.")
+
+            raw, conflate = kwargs.pop("raw", False), kwargs.pop("conflate", False)
+
+            requests.append(
+                (channel, sub_id or str(uuid.uuid4()), raw, conflate, kwargs)
+            )
+
+        if len({request[1] for request in requests}) != len(requests):
+            raise SubIdError("sub_id must be unique for all subscriptions.")
+
+        keys = [
+            _key({**kwargs, "channel": channel}, raw, conflate)
+            for channel, _, raw, conflate, kwargs in requests
+        ]
+
+        # Requests which need a slot (the other ones share a channel)
+        slots, shared = 0, set(self.__shares)
+
+        for key in keys:
+            if key is None or self.__shards_amount > 0 or key not in shared:
+                slots += 1
+
+                if key is not None:
+                    shared.add(key)
+
+        rooms = {bucket: bucket.available for bucket in self.__buckets}
+
+        buckets: List[_Bucket] = []
+
+        while slots > sum(rooms.values()):
+            bucket = self.__create_bucket()
+
+            rooms[bucket] = bucket.available
+
+            buckets.append(bucket)
+
+        await asyncio.gather(*[self.__open_bucket(bucket) for bucket in buckets])
+
+        batches: Dict[_Bucket, List[_Request]] = {}
+
+        futures: List["asyncio.Future[Subscription]"] = []
+
+        for request, key in zip(requests, keys):
+            future = self.__share(
+                request[1], key, report=False, on_register=on_register
+            )
+
+            if future is None:
+                bucket = next(bucket for bucket, room in rooms.items() if room > 0)
+
+                rooms[bucket] -= 1
+
+                future = self.__register(bucket, request[1], key, report=False)
+
+                if on_register is not None:
+                    on_register(request[1])
+
+                batches.setdefault(bucket, []).append(request)
+
+            futures.append(future)
+
+        limiters = [RateLimiter(rate, 1.0)] if rate is not None else []
+
+        if self.__requests is not None:
+            limiters.append(self.__requests)
+
+        async def _send(bucket: _Bucket, batch: List[_Request]) -> None:
+            await bucket.wait()
+
+            for channel, sub_id, raw, conflate, kwargs in batch:
+                for limiter in limiters:
+                    await limiter.acquire()
+
+                await bucket.subscribe(
+                    channel, sub_id, raw=raw, conflate=conflate, **kwargs
+                )
+
+        await asyncio.gather(
+            *[_send(bucket, batch) for bucket, batch in batches.items()]
+        )
+
+        return futures
+
+    @staticmethod
+    def __check(channel: Optional[str]) -> None:
         if channel not in ["ticker", "trades", "book", "candles", "status"]:
             raise UnknownChannelError(
                 "Available channels are: ticker, trades, book, candles and status."
             )
 
-        for bucket in self.__buckets:
-            if sub_id in bucket.ids:
-                raise SubIdError("sub_id must be unique for all subscriptions.")
+    def __share(
+        self,
+        sub_id: str,
+        key: Optional[_Key],
+        *,
+        report: bool,
+        on_register: Optional[Callable[[str], None]] = None,
+    ) -> Optional["asyncio.Future[Subscription]"]:
+        # Identical subscriptions share the same channel (and its frames),
+        # except across the worker processes of sharded clients
+        if key is None or (share := self.__shares.get(key)) is None:
+            return None
 
-        for bucket in self.__buckets:
-            if not bucket.is_full:
-                return await bucket.subscribe(channel, sub_id, **kwargs)
+        owner, upstream = share
+
+        self.__index[sub_id], self.__keys[sub_id] = owner, key
+
+        future = self.__confirmation(owner, sub_id, report=report)
+
+        # Joining an active channel replays its state right away
+        if on_register is not None:
+            on_register(sub_id)
+
+        owner.share(upstream, sub_id)
 
-        bucket = await self.__new_bucket()
+        return future
 
-        return await bucket.subscribe(channel, sub_id, **kwargs)
+    def __register(
+        self, bucket: _Bucket, sub_id: str, key: Optional[_Key], *, report: bool
+    ) -> "asyncio.Future[Subscription]":
+        self.__index[sub_id] = bucket
+
+        if key is not None and isinstance(bucket, BfxWebSocketBucket):
+            self.__keys[sub_id], self.__shares[key] = key, (bucket, sub_id)
+
+        return self.__confirmation(bucket, sub_id, report=report)
+
+    def __confirmation(
+        self, bucket: _Bucket, sub_id: str, *, report: bool
+    ) -> "asyncio.Future[Subscription]":
+        future = bucket.confirmation(sub_id)
+
+        future.add_done_callback(
+            lambda future: self.__on_confirmation(sub_id, future, report)
+        )
+
+        return future
+
+    def __on_confirmation(
+        self, sub_id: str, future: "asyncio.Future[Subscription]", report: bool
+    ) -> None:
+        if future.cancelled() or (error := future.exception()) is None:
+            return
+
+        if report:
+            self.__event_emitter.emit("error", error)
+
+    def __release(self, sub_id: str) -> None:
+        # The exchange refused the subscription: its sub_id can be used again
+        self.__index.pop(sub_id, None)
+
+        if (key := self.__keys.pop(sub_id, None)) is not None and (
+            self.__shares.get(key, (None, None))[1] == sub_id
+        ):
+            del self.__shares[key]
 
     @Connection._require_websocket_connection
     async def unsubscribe(self, sub_id: str) -> None:
-        for bucket in self.__buckets:
-            if bucket.has(sub_id):
-                if bucket.count == 1:
-                    del self.__buckets[bucket]
+        if (bucket := self.__index.get(sub_id)) is not None and bucket.has(sub_id):
+            await bucket.wait()
+
+            last = bucket.refcount(sub_id) == 1
+
+            del self.__index[sub_id]
+
+            # The sub_id can be used again (e.g. for another channel)
+            self.__event_emitter._forget(sub_id)
+
+            if (key := self.__keys.pop(sub_id, None)) is not None and last:
+                del self.__shares[key]
+
+            if bucket.count == 1 and last:
+                del self.__buckets[bucket]
+
+                return await bucket.close(code=1001, reason="Going Away")
+
+            await bucket.unsubscribe(sub_id)
+
+            # The bucket keeps the channel under one of its other holders
+            if key is not None and not last:
+                if (owner := self.__shares[key])[1] == sub_id:
+                    holder = next(
+                        _id for _id, _key in self.__keys.items() if _key == key
+                    )
 
-                    return await bucket.close(code=1001, reason="Going Away")
+                    self.__shares[key] = (owner[0], str(owner[0].upstream(holder)))
 
-                return await bucket.unsubscribe(sub_id)
+            return
 
         raise UnknownSubscriptionError(
             f"Unable to find a subscription with sub_id <{sub_id}>."
@@ -317,9 +703,67 @@ class BfxWebSocketClient(Connection):
 
     @Connection._require_websocket_connection
     async def resubscribe(self, sub_id: str) -> None:
-        for bucket in self.__buckets:
-            if bucket.has(sub_id):
-                return await bucket.resubscribe(sub_id)
+        if (bucket := self.__index.get(sub_id)) is not None and bucket.has(sub_id):
+            await bucket.wait()
+
+            return await bucket.resubscribe(sub_id)
+
+        raise UnknownSubscriptionError(
+            f"Unable to find a subscription with sub_id <{sub_id}>."
+        )
+
+    def stream(
+        self, sub_id: str, *, maxsize: int = 1_024, overflow: Overflow = "block"
+    ) -> BfxWebSocketStream:
+        """
+        Return an async iterator over the updates of a subscription.
+
+        Updates are queued in a bounded queue (of <maxsize> updates) with the
+        given <overflow> policy: block, drop_oldest or conflate.
+        """
+
+        if (bucket := self.__index.get(sub_id)) is not None:
+            return bucket.stream(sub_id, maxsize=maxsize, overflow=overflow)
+
+        raise UnknownSubscriptionError(
+            f"Unable to find a subscription with sub_id <{sub_id}>."
+        )
+
+    def stats(self) -> ClientStats:
+        stages: Optional[Dict[str, Dict[str, StageStats]]] = None
+
+        if self.__probe is not None:
+            stages = {
+                channel: {
+                    stage: {
+                        "count": len(histogram),
+                        "mean": histogram.mean,
+                        "p50": histogram.percentile(50),
+                        "p99": histogram.percentile(99),
+                    }
+                    for stage, histogram in histograms.items()
+                }
+                for channel, histograms in self.__probe.channels.items()
+            }
+
+        return {
+            "open": self.open,
+            "reconnections": self.__reconnections,
+            "reconnecting": self.__reconnection is not None,
+            "downtime": self.__downtime,
+            "last_downtime": self.__last_downtime,
+            "buckets": [bucket.stats() for bucket in self.__buckets],
+            "stages": stages,
+        }
+
+    def latency(self, sub_id: str) -> Optional[Histogram]:
+        """
+        Return the rolling histogram of the exchange-to-client latency (in
+        milliseconds) of a subscription (requires ConfFlag.TIMESTAMP).
+        """
+
+        if (bucket := self.__index.get(sub_id)) is not None and bucket.has(sub_id):
+            return bucket.latency(sub_id)
 
         raise UnknownSubscriptionError(
             f"Unable to find a subscription with sub_id <{sub_id}>."
@@ -327,8 +771,20 @@ class BfxWebSocketClient(Connection):
 
     @Connection._require_websocket_connection
     async def close(self, code: int = 1000, reason: str = "") -> None:
-        for bucket in self.__buckets:
-            await bucket.close(code=code, reason=reason)
+        if self.__opening is not None:
+            self.__opening.cancel()
+
+        for bucket, task in self.__buckets.items():
+            if bucket.open:
+                await bucket.close(code=code, reason=reason)
+            elif task is not None:
+                # Still waiting to reconnect
+                task.cancel()
+
+        for shard in self.__shards:
+            await shard.close()
+
+        self.__shards.clear()
 
         if self._websocket.open:
             await self._websocket.close(code=code, reason=reason)
@@ -338,14 +794,16 @@ class BfxWebSocketClient(Connection):
         self, info: Any, message_id: Optional[int] = None, **kwargs: Any
     ) -> None:
         await self._websocket.send(
-            json.dumps(
+            self.__codec.dumps(
                 [0, "n", message_id, {"type": "ucm-test", "info": info, **kwargs}]
             )
         )
 
     @Connection._require_websocket_authentication
     async def __handle_websocket_input(self, event: str, data: Any) -> None:
-        await self._websocket.send(json.dumps([0, event, None, data], cls=JSONEncoder))
+        await self._websocket.send(
+            self.__codec.dumps([0, event, None, data], adapt=True)
+        )
 
     def on(self, event, callback=None):
         return self.__event_emitter.on(event, callback)
@@ -0,0 +1,460 @@
+import asyncio
+import itertools
+import time
+import uuid
+from collections import deque
+from logging import Logger
+from typing import Any, Deque, Dict, List, Optional, Tuple, cast
+from urllib.parse import urlparse
+
+import websockets.server
+from websockets.exceptions import ConnectionClosed
+from websockets.server import WebSocketServerProtocol
+
+from bfxapi._utils.json_codec import JSONCodec, get_default_codec
+from bfxapi.websocket._connection import _UNIX_SCHEME
+from bfxapi.websocket._handlers import ChannelState
+from bfxapi.websocket.exceptions import SubscriptionError
+from bfxapi.websocket.flags import ConfFlag
+from bfxapi.websocket.metrics import GatewayStats
+from bfxapi.websocket.subscriptions import Subscription, _params
+
+from .bfx_websocket_client import BfxWebSocketClient
+from .bfx_websocket_stream import BfxWebSocketStream, Update
+
+_DEFAULT_LOGGER = Logger("bfxapi.websocket._client.gateway", level=0)
+
+_Key = Tuple[Tuple[str, str], ...]
+
+_INFO = {"event": "info", "version": 2, "serverId": "bfxapi-gateway"}
+
+# Checksums are always forwarded: the other flags change the layout of frames
+_FLAGS = ConfFlag.OB_CHECKSUM
+
+
+class _Session:
+    """
+    A client of the gateway: frames are queued and written by a dedicated
+    task, so that a slow client never delays the other ones.
+    """
+
+    def __init__(self, websocket: WebSocketServerProtocol, maxsize: int) -> None:
+        self.websocket, self.maxsize = websocket, maxsize
+
+        # Gateway's chan_id -> client's sub_id
+        self.channels: Dict[int, str] = {}
+
+        self.__queue: Deque[str] = deque()
+
+        self.__readable = asyncio.Event()
+
+        self.__closed = False
+
+    def send(self, text: str) -> None:
+        if self.__closed:
+            return
+
+        if len(self.__queue) >= self.maxsize:
+            self.__closed = True
+
+            # Clients reconnect (and subscribe again) on 1012
+            asyncio.ensure_future(
+                self.websocket.close(1012, "Slow consumer (please reconnect).")
+            )
+
+            return
+
+        self.__queue.append(text)
+
+        self.__readable.set()
+
+    async def write(self) -> None:
+        queue, websocket = self.__queue, self.websocket
+
+        while True:
+            await self.__readable.wait()
+
+            self.__readable.clear()
+
+            while queue:
+                try:
+                    await websocket.send(queue.popleft())
+                except ConnectionClosed:
+                    return
+
+
+class _Channel:
+    def __init__(self, chan_id: int, params: Dict[str, str]) -> None:
+        self.chan_id, self.params = chan_id, params
+
+        self.sub_id = str(uuid.uuid4())
+
+        self.state = ChannelState(params)
+
+        self.sessions: Dict[_Session, None] = {}
+
+        self.subscribed = False
+
+        self.stream: Optional[BfxWebSocketStream] = None
+
+
+class BfxWebSocketGateway:
+    """
+    Serve the public channels of one upstream connection set to many local
+    clients (e.g. one BfxWebSocketClient per service), over a TCP or a Unix
+    socket, speaking the same protocol as the exchange.
+
+    Identical subscriptions are reference counted: each unique channel is
+    subscribed upstream once, when the first client subscribes to it, and
+    unsubscribed when the last one leaves. Clients joining a channel late
+    receive a snapshot rebuilt from its latest state.
+
+    Each frame is encoded once, whatever the amount of clients. Clients
+    which can't keep up are disconnected with code 1012 (and reconnect).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        logger: Logger = _DEFAULT_LOGGER,
+        codec: Optional[JSONCodec] = None,
+        maxsize: int = 10_000,
+    ) -> None:
+        self.__logger, self.__codec = logger, codec or get_default_codec()
+
+        self.__maxsize = maxsize
+
+        self.__wss = BfxWebSocketClient(
+            host, logger=logger, codec=self.__codec, conf_flags=_FLAGS
+        )
+
+        self.__channels: Dict[_Key, _Channel] = {}
+
+        self.__chan_ids: Dict[int, _Channel] = {}
+
+        self.__sub_ids: Dict[str, _Channel] = {}
+
+        self.__sessions: Dict[_Session, None] = {}
+
+        self.__counter = itertools.count(1)
+
+        self.__server: Optional[websockets.server.WebSocketServer] = None
+
+        self.__wss.on("subscribed", self.__on_subscribed)
+
+    @property
+    def wss(self) -> BfxWebSocketClient:
+        """
+        The upstream client.
+        """
+
+        return self.__wss
+
+    def run(self, address: str) -> None:
+        return asyncio.get_event_loop().run_until_complete(self.serve(address))
+
+    async def serve(self, address: str) -> None:
+        """
+        Connect to the exchange, then accept clients on <address> (e.g.
+        ws://127.0.0.1:8765 or unix:///tmp/bfxapi.sock) until closed.
+        """
+
+        opened: "asyncio.Future[None]" = asyncio.get_event_loop().create_future()
+
+        async def _on_open() -> None:
+            if opened.done():
+                return
+
+            try:
+                self.__server = await self.__listen(address)
+            except OSError as exception:
+                opened.set_exception(exception)
+            else:
+                opened.set_result(None)
+
+        self.__wss.on("open", _on_open)
+
+        upstream = asyncio.ensure_future(self.__wss.start())
+
+        done, _ = await asyncio.wait(
+            [upstream, opened], return_when=asyncio.FIRST_COMPLETED
+        )
+
+        try:
+            if opened in done:
+                opened.result()
+
+                await upstream
+            else:
+                upstream.result()
+        finally:
+            if self.__server is not None:
+                self.__server.close()
+
+                await self.__server.wait_closed()
+
+    async def close(self) -> None:
+        if self.__server is not None:
+            self.__server.close()
+
+        if self.__wss.open:
+            await self.__wss.close()
+
+    def stats(self) -> GatewayStats:
+        return {
+            "sessions": len(self.__sessions),
+            "channels": len(self.__channels),
+            "subscriptions": sum(
+                len(channel.sessions) for channel in self.__channels.values()
+            ),
+            "upstream": self.__wss.stats(),
+        }
+
+    async def __listen(self, address: str) -> websockets.server.WebSocketServer:
+        if address.startswith(_UNIX_SCHEME):
+            return await websockets.server.unix_serve(
+                self.__on_connection, address[len(_UNIX_SCHEME) :]
+            )
+
+        url = urlparse(address)
+
+        return await websockets.server.serve(
+            self.__on_connection, url.hostname, url.port
+        )
+
+    async def __on_connection(self, websocket: WebSocketServerProtocol) -> None:
+        session = _Session(websocket, self.__maxsize)
+
+        self.__sessions[session] = None
+
+        writer = asyncio.ensure_future(session.write())
+
+        session.send(self.__codec.dumps(_INFO))
+
+        try:
+            async for _message in websocket:
+                message = self.__codec.loads(_message)
+
+                if isinstance(message, dict):
+                    await self.__on_event(session, message)
+        except ConnectionClosed:
+            pass
+        finally:
+            del self.__sessions[session]
+
+            writer.cancel()
+
+            for chan_id in list(session.channels):
+                await self.__leave(session, self.__chan_ids[chan_id])
+
+    async def __on_event(self, session: _Session, message: Dict[str, Any]) -> None:
+        event, reply = message.get("event"), session.send
+
+        if event == "subscribe":
+            await self.__subscribe(session, message)
+        elif event == "unsubscribe":
+            chan_id = message.get("chanId")
+
+            if (channel := self.__chan_ids.get(cast(int, chan_id))) is None or (
+                chan_id not in session.channels
+            ):
+                return reply(
+                    self.__error(10400, "unsubscribe: invalid", chanId=chan_id)
+                )
+
+            reply(
+                self.__codec.dumps(
+                    {"event": "unsubscribed", "status": "OK", "chanId": chan_id}
+                )
+            )
+
+            await self.__leave(session, channel)
+        elif event == "conf":
+            flags = int(message.get("flags", 0))
+
+            if flags & ~_FLAGS:
+                reply(self.__codec.dumps({"event": "conf", "status": "FAILED"}))
+
+                # Frames would be misread by the client (e.g. with SEQ_ALL)
+                return await session.websocket.close(
+                    1008, f"Unsupported flags: {flags & ~_FLAGS}."
+                )
+
+            reply(self.__codec.dumps({"event": "conf", "status": "OK", "flags": flags}))
+        elif event == "ping":
+            reply(
+                self.__codec.dumps(
+                    {
+                        "event": "pong",
+                        "ts": int(time.time() * 1_000),
+                        "cid": message.get("cid"),
+                    }
+                )
+            )
+        elif event == "auth":
+            reply(
+                self.__codec.dumps(
+                    {
+                        "event": "auth",
+                        "status": "FAILED",
+                        "code": 10100,
+                        "msg": "The gateway only serves public channels.",
+                    }
+                )
+            )
+        else:
+            reply(self.__error(10000, "Unknown event"))
+
+    async def __subscribe(self, session: _Session, message: Dict[str, Any]) -> None:
+        if (params := _params(message)) is None:
+            return session.send(self.__error(10300, "subscribe: invalid", **message))
+
+        key: _Key = tuple(sorted(params.items()))
+
+        if (channel := self.__channels.get(key)) is None:
+            channel = _Channel(next(self.__counter), params)
+
+            self.__channels[key] = channel
+
+            self.__chan_ids[channel.chan_id] = channel
+
+            self.__sub_ids[channel.sub_id] = channel
+
+            def _on_register(sub_id: str) -> None:
+                # Opened before the request is sent: no frame is missed
+                channel.stream = self.__wss.stream(sub_id)
+
+                self.__spawn(self.__forward(channel, channel.stream))
+
+            (confirmation,) = await self.__wss.subscribe_many(
+                [{**params, "sub_id": channel.sub_id, "raw": True}],
+                on_register=_on_register,
+            )
+
+            # If already refused, its clients are answered once added
+            confirmation.add_done_callback(
+                lambda future: self.__on_confirmation(channel, future)
+            )
+        elif channel.chan_id in session.channels:
+            return session.send(self.__error(10301, "subscribe: dup", **params))
+
+        session.channels[channel.chan_id] = message.get("subId") or str(uuid.uuid4())
+
+        channel.sessions[session] = None
+
+        # Otherwise, the client is answered once the exchange answers
+        if channel.subscribed:
+            self.__join(session, channel)
+
+    def __join(self, session: _Session, channel: _Channel) -> None:
+        session.send(
+            self.__codec.dumps(
+                {
+                    "event": "subscribed",
+                    **channel.params,
+                    "chanId": channel.chan_id,
+                    "subId": session.channels[channel.chan_id],
+                }
+            )
+        )
+
+        for payload in channel.state.payloads():
+            session.send(self.__frame(channel.chan_id, payload))
+
+    async def __leave(self, session: _Session, channel: _Channel) -> None:
+        session.channels.pop(channel.chan_id, None)
+
+        channel.sessions.pop(session, None)
+
+        # Pending subscriptions are dropped once the exchange answers
+        if not channel.sessions and channel.subscribed:
+            await self.__drop(channel)
+
+    async def __drop(self, channel: _Channel) -> None:
+        del self.__channels[tuple(sorted(channel.params.items()))]
+
+        del self.__chan_ids[channel.chan_id]
+
+        del self.__sub_ids[channel.sub_id]
+
+        if self.__wss.open:
+            await self.__wss.unsubscribe(channel.sub_id)
+
+    def __on_confirmation(
+        self, channel: _Channel, future: "asyncio.Future[Subscription]"
+    ) -> None:
+        if future.cancelled() or not isinstance(
+            error := future.exception(), SubscriptionError
+        ):
+            return
+
+        del self.__channels[tuple(sorted(channel.params.items()))]
+
+        del self.__chan_ids[channel.chan_id]
+
+        del self.__sub_ids[channel.sub_id]
+
+        if channel.stream is not None:
+            channel.stream.close()
+
+        # The exchange refused the channel: so are the clients waiting for it
+        for session in channel.sessions:
+            sub_id = session.channels.pop(channel.chan_id)
+
+            session.send(
+                self.__error(
+                    error.code or 10300,
+                    error.msg or "subscribe: invalid",
+                    **channel.params,
+                    subId=sub_id,
+                )
+            )
+
+        channel.sessions.clear()
+
+    def __on_subscribed(self, subscription: Subscription) -> None:
+        if (channel := self.__sub_ids.get(subscription["sub_id"])) is None:
+            return
+
+        channel.subscribed = True
+
+        if not channel.sessions:
+            return self.__spawn(self.__drop(channel))
+
+        for session in channel.sessions:
+            self.__join(session, channel)
+
+    async def __forward(self, channel: _Channel, stream: BfxWebSocketStream) -> None:
+        apply, chan_id = channel.state.apply, channel.chan_id
+
+        while True:
+            try:
+                updates: List[Update] = await stream.batch()
+            except StopAsyncIteration:
+                break
+
+            for _, message in updates:
+                apply(message)
+
+                text = self.__frame(chan_id, message[1:])
+
+                for session in channel.sessions:
+                    session.send(text)
+
+    def __frame(self, chan_id: int, payload: List[Any]) -> str:
+        return self.__codec.dumps([chan_id, *payload])
+
+    def __error(self, code: int, msg: str, **kwargs: Any) -> str:
+        return self.__codec.dumps(
+            {**kwargs, "event": "error", "msg": msg, "code": code}
+        )
+
+    def __spawn(self, coroutine: Any) -> None:
+        task = asyncio.ensure_future(coroutine)
+
+        task.add_done_callback(self.__on_task_done)
+
+    def __on_task_done(self, task: "asyncio.Future[Any]") -> None:
+        if not task.cancelled() and (exception := task.exception()):
+            self.__logger.error(f"Gateway task failed: {exception!r}")
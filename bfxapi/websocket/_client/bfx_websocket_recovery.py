@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, cast
+
+from websockets.exceptions import ConnectionClosed
+
+from bfxapi._utils.rate_limiter import RateLimiter
+from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket.metrics import RecoveryProgress
+from bfxapi.websocket.subscriptions import Subscription
+
+if TYPE_CHECKING:
+    from .bfx_websocket_bucket import BfxWebSocketBucket
+
+Priority = Callable[[Subscription], Any]
+
+# Priority, order of arrival, generation, bucket and subscribe request
+_Item = Tuple[Any, int, int, "BfxWebSocketBucket", Dict[str, Any]]
+
+
+def _subscription(request: Dict[str, Any]) -> Subscription:
+    subscription = {
+        key: value for key, value in request.items() if key not in ("event", "subId")
+    }
+
+    return cast(Subscription, {**subscription, "sub_id": request["subId"]})
+
+
+class RecoveryScheduler:
+    """
+    Resubscribe the channels of the buckets which reconnect, in <priority>
+    order (lowest first) across all buckets, through <limiter> (if given)
+    without waiting for their confirmations.
+
+    Progress is reported with the recovery_progress event, each time a
+    request is sent and each time the exchange answers one.
+    """
+
+    def __init__(
+        self,
+        event_emitter: BfxEventEmitter,
+        *,
+        limiter: Optional[RateLimiter] = None,
+        priority: Optional[Priority] = None,
+    ) -> None:
+        self.__event_emitter, self.__priority = event_emitter, priority
+
+        self.__limiter = limiter
+
+        self.__queue: List[_Item] = []
+
+        self.__counter = itertools.count()
+
+        # Requests queued before a bucket reconnects (again) are dropped
+        self.__generations: Dict["BfxWebSocketBucket", int] = {}
+
+        # Bucket of each sub_id waiting to be sent or answered
+        self.__recovering: Dict[str, "BfxWebSocketBucket"] = {}
+
+        self.__sent: Set[str] = set()
+
+        self.__progress: RecoveryProgress = {
+            "total": 0,
+            "sent": 0,
+            "confirmed": 0,
+            "failed": 0,
+        }
+
+        self.__task: Optional["asyncio.Future[None]"] = None
+
+    @property
+    def progress(self) -> RecoveryProgress:
+        return self.__progress.copy()
+
+    def schedule(
+        self, bucket: "BfxWebSocketBucket", requests: List[Dict[str, Any]]
+    ) -> None:
+        generation = self.__generations[bucket] = self.__generations.get(bucket, 0) + 1
+
+        # A new recovery starts once the previous one is over
+        if not self.__recovering:
+            self.__progress = {"total": 0, "sent": 0, "confirmed": 0, "failed": 0}
+
+        for request in requests:
+            priority = 0
+
+            if self.__priority is not None:
+                priority = self.__priority(_subscription(request))
+
+            heapq.heappush(
+                self.__queue,
+                (priority, next(self.__counter), generation, bucket, request),
+            )
+
+            if request["subId"] not in self.__recovering:
+                self.__progress["total"] += 1
+
+            self.__recovering[request["subId"]] = bucket
+
+        if self.__queue and (self.__task is None or self.__task.done()):
+            self.__task = asyncio.ensure_future(self.__run())
+
+    def discard(self, bucket: "BfxWebSocketBucket") -> None:
+        """
+        Drop the requests of a closed bucket.
+        """
+
+        self.__generations.pop(bucket, None)
+
+        sub_ids = [_id for _id, owner in self.__recovering.items() if owner is bucket]
+
+        for sub_id in sub_ids:
+            if sub_id in self.__sent:
+                # Sent, but the answer won't come anymore
+                self._on_answer(sub_id, failed=True)
+            else:
+                self.__drop(sub_id)
+
+    def _on_answer(self, sub_id: str, *, failed: bool = False) -> None:
+        if sub_id not in self.__recovering:
+            return
+
+        del self.__recovering[sub_id]
+
+        self.__sent.discard(sub_id)
+
+        if failed:
+            self.__progress["failed"] += 1
+        else:
+            self.__progress["confirmed"] += 1
+
+        self.__event_emitter.emit("recovery_progress", self.progress)
+
+    def __drop(self, sub_id: str) -> None:
+        if sub_id in self.__recovering:
+            del self.__recovering[sub_id]
+
+            self.__sent.discard(sub_id)
+
+            self.__progress["total"] -= 1
+
+    async def __run(self) -> None:
+        queue, generations = self.__queue, self.__generations
+
+        while queue:
+            _, _, generation, bucket, request = heapq.heappop(queue)
+
+            if bucket not in generations:
+                self.__drop(request["subId"])
+
+            # Otherwise, the bucket has scheduled its requests again
+            if generations.get(bucket) != generation:
+                continue
+
+            if self.__limiter is not None:
+                await self.__limiter.acquire()
+
+                # Closed (or reconnected) while waiting for the limiter
+                if generations.get(bucket) != generation:
+                    continue
+
+            try:
+                if not await bucket._resend(request):
+                    # Not pending anymore (e.g. unsubscribed meanwhile)
+                    self.__drop(request["subId"])
+
+                    continue
+            except ConnectionClosed:
+                # The bucket schedules its requests again once reconnected
+                continue
+
+            self.__sent.add(request["subId"])
+
+            self.__progress["sent"] += 1
+
+            self.__event_emitter.emit("recovery_progress", self.progress)
@@ -0,0 +1,591 @@
+import asyncio
+import itertools
+import multiprocessing
+import pickle
+import uuid
+from multiprocessing.connection import Connection as Pipe
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bfxapi._utils.json_codec import JSONCodec
+from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket.exceptions import SubscriptionError
+from bfxapi.websocket.metrics import BucketStats
+from bfxapi.websocket.subscriptions import Subscription
+from bfxapi.websocket.timestamps import _TIMESTAMPS, Timestamps
+
+from .bfx_websocket_bucket import _IDS, BfxWebSocketBucket
+from .bfx_websocket_stream import BfxWebSocketStream, Overflow
+
+# Commands (parent -> worker):
+#   ("new", bucket_id), ("start", bucket_id), ("stop", bucket_id),
+#   ("call", call_id, bucket_id, method, args, kwargs), ("exit",)
+#
+# Batches of items (worker -> parent):
+#   ("event", bucket_id, event, sub_id, args, timestamps), ("forget", sub_id),
+#   ("open", bucket_id), ("done", bucket_id, error), ("result", call_id, error),
+#   ("stats", bucket_id, stats)
+
+_STATS_INTERVAL = 1.0
+
+
+def _picklable(error: Optional[BaseException]) -> Optional[BaseException]:
+    if error is None:
+        return None
+
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+    return error
+
+
+class _Outbox:
+    """
+    Batch the items sent to the parent: one send per event loop iteration.
+    """
+
+    def __init__(self, pipe: Pipe) -> None:
+        self.__pipe = pipe
+
+        self.__items: List[Tuple[Any, ...]] = []
+
+    def put(self, item: Tuple[Any, ...]) -> None:
+        if not self.__items:
+            asyncio.get_event_loop().call_soon(self.flush)
+
+        self.__items.append(item)
+
+    def flush(self) -> None:
+        if items := self.__items:
+            self.__items = []
+
+            self.__pipe.send(items)
+
+
+class _ForwardingEmitter(BfxEventEmitter):
+    """
+    Forward the events of a bucket (running in a worker) to the parent.
+    """
+
+    def __init__(self, bucket_id: int, outbox: _Outbox) -> None:
+        super().__init__()
+
+        self.__bucket_id, self.__outbox = bucket_id, outbox
+
+    def emit(self, event: str, *args: Any) -> bool:
+        if event == "error":
+            args = (_picklable(args[0]),)
+
+        # Subscriptions are sent (whole) once, with the subscribed event
+        if event != "subscribed" and args and isinstance(args[0], dict):
+            self.__outbox.put(
+                (
+                    "event",
+                    self.__bucket_id,
+                    event,
+                    args[0]["sub_id"],
+                    args[1:],
+                    _TIMESTAMPS.get(),
+                )
+            )
+        else:
+            self.__outbox.put(
+                ("event", self.__bucket_id, event, None, args, _TIMESTAMPS.get())
+            )
+
+        return True
+
+    def _forget(self, sub_id: str) -> None:
+        self.__outbox.put(("forget", sub_id))
+
+
+class _Worker:
+    def __init__(
+        self,
+        pipe: Pipe,
+        host: str,
+        codec: JSONCodec,
+        conf_flags: int,
+        resubscribe_on_gap: bool,
+    ) -> None:
+        self.__pipe, self.__host, self.__codec = pipe, host, codec
+
+        self.__conf_flags, self.__resubscribe_on_gap = conf_flags, resubscribe_on_gap
+
+        self.__outbox = _Outbox(pipe)
+
+        self.__buckets: Dict[int, BfxWebSocketBucket] = {}
+
+        self.__tasks: Dict[int, "asyncio.Task[None]"] = {}
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        self.__exit: "asyncio.Future[None]" = loop.create_future()
+
+        loop.add_reader(self.__pipe.fileno(), self.__on_readable)
+
+        report = asyncio.ensure_future(self.__report())
+
+        try:
+            await self.__exit
+        finally:
+            loop.remove_reader(self.__pipe.fileno())
+
+            for task in [report, *self.__tasks.values()]:
+                task.cancel()
+
+    def __on_readable(self) -> None:
+        try:
+            while self.__pipe.poll():
+                self.__handle(self.__pipe.recv())
+        except (EOFError, OSError):
+            # The parent process has gone away
+            if not self.__exit.done():
+                self.__exit.set_result(None)
+
+    def __handle(self, command: Tuple[Any, ...]) -> None:
+        kind = command[0]
+
+        if kind == "new":
+            bucket_id = command[1]
+
+            self.__buckets[bucket_id] = BfxWebSocketBucket(
+                self.__host,
+                _ForwardingEmitter(bucket_id, self.__outbox),
+                self.__codec,
+                self.__conf_flags,
+                resubscribe_on_gap=self.__resubscribe_on_gap,
+            )
+        elif kind == "start":
+            self.__tasks[command[1]] = asyncio.ensure_future(self.__start(command[1]))
+        elif kind == "stop":
+            if (task := self.__tasks.pop(command[1], None)) is not None:
+                task.cancel()
+        elif kind == "call":
+            asyncio.ensure_future(self.__call(*command[1:]))
+        elif kind == "exit":
+            if not self.__exit.done():
+                self.__exit.set_result(None)
+
+    async def __start(self, bucket_id: int) -> None:
+        bucket = self.__buckets[bucket_id]
+
+        async def _wait() -> None:
+            await bucket.wait()
+
+            self.__outbox.put(("open", bucket_id))
+
+        waiter = asyncio.ensure_future(_wait())
+
+        error: Optional[BaseException] = None
+
+        try:
+            await bucket.start()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            error = exception
+        finally:
+            waiter.cancel()
+
+        self.__tasks.pop(bucket_id, None)
+
+        self.__outbox.put(("done", bucket_id, _picklable(error)))
+
+    async def __call(
+        self,
+        call_id: int,
+        bucket_id: int,
+        method: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        error: Optional[BaseException] = None
+
+        try:
+            await getattr(self.__buckets[bucket_id], method)(*args, **kwargs)
+        except Exception as exception:
+            error = exception
+
+        if method == "close":
+            self.__buckets.pop(bucket_id, None)
+
+        self.__outbox.put(("result", call_id, _picklable(error)))
+
+    async def __report(self) -> None:
+        while True:
+            await asyncio.sleep(_STATS_INTERVAL)
+
+            for bucket_id, bucket in list(self.__buckets.items()):
+                self.__outbox.put(("stats", bucket_id, bucket.stats()))
+
+
+def _run_worker(
+    pipe: Pipe, host: str, codec: JSONCodec, conf_flags: int, resubscribe_on_gap: bool
+) -> None:
+    asyncio.run(_Worker(pipe, host, codec, conf_flags, resubscribe_on_gap).run())
+
+
+class BfxWebSocketShard:
+    """
+    Worker process running the buckets of a sharded client in its own event
+    loop: frames are decoded and parsed in the worker, and the resulting
+    events are forwarded (in batches, over a pipe) to the parent, where they
+    are emitted as usual.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        event_emitter: BfxEventEmitter,
+        codec: JSONCodec,
+        conf_flags: int,
+        *,
+        resubscribe_on_gap: bool = False,
+    ) -> None:
+        self.__event_emitter = event_emitter
+
+        context = multiprocessing.get_context("spawn")
+
+        self.__pipe, pipe = context.Pipe()
+
+        self.__process = context.Process(
+            target=_run_worker,
+            args=(pipe, host, codec, conf_flags, resubscribe_on_gap),
+            name="bfxapi-shard",
+            daemon=True,
+        )
+
+        self.__process.start()
+
+        pipe.close()
+
+        self.__buckets: Dict[int, BfxWebSocketShardedBucket] = {}
+
+        self.__calls: Dict[int, "asyncio.Future[Optional[BaseException]]"] = {}
+
+        self.__ids = itertools.count()
+
+        asyncio.get_event_loop().add_reader(self.__pipe.fileno(), self.__on_readable)
+
+    @property
+    def count(self) -> int:
+        return len(self.__buckets)
+
+    def bucket(
+        self, *, on_refused: Optional[Callable[[str], None]] = None
+    ) -> "BfxWebSocketShardedBucket":
+        bucket_id = next(self.__ids)
+
+        bucket = BfxWebSocketShardedBucket(
+            self, bucket_id, self.__event_emitter, on_refused=on_refused
+        )
+
+        self.__buckets[bucket_id] = bucket
+
+        self._send(("new", bucket_id))
+
+        return bucket
+
+    async def close(self) -> None:
+        if self.__process.is_alive():
+            self._send(("exit",))
+
+        asyncio.get_event_loop().remove_reader(self.__pipe.fileno())
+
+        await asyncio.get_event_loop().run_in_executor(None, self.__process.join, 5.0)
+
+        self.__pipe.close()
+
+    def _send(self, command: Tuple[Any, ...]) -> None:
+        self.__pipe.send(command)
+
+    async def _call(
+        self, bucket_id: int, method: str, *args: Any, **kwargs: Any
+    ) -> None:
+        call_id = next(self.__ids)
+
+        self.__calls[call_id] = asyncio.get_event_loop().create_future()
+
+        self._send(("call", call_id, bucket_id, method, args, kwargs))
+
+        if (error := await self.__calls[call_id]) is not None:
+            raise error
+
+        if method == "close":
+            self.__buckets.pop(bucket_id, None)
+
+    def __on_readable(self) -> None:
+        try:
+            while self.__pipe.poll():
+                for item in self.__pipe.recv():
+                    self.__on_item(item)
+        except (EOFError, OSError):
+            asyncio.get_event_loop().remove_reader(self.__pipe.fileno())
+
+            self.__on_exit()
+
+    def __on_item(self, item: Tuple[Any, ...]) -> None:
+        kind = item[0]
+
+        if kind == "event":
+            if (bucket := self.__buckets.get(item[1])) is not None:
+                bucket._on_event(*item[2:])
+        elif kind == "forget":
+            self.__event_emitter._forget(item[1])
+        elif kind == "result":
+            if (call := self.__calls.pop(item[1], None)) is not None:
+                call.set_result(item[2])
+        elif (bucket := self.__buckets.get(item[1])) is not None:
+            if kind == "open":
+                bucket._on_open()
+            elif kind == "done":
+                bucket._on_done(item[2])
+            elif kind == "stats":
+                bucket._on_stats(item[2])
+
+    def __on_exit(self) -> None:
+        error = RuntimeError("The worker process of a shard has exited.")
+
+        for call in self.__calls.values():
+            call.set_result(error)
+
+        self.__calls.clear()
+
+        for bucket in self.__buckets.values():
+            bucket._on_done(error)
+
+
+class BfxWebSocketShardedBucket:
+    """
+    Proxy (in the parent) of a bucket running in the worker of a shard.
+    """
+
+    __MAXIMUM_SUBSCRIPTIONS_AMOUNT = 25
+
+    def __init__(
+        self,
+        shard: BfxWebSocketShard,
+        bucket_id: int,
+        event_emitter: BfxEventEmitter,
+        *,
+        on_refused: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.__shard, self.__bucket_id = shard, bucket_id
+
+        self.__id = next(_IDS)
+
+        self.__event_emitter, self.__on_refused = event_emitter, on_refused
+
+        self.__pendings: Dict[str, None] = {}
+
+        self.__subscriptions: Dict[str, Subscription] = {}
+
+        self.__streams: Dict[str, BfxWebSocketStream] = {}
+
+        self.__confirmations: Dict[str, "asyncio.Future[Subscription]"] = {}
+
+        self.__stats: Optional[BucketStats] = None
+
+        self.__open = asyncio.Event()
+
+        self.__done: Optional["asyncio.Future[Optional[BaseException]]"] = None
+
+    @property
+    def open(self) -> bool:
+        return self.__open.is_set()
+
+    @property
+    def count(self) -> int:
+        return len(self.__pendings) + len(self.__subscriptions)
+
+    @property
+    def is_full(self) -> bool:
+        return self.count == BfxWebSocketShardedBucket.__MAXIMUM_SUBSCRIPTIONS_AMOUNT
+
+    @property
+    def available(self) -> int:
+        return BfxWebSocketShardedBucket.__MAXIMUM_SUBSCRIPTIONS_AMOUNT - self.count
+
+    @property
+    def ids(self) -> List[str]:
+        return [*self.__pendings, *self.__subscriptions]
+
+    async def start(self) -> None:
+        self.__open.clear()
+
+        self.__done = asyncio.get_event_loop().create_future()
+
+        self.__shard._send(("start", self.__bucket_id))
+
+        try:
+            error = await self.__done
+        except asyncio.CancelledError:
+            self.__shard._send(("stop", self.__bucket_id))
+
+            raise
+        finally:
+            self.__open.clear()
+
+        if error is not None:
+            raise error
+
+    async def wait(self) -> None:
+        await self.__open.wait()
+
+    async def subscribe(
+        self, channel: str, sub_id: Optional[str] = None, **kwargs: Any
+    ) -> None:
+        sub_id = sub_id or str(uuid.uuid4())
+
+        self.__pendings[sub_id] = None
+
+        await self.__call("subscribe", channel, sub_id, **kwargs)
+
+    async def unsubscribe(self, sub_id: str) -> None:
+        if self.__subscriptions.pop(sub_id, None) is not None:
+            if (stream := self.__streams.get(sub_id)) is not None:
+                stream.close()
+
+        await self.__call("unsubscribe", sub_id)
+
+    async def resubscribe(self, sub_id: str) -> None:
+        if self.__subscriptions.pop(sub_id, None) is not None:
+            self.__pendings[sub_id] = None
+
+        await self.__call("resubscribe", sub_id)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        for stream in list(self.__streams.values()):
+            stream.close()
+
+        for future in self.__confirmations.values():
+            future.cancel()
+
+        self.__confirmations.clear()
+
+        await self.__call("close", code, reason)
+
+    def has(self, sub_id: str) -> bool:
+        return sub_id in self.__subscriptions
+
+    def confirmation(self, sub_id: str) -> "asyncio.Future[Subscription]":
+        future = asyncio.get_event_loop().create_future()
+
+        self.__confirmations[sub_id] = future
+
+        return future
+
+    def refcount(self, sub_id: str) -> int:
+        return 1
+
+    def stream(
+        self, sub_id: str, *, maxsize: int = 1_024, overflow: Overflow = "block"
+    ) -> BfxWebSocketStream:
+        # Queues live in the parent: they can't pause the worker's connection
+        if overflow == "block":
+            raise ValueError(
+                "Sharded clients only support the drop_oldest and "
+                "conflate overflow policies."
+            )
+
+        if (stream := self.__streams.get(sub_id)) is not None:
+            stream.close()
+
+        stream = BfxWebSocketStream(
+            sub_id, maxsize=maxsize, overflow=overflow, on_close=self.__on_stream_close
+        )
+
+        self.__streams[sub_id] = stream
+
+        return stream
+
+    def stats(self) -> BucketStats:
+        if self.__stats is not None:
+            # The worker numbers its buckets on its own
+            return {**self.__stats, "id": self.__id}
+
+        return {
+            "id": self.__id,
+            "open": self.open,
+            "messages": 0,
+            "bytes": 0,
+            "rate": 0.0,
+            "pendings": len(self.__pendings),
+            "subscriptions": [],
+        }
+
+    def latency(self, sub_id: str) -> None:
+        # Latency histograms stay in the worker
+        return None
+
+    def _on_event(
+        self,
+        event: str,
+        sub_id: Optional[str],
+        args: Tuple[Any, ...],
+        timestamps: Optional[Timestamps],
+    ) -> None:
+        _TIMESTAMPS.set(timestamps)
+
+        if sub_id is None:
+            if event == "subscribed":
+                subscription = args[0]
+
+                self.__pendings.pop(subscription["sub_id"], None)
+
+                self.__subscriptions[subscription["sub_id"]] = subscription
+
+                if (
+                    future := self.__confirmations.pop(subscription["sub_id"], None)
+                ) is not None and not future.done():
+                    future.set_result(subscription)
+            elif (
+                event == "error"
+                and isinstance(error := args[0], SubscriptionError)
+                and (
+                    error.sub_id in self.__pendings
+                    or error.sub_id in self.__subscriptions
+                )
+            ):
+                # Subscriptions are refused again after reconnections
+                self.__pendings.pop(error.sub_id, None)
+
+                self.__subscriptions.pop(error.sub_id, None)
+
+                if self.__on_refused is not None:
+                    self.__on_refused(error.sub_id)
+
+                if (future := self.__confirmations.pop(error.sub_id, None)) is not None:
+                    if not future.done():
+                        future.set_exception(error)
+
+                    return
+
+            self.__event_emitter.emit(event, *args)
+        elif (subscription := self.__subscriptions.get(sub_id)) is not None:
+            self.__event_emitter.emit(event, subscription, *args)
+
+            stream = self.__streams.get(sub_id)
+
+            if stream is not None and event != "sequence_gap":
+                stream._put(event, args[0])
+
+    def _on_open(self) -> None:
+        self.__open.set()
+
+    def _on_done(self, error: Optional[BaseException]) -> None:
+        if self.__done is not None and not self.__done.done():
+            self.__done.set_result(error)
+
+    def _on_stats(self, stats: BucketStats) -> None:
+        self.__stats = stats
+
+    async def __call(self, method: str, *args: Any, **kwargs: Any) -> None:
+        await self.__shard._call(self.__bucket_id, method, *args, **kwargs)
+
+    def __on_stream_close(self, stream: BfxWebSocketStream) -> None:
+        if self.__streams.get(stream.sub_id) is stream:
+            del self.__streams[stream.sub_id]
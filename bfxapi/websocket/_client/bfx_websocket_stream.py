@@ -0,0 +1,146 @@
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, List, Literal, NamedTuple, Optional, Union
+
+Overflow = Literal["block", "drop_oldest", "conflate"]
+
+
+class Update(NamedTuple):
+    event: str
+
+    data: Any
+
+
+class BfxWebSocketStream:
+    """
+    Bounded queue of the updates of a subscription, consumed with async for.
+
+    Overflow policies:
+    - block: when the queue is full, the connection stops reading frames
+      until the consumer catches up (backpressure).
+    - drop_oldest: when the queue is full, the oldest update is dropped.
+    - conflate: only the latest pending update of each event is kept
+      (suitable for state-like channels: ticker, candles and status).
+    """
+
+    def __init__(
+        self,
+        sub_id: str,
+        *,
+        maxsize: int = 1_024,
+        overflow: Overflow = "block",
+        on_close: Optional[Callable[["BfxWebSocketStream"], None]] = None,
+    ) -> None:
+        if overflow not in ("block", "drop_oldest", "conflate"):
+            raise ValueError(f"Unknown overflow policy: <{overflow}>.")
+
+        self.sub_id, self.maxsize, self.overflow = sub_id, maxsize, overflow
+
+        self.__on_close = on_close
+
+        self.__queue: Union[Deque[Update], "OrderedDict[str, Update]"] = (
+            OrderedDict() if overflow == "conflate" else deque()
+        )
+
+        self.__dropped, self.__closed = 0, False
+
+        self.__readable, self.__writable = asyncio.Event(), asyncio.Event()
+
+        self.__writable.set()
+
+    def __len__(self) -> int:
+        return len(self.__queue)
+
+    def __aiter__(self) -> "BfxWebSocketStream":
+        return self
+
+    async def __anext__(self) -> Update:
+        while len(self.__queue) == 0:
+            if self.__closed:
+                raise StopAsyncIteration
+
+            self.__readable.clear()
+
+            await self.__readable.wait()
+
+        return self.__pop()
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def full(self) -> bool:
+        return len(self.__queue) >= self.maxsize
+
+    async def batch(self, max_items: Optional[int] = None) -> List[Update]:
+        """
+        Wait for at least one update, then return all (or up to <max_items>)
+        of the pending ones.
+        """
+
+        updates = [await self.__anext__()]
+
+        while len(self.__queue) > 0 and (max_items is None or len(updates) < max_items):
+            updates.append(self.__pop())
+
+        return updates
+
+    def close(self) -> None:
+        """
+        Stop receiving updates: pending ones can still be consumed.
+        """
+
+        if not self.__closed:
+            self.__closed = True
+
+            self.__readable.set()
+
+            self.__writable.set()
+
+            if self.__on_close is not None:
+                self.__on_close(self)
+
+    def _put(self, event: str, data: Any) -> None:
+        if self.__closed:
+            return
+
+        queue = self.__queue
+
+        if isinstance(queue, OrderedDict):
+            if event in queue:
+                self.__dropped += 1
+
+                queue.move_to_end(event)
+
+            queue[event] = Update(event, data)
+        else:
+            if self.overflow == "drop_oldest" and len(queue) >= self.maxsize:
+                self.__dropped += 1
+
+                queue.popleft()
+
+            queue.append(Update(event, data))
+
+            if len(queue) >= self.maxsize:
+                self.__writable.clear()
+
+        self.__readable.set()
+
+    async def _wait_writable(self) -> None:
+        await self.__writable.wait()
+
+    def __pop(self) -> Update:
+        if isinstance(self.__queue, OrderedDict):
+            update = self.__queue.popitem(last=False)[1]
+        else:
+            update = self.__queue.popleft()
+
+        if len(self.__queue) < self.maxsize:
+            self.__writable.set()
+
+        return update
@@ -6,8 +6,10 @@ from datetime import datetime
 from functools import wraps
 from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, cast
 
+import websockets.client
 from typing_extensions import Concatenate, ParamSpec
 from websockets.client import WebSocketClientProtocol
+from websockets.legacy.client import Connect
 
 from bfxapi.websocket.exceptions import ActionRequiresAuthentication, ConnectionNotOpen
 
@@ -17,6 +19,9 @@ _R = TypeVar("_R")
 
 _P = ParamSpec("_P")
 
+# e.g. unix:///tmp/bfxapi.sock (for a local BfxWebSocketGateway)
+_UNIX_SCHEME = "unix://"
+
 
 class Connection(ABC):
     _HEARTBEAT = "hb"
@@ -47,6 +52,13 @@ class Connection(ABC):
     @abstractmethod
     async def start(self) -> None: ...
 
+    @staticmethod
+    def _connect(host: str) -> Connect:
+        if host.startswith(_UNIX_SCHEME):
+            return websockets.client.unix_connect(host[len(_UNIX_SCHEME) :])
+
+        return websockets.client.connect(host)
+
     @staticmethod
     def _require_websocket_connection(
         function: Callable[Concatenate[_S, _P], Awaitable[_R]],
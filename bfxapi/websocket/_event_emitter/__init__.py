@@ -1 +1 @@
-from .bfx_event_emitter import BfxEventEmitter
+from .bfx_event_emitter import BfxEventEmitter, Dispatch
@@ -1,108 +1,203 @@
-from asyncio import AbstractEventLoop
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
-
-from pyee.asyncio import AsyncIOEventEmitter
-
-from bfxapi.websocket.exceptions import UnknownEventError
-
-_Handler = TypeVar("_Handler", bound=Callable[..., None])
-
-_ONCE_PER_CONNECTION = [
-    "open",
-    "authenticated",
-    "order_snapshot",
-    "position_snapshot",
-    "funding_offer_snapshot",
-    "funding_credit_snapshot",
-    "funding_loan_snapshot",
-    "wallet_snapshot",
-]
-
-_ONCE_PER_SUBSCRIPTION = [
-    "subscribed",
-    "t_trades_snapshot",
-    "f_trades_snapshot",
-    "t_book_snapshot",
-    "f_book_snapshot",
-    "t_raw_book_snapshot",
-    "f_raw_book_snapshot",
-    "candles_snapshot",
-]
-
-_COMMON = [
-    "disconnected",
-    "t_ticker_update",
-    "f_ticker_update",
-    "t_trade_execution",
-    "t_trade_execution_update",
-    "f_trade_execution",
-    "f_trade_execution_update",
-    "t_book_update",
-    "f_book_update",
-    "t_raw_book_update",
-    "f_raw_book_update",
-    "candles_update",
-    "derivatives_status_update",
-    "liquidation_feed_update",
-    "checksum",
-    "order_new",
-    "order_update",
-    "order_cancel",
-    "position_new",
-    "position_update",
-    "position_close",
-    "funding_offer_new",
-    "funding_offer_update",
-    "funding_offer_cancel",
-    "funding_credit_new",
-    "funding_credit_update",
-    "funding_credit_close",
-    "funding_loan_new",
-    "funding_loan_update",
-    "funding_loan_close",
-    "trade_execution",
-    "trade_execution_update",
-    "wallet_update",
-    "base_margin_info",
-    "symbol_margin_info",
-    "funding_info_update",
-    "balance_update",
-    "notification",
-    "on-req-notification",
-    "ou-req-notification",
-    "oc-req-notification",
-    "fon-req-notification",
-    "foc-req-notification",
-]
-
-
-class BfxEventEmitter(AsyncIOEventEmitter):
-    _EVENTS = _ONCE_PER_CONNECTION + _ONCE_PER_SUBSCRIPTION + _COMMON
-
-    def __init__(self, loop: Optional[AbstractEventLoop] = None) -> None:
-        super().__init__(loop)
-
-        self._connection: List[str] = []
-
-        self._subscriptions: Dict[str, List[str]] = defaultdict(lambda: [])
-
-    def emit(self, event: str, *args: Any, **kwargs: Any) -> bool:
+import asyncio
+from asyncio import AbstractEventLoop, Future, Task
+from collections import defaultdict, deque
+from inspect import iscoroutine
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from bfxapi.websocket.exceptions import HandlerTimeoutError, UnknownEventError
+from bfxapi.websocket.timestamps import _TIMESTAMPS, Timestamps
+
+_Handler = TypeVar("_Handler", bound=Callable[..., Any])
+
+Dispatch = Literal["schedule", "inline"]
+
+_ONCE_PER_CONNECTION = frozenset(
+    [
+        "open",
+        "authenticated",
+        "order_snapshot",
+        "position_snapshot",
+        "funding_offer_snapshot",
+        "funding_credit_snapshot",
+        "funding_loan_snapshot",
+        "wallet_snapshot",
+    ]
+)
+
+_ONCE_PER_SUBSCRIPTION = frozenset(
+    [
+        "subscribed",
+        "t_trades_snapshot",
+        "f_trades_snapshot",
+        "t_book_snapshot",
+        "f_book_snapshot",
+        "t_raw_book_snapshot",
+        "f_raw_book_snapshot",
+        "candles_snapshot",
+    ]
+)
+
+_COMMON = frozenset(
+    [
+        "disconnected",
+        "t_ticker_update",
+        "f_ticker_update",
+        "t_trade_execution",
+        "t_trade_execution_update",
+        "f_trade_execution",
+        "f_trade_execution_update",
+        "t_book_update",
+        "f_book_update",
+        "t_raw_book_update",
+        "f_raw_book_update",
+        "t_book_bulk_update",
+        "f_book_bulk_update",
+        "t_raw_book_bulk_update",
+        "f_raw_book_bulk_update",
+        "candles_update",
+        "derivatives_status_update",
+        "liquidation_feed_update",
+        "checksum",
+        "sequence_gap",
+        "recovery_progress",
+        "order_new",
+        "order_update",
+        "order_cancel",
+        "position_new",
+        "position_update",
+        "position_close",
+        "funding_offer_new",
+        "funding_offer_update",
+        "funding_offer_cancel",
+        "funding_credit_new",
+        "funding_credit_update",
+        "funding_credit_close",
+        "funding_loan_new",
+        "funding_loan_update",
+        "funding_loan_close",
+        "trade_execution",
+        "trade_execution_update",
+        "wallet_update",
+        "base_margin_info",
+        "symbol_margin_info",
+        "funding_info_update",
+        "balance_update",
+        "notification",
+        "on-req-notification",
+        "ou-req-notification",
+        "oc-req-notification",
+        "fon-req-notification",
+        "foc-req-notification",
+    ]
+)
+
+
+class _Lane:
+    """
+    Coroutine handlers queued by one task (e.g. the read loop of a
+    connection), awaited one at a time in arrival order.
+    """
+
+    def __init__(self) -> None:
+        self.pending: Deque[Tuple[Awaitable[Any], Optional[Timestamps]]] = deque()
+
+        # Set while the handlers are being awaited
+        self.draining: Optional["Future[None]"] = None
+
+
+class BfxEventEmitter:
+    """
+    Single-threaded event emitter (with the on/listens_to/add_listener/once
+    surface of pyee's AsyncIOEventEmitter) for the hot path of the client.
+
+    Listeners of each event are kept in a precomputed tuple, rebuilt only
+    when a listener is added or removed: emitting an event takes no lock
+    and copies no list. Exceptions raised by handlers (coroutines included)
+    are emitted on the "error" event.
+
+    With dispatch="schedule" (default), coroutine handlers are scheduled as
+    tasks (fire-and-forget).
+
+    With dispatch="inline", they are queued instead and awaited one at a
+    time, in arrival order, by the read loop of the connection that emitted
+    their event (see <_drain>): no task is created, and the connection reads
+    no frame until the handlers of the previous one are done (the other
+    connections keep reading theirs). Each handler can be given a <timeout>
+    (in seconds), after which it is cancelled.
+    """
+
+    _EVENTS: FrozenSet[str] = _ONCE_PER_CONNECTION | _ONCE_PER_SUBSCRIPTION | _COMMON
+
+    def __init__(
+        self,
+        loop: Optional[AbstractEventLoop] = None,
+        *,
+        dispatch: Dispatch = "schedule",
+        timeout: Optional[float] = None,
+    ) -> None:
+        if dispatch not in ("schedule", "inline"):
+            raise ValueError(f"Unknown dispatch mode: <{dispatch}>.")
+
+        self.__loop = loop
+
+        # event -> {listener: handler} (handlers of <once> listeners differ)
+        self.__events: Dict[str, Dict[Callable[..., Any], Callable[..., Any]]] = {}
+
+        self.__listeners: Dict[str, Tuple[Callable[..., Any], ...]] = {}
+
+        self._connection: Set[str] = set()
+
+        self._subscriptions: Dict[str, Set[str]] = defaultdict(set)
+
+        self.__waiting: Set["Future[Any]"] = set()
+
+        self.__inline, self.__timeout = dispatch == "inline", timeout
+
+        # Coroutine handlers queued by each task (None: outside of any task)
+        self.__lanes: Dict[Optional["Task[Any]"], _Lane] = {}
+
+        # Amount of coroutine handlers queued (by all tasks)
+        self._pending = 0
+
+    def emit(self, event: str, *args: Any) -> bool:
         if event in _ONCE_PER_CONNECTION:
             if event in self._connection:
                 return self._has_listeners(event)
 
-            self._connection += [event]
-
-        if event in _ONCE_PER_SUBSCRIPTION:
-            sub_id = args[0]["sub_id"]
+            self._connection.add(event)
+        elif event in _ONCE_PER_SUBSCRIPTION:
+            emitted = self._subscriptions[args[0]["sub_id"]]
 
-            if event in self._subscriptions[sub_id]:
+            if event in emitted:
                 return self._has_listeners(event)
 
-            self._subscriptions[sub_id] += [event]
+            emitted.add(event)
 
-        return super().emit(event, *args, **kwargs)
+        if not (listeners := self.__listeners.get(event)):
+            # Like pyee, unhandled errors are raised
+            if event == "error" and args and isinstance(args[0], Exception):
+                raise args[0]
+
+            return False
+
+        for listener in listeners:
+            self.__run(listener, args)
+
+        return True
 
     def on(
         self, event: str, f: Optional[_Handler] = None
@@ -113,10 +208,192 @@ class BfxEventEmitter(AsyncIOEventEmitter):
                 "list of available events see https://docs.bitfinex.com/)."
             )
 
-        return super().on(event, f)
+        if f is None:
+            return self.listens_to(event)
 
-    def _has_listeners(self, event: str) -> bool:
-        with self._lock:
-            listeners = self._events.get(event)
+        return self.add_listener(event, f)
+
+    def listens_to(self, event: str) -> Callable[[_Handler], _Handler]:
+        def _decorator(f: _Handler) -> _Handler:
+            return self.add_listener(event, f)
+
+        return _decorator
+
+    def add_listener(self, event: str, f: _Handler) -> _Handler:
+        self.__add(event, f, f)
+
+        return f
+
+    def once(
+        self, event: str, f: Optional[_Handler] = None
+    ) -> Union[_Handler, Callable[[_Handler], _Handler]]:
+        def _decorator(f: _Handler) -> _Handler:
+            def _once(*args: Any) -> Any:
+                if f not in self.__events.get(event, {}):
+                    return None
+
+                self.remove_listener(event, f)
+
+                return f(*args)
+
+            self.__add(event, f, _once)
+
+            return f
 
-        return bool(listeners)
+        if f is None:
+            return _decorator
+
+        return _decorator(f)
+
+    def remove_listener(self, event: str, f: Callable[..., Any]) -> None:
+        self.__events[event].pop(f)
+
+        if not self.__events[event]:
+            del self.__events[event]
+
+        self.__rebuild(event)
+
+    def remove_all_listeners(self, event: Optional[str] = None) -> None:
+        if event is None:
+            self.__events.clear()
+
+            self.__listeners.clear()
+        else:
+            self.__events.pop(event, None)
+
+            self.__rebuild(event)
+
+    def listeners(self, event: str) -> List[Callable[..., Any]]:
+        return list(self.__events.get(event, {}))
+
+    def event_names(self) -> Set[str]:
+        return set(self.__events)
+
+    def __add(
+        self, event: str, f: Callable[..., Any], handler: Callable[..., Any]
+    ) -> None:
+        self.__events.setdefault(event, {})[f] = handler
+
+        self.__rebuild(event)
+
+    def __rebuild(self, event: str) -> None:
+        if handlers := self.__events.get(event):
+            self.__listeners[event] = tuple(handlers.values())
+        else:
+            self.__listeners.pop(event, None)
+
+    def __run(self, handler: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        try:
+            result = handler(*args)
+        except Exception as exception:
+            self.emit("error", exception)
+
+            return
+
+        if result is None:
+            return
+
+        if not (iscoroutine(result) or isinstance(result, Future)):
+            return
+
+        if self.__inline:
+            self.__enqueue(result)
+        else:
+            future = asyncio.ensure_future(result, loop=self.__loop)
+
+            future.add_done_callback(self.__on_done)
+
+            self.__waiting.add(future)
+
+    def __on_done(self, future: "Future[Any]") -> None:
+        self.__waiting.discard(future)
+
+        if not future.cancelled() and (exception := future.exception()):
+            self.emit("error", exception)
+
+    def __enqueue(self, awaitable: Awaitable[Any]) -> None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+
+        if (lane := self.__lanes.get(task)) is None:
+            lane = self.__lanes[task] = _Lane()
+
+        if not lane.pending and lane.draining is None:
+            # Events emitted outside of a read loop (e.g. by a call_soon
+            # callback or by a user task) would never be drained otherwise
+            self.__get_loop().call_soon(self.__on_idle_emit, task)
+
+        lane.pending.append((awaitable, _TIMESTAMPS.get()))
+
+        self._pending += 1
+
+    async def _drain(self) -> None:
+        """
+        Await the coroutine handlers queued by the current task (e.g. the
+        read loop of a connection), in order, until none is left.
+
+        Read loops call this after each frame: handlers queued by the other
+        connections are awaited by their own read loops, never by this one.
+        """
+
+        if (lane := self.__lanes.get(task := asyncio.current_task())) is not None:
+            await self.__drain(task, lane)
+
+    async def __drain(self, task: Optional["Task[Any]"], lane: _Lane) -> None:
+        if lane.draining is not None:
+            return await asyncio.shield(lane.draining)
+
+        lane.draining = self.__get_loop().create_future()
+
+        try:
+            while lane.pending:
+                awaitable, timestamps = lane.pending.popleft()
+
+                self._pending -= 1
+
+                # Handlers see the timestamps of the frame of their event
+                _TIMESTAMPS.set(timestamps)
+
+                try:
+                    if self.__timeout is None:
+                        await awaitable
+                    else:
+                        await asyncio.wait_for(awaitable, self.__timeout)
+                except asyncio.TimeoutError:
+                    self.emit(
+                        "error",
+                        HandlerTimeoutError(
+                            "An event handler has been cancelled for exceeding "
+                            f"its time budget ({self.__timeout}s)."
+                        ),
+                    )
+                except Exception as exception:
+                    self.emit("error", exception)
+        finally:
+            draining, lane.draining = lane.draining, None
+
+            if not lane.pending and self.__lanes.get(task) is lane:
+                del self.__lanes[task]
+
+            draining.set_result(None)
+
+    def __on_idle_emit(self, task: Optional["Task[Any]"]) -> None:
+        if (lane := self.__lanes.get(task)) is not None and (
+            lane.pending and lane.draining is None
+        ):
+            asyncio.ensure_future(self.__drain(task, lane))
+
+    def __get_loop(self) -> AbstractEventLoop:
+        return self.__loop or asyncio.get_event_loop()
+
+    def _forget(self, sub_id: str) -> None:
+        """
+        Allow the events emitted once per subscription to be emitted again.
+        """
+
+        self._subscriptions.pop(sub_id, None)
+
+    def _has_listeners(self, event: str) -> bool:
+        return event in self.__listeners
@@ -1,2 +1,4 @@
 from .auth_events_handler import AuthEventsHandler
+from .channel_state import ChannelState
+from .conflator import Conflator
 from .public_channels_handler import PublicChannelsHandler
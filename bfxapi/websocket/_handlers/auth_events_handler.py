@@ -1,59 +1,66 @@
 from typing import Any, Dict, Tuple
 
-from pyee.base import EventEmitter
-
 from bfxapi.types import serializers
 from bfxapi.types.dataclasses import FundingOffer, Order
 from bfxapi.types.serializers import _Notification
+from bfxapi.websocket._event_emitter import BfxEventEmitter
 
 
 class AuthEventsHandler:
-    __ABBREVIATIONS = {
-        "os": "order_snapshot",
-        "on": "order_new",
-        "ou": "order_update",
-        "oc": "order_cancel",
-        "ps": "position_snapshot",
-        "pn": "position_new",
-        "pu": "position_update",
-        "pc": "position_close",
-        "te": "trade_execution",
-        "tu": "trade_execution_update",
-        "fos": "funding_offer_snapshot",
-        "fon": "funding_offer_new",
-        "fou": "funding_offer_update",
-        "foc": "funding_offer_cancel",
-        "fcs": "funding_credit_snapshot",
-        "fcn": "funding_credit_new",
-        "fcu": "funding_credit_update",
-        "fcc": "funding_credit_close",
-        "fls": "funding_loan_snapshot",
-        "fln": "funding_loan_new",
-        "flu": "funding_loan_update",
-        "flc": "funding_loan_close",
-        "ws": "wallet_snapshot",
-        "wu": "wallet_update",
-        "fiu": "funding_info_update",
-        "bu": "balance_update",
+    # abbreviation -> (event, serializer, is_snapshot)
+    __EVENTS: Dict[str, Tuple[str, serializers._Serializer, bool]] = {
+        "os": ("order_snapshot", serializers.Order, True),
+        "on": ("order_new", serializers.Order, False),
+        "ou": ("order_update", serializers.Order, False),
+        "oc": ("order_cancel", serializers.Order, False),
+        "ps": ("position_snapshot", serializers.Position, True),
+        "pn": ("position_new", serializers.Position, False),
+        "pu": ("position_update", serializers.Position, False),
+        "pc": ("position_close", serializers.Position, False),
+        "te": ("trade_execution", serializers.Trade, False),
+        "tu": ("trade_execution_update", serializers.Trade, False),
+        "fos": ("funding_offer_snapshot", serializers.FundingOffer, True),
+        "fon": ("funding_offer_new", serializers.FundingOffer, False),
+        "fou": ("funding_offer_update", serializers.FundingOffer, False),
+        "foc": ("funding_offer_cancel", serializers.FundingOffer, False),
+        "fcs": ("funding_credit_snapshot", serializers.FundingCredit, True),
+        "fcn": ("funding_credit_new", serializers.FundingCredit, False),
+        "fcu": ("funding_credit_update", serializers.FundingCredit, False),
+        "fcc": ("funding_credit_close", serializers.FundingCredit, False),
+        "fls": ("funding_loan_snapshot", serializers.FundingLoan, True),
+        "fln": ("funding_loan_new", serializers.FundingLoan, False),
+        "flu": ("funding_loan_update", serializers.FundingLoan, False),
+        "flc": ("funding_loan_close", serializers.FundingLoan, False),
+        "ws": ("wallet_snapshot", serializers.Wallet, True),
+        "wu": ("wallet_update", serializers.Wallet, False),
+        "fiu": ("funding_info_update", serializers.FundingInfo, False),
+        "bu": ("balance_update", serializers.BalanceInfo, False),
     }
 
-    __SERIALIZERS: Dict[Tuple[str, ...], serializers._Serializer] = {
-        ("os", "on", "ou", "oc"): serializers.Order,
-        ("ps", "pn", "pu", "pc"): serializers.Position,
-        ("te", "tu"): serializers.Trade,
-        ("fos", "fon", "fou", "foc"): serializers.FundingOffer,
-        ("fcs", "fcn", "fcu", "fcc"): serializers.FundingCredit,
-        ("fls", "fln", "flu", "flc"): serializers.FundingLoan,
-        ("ws", "wu"): serializers.Wallet,
-        ("fiu",): serializers.FundingInfo,
-        ("bu",): serializers.BalanceInfo,
+    __NOTIFICATIONS: Dict[str, _Notification] = {
+        "on-req": _Notification[Order](serializer=serializers.Order),
+        "ou-req": _Notification[Order](serializer=serializers.Order),
+        "oc-req": _Notification[Order](serializer=serializers.Order),
+        "fon-req": _Notification[FundingOffer](serializer=serializers.FundingOffer),
+        "foc-req": _Notification[FundingOffer](serializer=serializers.FundingOffer),
     }
 
-    def __init__(self, event_emitter: EventEmitter) -> None:
+    __NOTIFICATION: _Notification = _Notification[None](serializer=None)
+
+    def __init__(self, event_emitter: BfxEventEmitter) -> None:
         self.__event_emitter = event_emitter
 
     def handle(self, abbrevation: str, stream: Any) -> None:
-        if abbrevation == "n":
+        if (entry := AuthEventsHandler.__EVENTS.get(abbrevation)) is not None:
+            event, serializer, is_snapshot = entry
+
+            if is_snapshot:
+                data = [serializer.parse(*sub_stream) for sub_stream in stream]
+            else:
+                data = serializer.parse(*stream)
+
+            self.__event_emitter.emit(event, data)
+        elif abbrevation == "n":
             self.__notification(stream)
         elif abbrevation == "miu":
             if stream[0] == "base":
@@ -64,31 +71,11 @@ class AuthEventsHandler:
                 self.__event_emitter.emit(
                     "symbol_margin_info", serializers.SymbolMarginInfo.parse(*stream)
                 )
-        else:
-            for abbrevations, serializer in AuthEventsHandler.__SERIALIZERS.items():
-                if abbrevation in abbrevations:
-                    event = AuthEventsHandler.__ABBREVIATIONS[abbrevation]
-
-                    if all(isinstance(sub_stream, list) for sub_stream in stream):
-                        data = [serializer.parse(*sub_stream) for sub_stream in stream]
-                    else:
-                        data = serializer.parse(*stream)
-
-                    self.__event_emitter.emit(event, data)
 
     def __notification(self, stream: Any) -> None:
-        event: str = "notification"
-
-        serializer: _Notification = _Notification[None](serializer=None)
-
-        if stream[1] in ("on-req", "ou-req", "oc-req"):
-            event, serializer = f"{stream[1]}-notification", _Notification[Order](
-                serializer=serializers.Order
-            )
-
-        if stream[1] in ("fon-req", "foc-req"):
-            event, serializer = f"{stream[1]}-notification", _Notification[
-                FundingOffer
-            ](serializer=serializers.FundingOffer)
+        if (serializer := AuthEventsHandler.__NOTIFICATIONS.get(stream[1])) is not None:
+            event = f"{stream[1]}-notification"
+        else:
+            event, serializer = "notification", AuthEventsHandler.__NOTIFICATION
 
         self.__event_emitter.emit(event, serializer.parse(*stream))
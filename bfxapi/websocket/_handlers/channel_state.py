@@ -0,0 +1,163 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .public_channels_handler import _CHECKSUM, Handler
+
+# Trades (or candles) kept for late subscribers, if the snapshot is shorter
+_HISTORY = 30
+
+_Key = Callable[[List[Any]], Any]
+
+
+def _first(item: List[Any]) -> Any:
+    # Price, order/offer id, trade id or candle's mts
+    return item[0]
+
+
+def _rate_and_period(level: List[Any]) -> Any:
+    return (level[0], level[1])
+
+
+class ChannelState:
+    """
+    Latest state of a channel, rebuilt from its (decoded) frames, so that
+    subscribers joining it late can be sent a snapshot.
+
+    Books keep their levels (or orders), trades and candles their latest
+    items, tickers and derivatives status their last update. Liquidations
+    (and unknown channels) keep nothing.
+
+    Like the handlers of PublicChannelsHandler, <apply> is resolved once
+    per channel and takes the whole frame (chan_id included).
+
+    With bulk_updates=True (ConfFlag.BULK_UPDATES), only the first list of
+    levels received is a snapshot: the following ones are batched updates.
+    """
+
+    def __init__(self, params: Dict[str, str], *, bulk_updates: bool = False) -> None:
+        self.__params, self.__bulk_updates = params, bulk_updates
+
+        self.__items: Optional["OrderedDict[Any, List[Any]]"] = None
+
+        self.__last: Optional[List[Any]] = None
+
+        self.__limit = _HISTORY
+
+        self.apply: Handler = self.__resolve()
+
+    def payloads(self) -> List[List[Any]]:
+        """
+        Return the payloads (frames without chan_id) replaying the state.
+        """
+
+        if self.__last is not None:
+            return [self.__last[1:]]
+
+        if self.__items is None:
+            return []
+
+        items = list(self.__items.values())
+
+        if self.__params["channel"] == "book":
+            return [[self.__sort(items)]]
+
+        # Trades and candles are sent from the newest to the oldest
+        return [[items[::-1]]]
+
+    def __resolve(self) -> Handler:
+        channel = self.__params["channel"]
+
+        if channel == "ticker" or (
+            channel == "status" and self.__params["key"].startswith("deriv:")
+        ):
+            return self.__latest
+
+        if channel == "book":
+            return self.__book()
+
+        if channel in ("trades", "candles"):
+            return self.__history()
+
+        return lambda message: None
+
+    def __latest(self, message: List[Any]) -> None:
+        # Frames aren't modified once handled
+        self.__last = message
+
+    def __snapshot(self, items: List[List[Any]], key: _Key) -> None:
+        self.__items = OrderedDict((key(item), item) for item in items)
+
+        self.__limit = max(len(items), _HISTORY)
+
+    def __book(self) -> Handler:
+        symbol, prec, bulk_updates = (
+            self.__params["symbol"],
+            self.__params["prec"],
+            self.__bulk_updates,
+        )
+
+        # Funding books are keyed by rate and period (None: by the first field)
+        key: Optional[_Key] = None
+
+        if prec == "R0":
+            # Orders (offers) are removed with a price (rate) of 0
+            index = 1 if symbol[0] == "t" else 2
+        else:
+            # Levels are removed with a count of 0
+            index = -2
+
+            if symbol[0] == "f":
+                key = _rate_and_period
+
+        def _update(items: Dict[Any, List[Any]], level: List[Any]) -> None:
+            _key = level[0] if key is None else key(level)
+
+            if level[index] == 0:
+                items.pop(_key, None)
+            else:
+                items[_key] = level
+
+        def _apply(message: List[Any]) -> None:
+            # Checksums are the only frames which aren't lists
+            if not isinstance(stream := message[1], list):
+                return
+
+            items = self.__items
+
+            if stream and not isinstance(stream[0], list):
+                if items is not None:
+                    _update(items, stream)
+            elif items is None or not bulk_updates:
+                self.__snapshot(stream, key or _first)
+            else:
+                for level in stream:
+                    _update(items, level)
+
+        return _apply
+
+    def __history(self) -> Handler:
+        def _apply(message: List[Any]) -> None:
+            if (stream := message[1]) == _CHECKSUM:
+                return
+
+            if isinstance(stream, list) and (not stream or isinstance(stream[0], list)):
+                return self.__snapshot(stream[::-1], _first)
+
+            # Trade executions (te, tu) carry the trade after their type
+            item = message[2] if isinstance(stream, str) else stream
+
+            if (items := self.__items) is not None:
+                items[item[0]] = item
+
+                if len(items) > self.__limit:
+                    items.popitem(last=False)
+
+        return _apply
+
+    def __sort(self, levels: List[List[Any]]) -> List[List[Any]]:
+        if self.__params["prec"] == "R0" or self.__params["symbol"][0] != "t":
+            return levels
+
+        bids = sorted((level for level in levels if level[2] > 0), reverse=True)
+
+        return bids + sorted(level for level in levels if level[2] < 0)
@@ -0,0 +1,184 @@
+import asyncio
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from bfxapi.websocket.subscriptions import Book, Status, Subscription
+from bfxapi.websocket.timestamps import _TIMESTAMPS, Timestamps
+
+from .public_channels_handler import _CHECKSUM, Handler
+
+_Key = Callable[[List[Any]], Any]
+
+_Frame = Tuple[List[Any], Optional[Timestamps]]
+
+
+def _key(subscription: Subscription) -> Optional[_Key]:
+    """
+    Return the key of the updates of <subscription> (or None, if its updates
+    can't be conflated): updates with the same key replace each other.
+    """
+
+    channel = subscription["channel"]
+
+    if channel == "ticker":
+        return lambda data: None
+
+    if channel == "candles":
+        return lambda data: data[0]
+
+    if channel == "status":
+        if cast(Status, subscription)["key"].startswith("deriv:"):
+            return lambda data: None
+
+        return None
+
+    if channel == "book":
+        book = cast(Book, subscription)
+
+        # Orders and offers of raw books never change side
+        if book["prec"] == "R0":
+            return lambda data: data[0]
+
+        # A price can move to the other side of the book: the delete of its
+        # level on one side must not be replaced by its level on the other
+        if book["symbol"].startswith("f"):
+            return lambda data: (data[0], data[1], data[3] > 0)
+
+        return lambda data: (data[0], data[2] > 0)
+
+    return None
+
+
+class Conflator:
+    """
+    Coalesce the updates of state-like channels (ticker, candles, derivatives
+    status and books) while the event loop is busy.
+
+    Updates are buffered by key (the subscription itself, the candle's mts,
+    the level's price and side or the order's id) and delivered, in a single pass,
+    as soon as the event loop runs its next iteration: frames read back to
+    back (i.e. while the consumer is lagging) only deliver their latest
+    state, while frames read one at a time are delivered as usual.
+
+    Snapshots are never conflated: pending updates of the channel are
+    delivered first. For books, only the checksum of the last pending
+    update is kept (so that it always matches the conflated state).
+    """
+
+    def __init__(self) -> None:
+        self.__handlers: Dict[int, Handler] = {}
+
+        self.__updates: Dict[int, Dict[Any, _Frame]] = {}
+
+        self.__checksums: Dict[int, _Frame] = {}
+
+        self.__dirty: Dict[int, None] = {}
+
+        self.__conflated: Counter[int] = Counter()
+
+        self.__scheduled = False
+
+    def conflated(self, chan_id: int) -> int:
+        """
+        Return how many updates of <chan_id> have been replaced by newer ones.
+        """
+
+        return self.__conflated[chan_id]
+
+    def wrap(
+        self, chan_id: int, subscription: Subscription, handler: Handler
+    ) -> Handler:
+        """
+        Return a conflating handler for the frames of <chan_id> (or <handler>
+        itself, if its updates can't be conflated).
+        """
+
+        # Pending updates are delivered by the replaced handler
+        if chan_id in self.__handlers:
+            self.flush(chan_id)
+
+        if (key := _key(subscription)) is None:
+            self.discard(chan_id)
+
+            return handler
+
+        self.__handlers[chan_id] = handler
+
+        updates: Dict[Any, _Frame] = self.__updates.setdefault(chan_id, {})
+
+        checksums, dirty, conflated = self.__checksums, self.__dirty, self.__conflated
+
+        def _handler(message: List[Any]) -> None:
+            if (stream := message[1]) == _CHECKSUM:
+                if chan_id in checksums:
+                    conflated[chan_id] += 1
+
+                checksums[chan_id] = (message, _TIMESTAMPS.get())
+            elif (
+                isinstance(stream, list) and stream and not isinstance(stream[0], list)
+            ):
+                if (_k := key(stream)) in updates:
+                    conflated[chan_id] += 1
+
+                updates[_k] = (message, _TIMESTAMPS.get())
+
+                # A pending checksum doesn't match the new state anymore
+                checksums.pop(chan_id, None)
+            else:
+                self.flush(chan_id)
+
+                return handler(message)
+
+            dirty[chan_id] = None
+
+            if not self.__scheduled:
+                self.__scheduled = True
+
+                asyncio.get_event_loop().call_soon(self.__drain)
+
+        return cast(Handler, _handler)
+
+    def flush(self, chan_id: int) -> None:
+        """
+        Deliver the pending updates of <chan_id> (and its checksum, if any).
+        """
+
+        if chan_id not in self.__dirty:
+            return
+
+        del self.__dirty[chan_id]
+
+        handler, updates = self.__handlers[chan_id], self.__updates[chan_id]
+
+        frames: List[_Frame] = list(updates.values())
+
+        updates.clear()
+
+        if (checksum := self.__checksums.pop(chan_id, None)) is not None:
+            frames.append(checksum)
+
+        for message, timestamps in frames:
+            _TIMESTAMPS.set(timestamps)
+
+            handler(message)
+
+    def discard(self, chan_id: int) -> None:
+        """
+        Drop the pending updates of <chan_id> and forget its handler.
+        """
+
+        self.__handlers.pop(chan_id, None)
+
+        self.__updates.pop(chan_id, None)
+
+        self.__checksums.pop(chan_id, None)
+
+        self.__dirty.pop(chan_id, None)
+
+        self.__conflated.pop(chan_id, None)
+
+    def __drain(self) -> None:
+        self.__scheduled = False
+
+        for chan_id in list(self.__dirty):
+            self.flush(chan_id)
@@ -1,198 +1,420 @@
-from typing import Any, List, cast
-
-from pyee.base import EventEmitter
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 from bfxapi.types import serializers
-from bfxapi.websocket.subscriptions import (
-    Book,
-    Candles,
-    Status,
-    Subscription,
-    Ticker,
-    Trades,
-)
+from bfxapi.types.labeler import _Serializer
+from bfxapi.types.serializers import _OFFLOAD_MIN_ITEMS, _parse_many
+from bfxapi.websocket._event_emitter import BfxEventEmitter
+from bfxapi.websocket.probe import Probe
+from bfxapi.websocket.subscriptions import Book, Status, Subscription, Ticker, Trades
 
 _CHECKSUM = "cs"
 
+_TRADE_EVENTS = {
+    "te": "t_trade_execution",
+    "tu": "t_trade_execution_update",
+    "fte": "f_trade_execution",
+    "ftu": "f_trade_execution_update",
+}
+
+_TICKERS: Dict[str, _Serializer[Any]] = {
+    "t": serializers.TradingPairTicker,
+    "f": serializers.FundingCurrencyTicker,
+}
+
+_TRADES: Dict[str, _Serializer[Any]] = {
+    "t": serializers.TradingPairTrade,
+    "f": serializers.FundingCurrencyTrade,
+}
+
+_BOOKS: Dict[str, _Serializer[Any]] = {
+    "t": serializers.TradingPairBook,
+    "f": serializers.FundingCurrencyBook,
+}
+
+_RAW_BOOKS: Dict[str, _Serializer[Any]] = {
+    "t": serializers.TradingPairRawBook,
+    "f": serializers.FundingCurrencyRawBook,
+}
+
+Handler = Callable[[List[Any]], Any]
+
+_Emit = Callable[..., Any]
+
+_Sink = Callable[[str, Any], None]
+
+# Subscriptions sharing the frames of a channel (and their sinks, if any)
+Holders = Sequence[Tuple[Subscription, Optional[_Sink]]]
+
+
+class _Parsed(list):
+    """
+    Snapshot (or bulk update) already parsed by an executor.
+    """
+
+
+class ParseState:
+    """
+    Parse state of a channel, kept across the handlers resolved for it (e.g.
+    each time its holders or sinks change): rebuilding a handler must not
+    make it forget the snapshot it has seen nor the frames it is holding.
+    """
+
+    def __init__(self) -> None:
+        # With ConfFlag.BULK_UPDATES, updates are batched in lists of levels
+        # too: only the first of these frames is the snapshot.
+        self.snapshot = True
+
+        # Frames received while a snapshot is being parsed (None if none is)
+        self.backlog: Optional[List[List[Any]]] = None
+
+        # The latest handler resolved for the channel (without offloading)
+        self.handler: Optional[Handler] = None
+
+        self.closed = False
+
+    def close(self) -> None:
+        """
+        Drop the snapshots still being parsed (e.g. once unsubscribed).
+        """
+
+        self.closed, self.backlog = True, None
+
+
+def _fan_out(emit: _Emit, sink: _Sink) -> _Emit:
+    def _emit(event: str, subscription: Subscription, data: Any) -> Any:
+        result = emit(event, subscription, data)
+
+        sink(event, data)
+
+        return result
+
+    return _emit
+
+
+def _share(emit: _Emit, holders: Holders) -> _Emit:
+    def _emit(event: str, subscription: Subscription, data: Any) -> None:
+        for holder, sink in holders:
+            emit(event, holder, data)
+
+            if sink is not None:
+                sink(event, data)
+
+    return _emit
+
 
 class PublicChannelsHandler:
-    def __init__(self, event_emitter: EventEmitter) -> None:
-        self.__event_emitter = event_emitter
-
-    def handle(self, subscription: Subscription, stream: List[Any]) -> None:
-        if subscription["channel"] == "ticker":
-            self.__ticker_channel_handler(cast(Ticker, subscription), stream)
-        elif subscription["channel"] == "trades":
-            self.__trades_channel_handler(cast(Trades, subscription), stream)
-        elif subscription["channel"] == "book":
-            subscription = cast(Book, subscription)
-
-            if stream[0] == _CHECKSUM:
-                self.__checksum_handler(subscription, stream[1])
-            else:
-                if subscription["prec"] != "R0":
-                    self.__book_channel_handler(subscription, stream)
-                else:
-                    self.__raw_book_channel_handler(subscription, stream)
-        elif subscription["channel"] == "candles":
-            self.__candles_channel_handler(cast(Candles, subscription), stream)
-        elif subscription["channel"] == "status":
-            self.__status_channel_handler(cast(Status, subscription), stream)
-
-    def __ticker_channel_handler(self, subscription: Ticker, stream: List[Any]):
-        if subscription["symbol"].startswith("t"):
-            return self.__event_emitter.emit(
-                "t_ticker_update",
-                subscription,
-                serializers.TradingPairTicker.parse(*stream[0]),
-            )
+    """
+    Resolve, once per subscription, the handler of its frames.
 
-        if subscription["symbol"].startswith("f"):
-            return self.__event_emitter.emit(
-                "f_ticker_update",
-                subscription,
-                serializers.FundingCurrencyTicker.parse(*stream[0]),
-            )
+    Resolved handlers take the whole frame (chan_id included): channel,
+    symbol kind and precision are never inspected again on the hot path.
+    """
 
-    def __trades_channel_handler(self, subscription: Trades, stream: List[Any]):
-        if (event := stream[0]) and event in ["te", "tu", "fte", "ftu"]:
-            events = {
-                "te": "t_trade_execution",
-                "tu": "t_trade_execution_update",
-                "fte": "f_trade_execution",
-                "ftu": "f_trade_execution_update",
-            }
-
-            if subscription["symbol"].startswith("t"):
-                return self.__event_emitter.emit(
-                    events[event],
-                    subscription,
-                    serializers.TradingPairTrade.parse(*stream[1]),
-                )
+    def __init__(
+        self,
+        event_emitter: BfxEventEmitter,
+        *,
+        probe: Optional[Probe] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.__emit, self.__executor = event_emitter.emit, executor
 
-            if subscription["symbol"].startswith("f"):
-                return self.__event_emitter.emit(
-                    events[event],
-                    subscription,
-                    serializers.FundingCurrencyTrade.parse(*stream[1]),
-                )
+        if probe is not None:
+            self.__emit = probe._wrap(self.__emit)
 
-        if subscription["symbol"].startswith("t"):
-            return self.__event_emitter.emit(
-                "t_trades_snapshot",
-                subscription,
-                [
-                    serializers.TradingPairTrade.parse(*sub_stream)
-                    for sub_stream in stream[0]
-                ],
-            )
+    def resolve(
+        self,
+        subscription: Subscription,
+        *,
+        raw: bool = False,
+        sink: Optional[_Sink] = None,
+        holders: Optional[Holders] = None,
+        offload: bool = True,
+        state: Optional[ParseState] = None,
+    ) -> Optional[Handler]:
+        """
+        Return the handler for the frames of <subscription> (or None).
 
-        if subscription["symbol"].startswith("f"):
-            return self.__event_emitter.emit(
-                "f_trades_snapshot",
-                subscription,
-                [
-                    serializers.FundingCurrencyTrade.parse(*sub_stream)
-                    for sub_stream in stream[0]
-                ],
-            )
+        With raw=True, handlers emit the decoded frame without parsing it;
+        event names are the same. Events are also passed to <sink> (with
+        their data), if any.
 
-    def __book_channel_handler(self, subscription: Book, stream: List[Any]):
-        if subscription["symbol"].startswith("t"):
-            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
-                return self.__event_emitter.emit(
-                    "t_book_snapshot",
-                    subscription,
-                    [
-                        serializers.TradingPairBook.parse(*sub_stream)
-                        for sub_stream in stream[0]
-                    ],
-                )
+        With <holders>, frames are parsed once and their events are emitted
+        for each holder (instead of <subscription>) and passed to its sink.
 
-            return self.__event_emitter.emit(
-                "t_book_update",
-                subscription,
-                serializers.TradingPairBook.parse(*stream[0]),
-            )
+        With an executor, large snapshots are parsed by the executor: the
+        following frames of the subscription wait for them to be emitted.
 
-        if subscription["symbol"].startswith("f"):
-            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
-                return self.__event_emitter.emit(
-                    "f_book_snapshot",
-                    subscription,
-                    [
-                        serializers.FundingCurrencyBook.parse(*sub_stream)
-                        for sub_stream in stream[0]
-                    ],
-                )
+        Handlers resolved again for the same channel must share its <state>.
+        """
 
-            return self.__event_emitter.emit(
-                "f_book_update",
-                subscription,
-                serializers.FundingCurrencyBook.parse(*stream[0]),
-            )
+        state = state or ParseState()
 
-    def __raw_book_channel_handler(self, subscription: Book, stream: List[Any]):
-        if subscription["symbol"].startswith("t"):
-            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
-                return self.__event_emitter.emit(
-                    "t_raw_book_snapshot",
-                    subscription,
-                    [
-                        serializers.TradingPairRawBook.parse(*sub_stream)
-                        for sub_stream in stream[0]
-                    ],
-                )
+        handler = self.__resolve(
+            subscription, raw=raw, sink=sink, holders=holders, state=state
+        )
+
+        if handler is None or raw or not offload or self.__executor is None:
+            return handler
 
-            return self.__event_emitter.emit(
-                "t_raw_book_update",
+        if (serializer := self.__snapshot_serializer(subscription)) is not None:
+            state.handler = handler
+
+            return self.__offloading(state, serializer)
+
+        return handler
+
+    def __resolve(
+        self,
+        subscription: Subscription,
+        *,
+        raw: bool,
+        sink: Optional[_Sink],
+        holders: Optional[Holders],
+        state: ParseState,
+    ) -> Optional[Handler]:
+        emit, channel = self.__emit, subscription["channel"]
+
+        if holders is not None:
+            emit = _share(emit, holders)
+        elif sink is not None:
+            emit = _fan_out(emit, sink)
+
+        if channel == "candles":
+            return self.__snapshot_or_update(
+                emit,
                 subscription,
-                serializers.TradingPairRawBook.parse(*stream[0]),
+                "candles_snapshot",
+                "candles_update",
+                serializers.Candle,
+                raw=raw,
             )
 
-        if subscription["symbol"].startswith("f"):
-            if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
-                return self.__event_emitter.emit(
-                    "f_raw_book_snapshot",
-                    subscription,
-                    [
-                        serializers.FundingCurrencyRawBook.parse(*sub_stream)
-                        for sub_stream in stream[0]
-                    ],
-                )
+        if channel == "status":
+            return self.__status(emit, cast(Status, subscription), raw=raw)
 
-            return self.__event_emitter.emit(
-                "f_raw_book_update",
-                subscription,
-                serializers.FundingCurrencyRawBook.parse(*stream[0]),
+        symbol = cast(Union[Ticker, Trades, Book], subscription)["symbol"]
+
+        if (prefix := symbol[:1]) not in ("t", "f"):
+            return None
+
+        if channel == "ticker":
+            return self.__update(
+                emit, subscription, f"{prefix}_ticker_update", _TICKERS[prefix], raw=raw
             )
 
-    def __candles_channel_handler(self, subscription: Candles, stream: List[Any]):
-        if all(isinstance(sub_stream, list) for sub_stream in stream[0]):
-            return self.__event_emitter.emit(
-                "candles_snapshot",
-                subscription,
-                [serializers.Candle.parse(*sub_stream) for sub_stream in stream[0]],
+        if channel == "trades":
+            return self.__trades(emit, cast(Trades, subscription), prefix, raw=raw)
+
+        if channel == "book":
+            return self.__book(
+                emit, cast(Book, subscription), prefix, state=state, raw=raw
             )
 
-        return self.__event_emitter.emit(
-            "candles_update", subscription, serializers.Candle.parse(*stream[0])
+        return None
+
+    def __update(
+        self,
+        emit: _Emit,
+        subscription: Subscription,
+        event: str,
+        serializer: _Serializer[Any],
+        *,
+        raw: bool,
+    ) -> Handler:
+        if raw:
+            return lambda message: emit(event, subscription, message)
+
+        parse = serializer.parse
+
+        return lambda message: emit(event, subscription, parse(*message[1]))
+
+    def __snapshot_or_update(
+        self,
+        emit: _Emit,
+        subscription: Subscription,
+        snapshot: str,
+        update: str,
+        serializer: _Serializer[Any],
+        *,
+        raw: bool,
+    ) -> Handler:
+        parse = serializer.parse
+
+        def _handler(message: List[Any]) -> None:
+            stream = message[1]
+
+            if not stream or isinstance(stream[0], list) or type(stream) is _Parsed:
+                if raw:
+                    emit(snapshot, subscription, message)
+                elif isinstance(stream, _Parsed):
+                    emit(snapshot, subscription, stream)
+                else:
+                    emit(snapshot, subscription, [parse(*item) for item in stream])
+            elif raw:
+                emit(update, subscription, message)
+            else:
+                emit(update, subscription, parse(*stream))
+
+        return _handler
+
+    def __trades(
+        self, emit: _Emit, subscription: Trades, prefix: str, *, raw: bool
+    ) -> Handler:
+        parse = _TRADES[prefix].parse
+
+        snapshot = f"{prefix}_trades_snapshot"
+
+        def _handler(message: List[Any]) -> None:
+            if isinstance(head := message[1], str):
+                if (event := _TRADE_EVENTS.get(head)) is not None:
+                    emit(event, subscription, message if raw else parse(*message[2]))
+            elif raw:
+                emit(snapshot, subscription, message)
+            elif isinstance(head, _Parsed):
+                emit(snapshot, subscription, head)
+            else:
+                emit(snapshot, subscription, [parse(*item) for item in head])
+
+        return _handler
+
+    def __book(
+        self,
+        emit: _Emit,
+        subscription: Book,
+        prefix: str,
+        *,
+        state: ParseState,
+        raw: bool,
+    ) -> Handler:
+        if subscription["prec"] != "R0":
+            kind, parse = "book", _BOOKS[prefix].parse
+        else:
+            kind, parse = "raw_book", _RAW_BOOKS[prefix].parse
+
+        snapshot, update, bulk_update = (
+            f"{prefix}_{kind}_snapshot",
+            f"{prefix}_{kind}_update",
+            f"{prefix}_{kind}_bulk_update",
         )
 
-    def __status_channel_handler(self, subscription: Status, stream: List[Any]):
+        def _handler(message: List[Any]) -> None:
+            if (stream := message[1]) == _CHECKSUM:
+                if raw:
+                    emit("checksum", subscription, message)
+                else:
+                    emit("checksum", subscription, message[2] & 0xFFFFFFFF)
+            elif not stream or isinstance(stream[0], list) or type(stream) is _Parsed:
+                event, state.snapshot = (
+                    snapshot if state.snapshot else bulk_update
+                ), False
+
+                if raw:
+                    emit(event, subscription, message)
+                elif isinstance(stream, _Parsed):
+                    emit(event, subscription, stream)
+                else:
+                    emit(event, subscription, [parse(*level) for level in stream])
+            elif raw:
+                emit(update, subscription, message)
+            else:
+                emit(update, subscription, parse(*stream))
+
+        return _handler
+
+    def __status(
+        self, emit: _Emit, subscription: Status, *, raw: bool
+    ) -> Optional[Handler]:
         if subscription["key"].startswith("deriv:"):
-            return self.__event_emitter.emit(
-                "derivatives_status_update",
+            return self.__update(
+                emit,
                 subscription,
-                serializers.DerivativesStatus.parse(*stream[0]),
+                "derivatives_status_update",
+                serializers.DerivativesStatus,
+                raw=raw,
             )
 
         if subscription["key"].startswith("liq:"):
-            return self.__event_emitter.emit(
-                "liquidation_feed_update",
-                subscription,
-                serializers.Liquidation.parse(*stream[0][0]),
+            parse = serializers.Liquidation.parse
+
+            if raw:
+                return lambda message: emit(
+                    "liquidation_feed_update", subscription, message
+                )
+
+            return lambda message: emit(
+                "liquidation_feed_update", subscription, parse(*message[1][0])
             )
 
-    def __checksum_handler(self, subscription: Book, value: int):
-        return self.__event_emitter.emit("checksum", subscription, value & 0xFFFFFFFF)
+        return None
+
+    def __snapshot_serializer(
+        self, subscription: Subscription
+    ) -> Optional[_Serializer[Any]]:
+        if (channel := subscription["channel"]) == "candles":
+            return serializers.Candle
+
+        if channel not in ("trades", "book"):
+            return None
+
+        prefix = cast(Union[Trades, Book], subscription)["symbol"][:1]
+
+        if channel == "trades":
+            return _TRADES[prefix]
+
+        if cast(Book, subscription)["prec"] != "R0":
+            return _BOOKS[prefix]
+
+        return _RAW_BOOKS[prefix]
+
+    def __offloading(self, state: ParseState, serializer: _Serializer[Any]) -> Handler:
+        executor, emit = cast(Executor, self.__executor), self.__emit
+
+        def _on_parsed(chan_id: int, future: "asyncio.Future[List[Any]]") -> None:
+            # The channel has been unsubscribed (or resubscribed) meanwhile
+            if state.closed:
+                return
+
+            # E.g. the executor has been shut down
+            if future.cancelled():
+                state.backlog = None
+
+                return
+
+            if (exception := future.exception()) is not None:
+                emit("error", exception)
+            else:
+                cast(Handler, state.handler)([chan_id, _Parsed(future.result())])
+
+            frames, state.backlog = cast(List[List[Any]], state.backlog), None
+
+            for index, message in enumerate(frames):
+                _handler(message)
+
+                # Another large snapshot: keep waiting for it
+                if state.backlog is not None:
+                    state.backlog.extend(frames[index + 1 :])
+
+                    break
+
+        def _handler(message: List[Any]) -> None:
+            if state.backlog is not None:
+                state.backlog.append(message)
+            elif (
+                isinstance(stream := message[1], list)
+                and len(stream) >= _OFFLOAD_MIN_ITEMS
+                and isinstance(stream[0], list)
+            ):
+                state.backlog = []
+
+                future = asyncio.get_event_loop().run_in_executor(
+                    executor, _parse_many, serializer.name, stream
+                )
+
+                future.add_done_callback(lambda future: _on_parsed(message[0], future))
+            else:
+                cast(Handler, state.handler)(message)
+
+        return _handler
@@ -0,0 +1,9 @@
+from .order_book import OrderBook
+from .order_book_manager import OrderBookManager
+from .raw_order_book import RawOrderBook
+from .shared_order_book import (
+    BookSnapshot,
+    BookView,
+    SharedOrderBookPublisher,
+    SharedOrderBookReader,
+)
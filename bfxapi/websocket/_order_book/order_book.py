@@ -0,0 +1,170 @@
+import zlib
+from bisect import bisect_left, insort
+from decimal import Decimal
+from math import floor, log10
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from bfxapi.types import TradingPairBook
+
+_CHECKSUM_DEPTH = 25
+
+_T = TypeVar("_T")
+
+
+def _format_float(value: float) -> str:
+    """
+    Format float numbers into a string compatible with the Bitfinex API.
+    """
+
+    def _find_exp(number: float) -> int:
+        base10 = log10(abs(number))
+
+        return floor(base10)
+
+    if _find_exp(value) >= -6:
+        return format(Decimal(repr(value)), "f")
+
+    return str(value).replace("e-0", "e-")
+
+
+def _crc32(values: Iterable[float]) -> int:
+    local = ":".join(_format_float(value) for value in values)
+
+    return zlib.crc32(local.encode("UTF-8"))
+
+
+class _BookSide(Generic[_T]):
+    """
+    Price levels of one side of a book, kept sorted from best to worst.
+
+    Prices are stored (with their sign flipped for descending sides) in a
+    sorted array: lookups and insertions use bisect, the best level is
+    always at index 0.
+    """
+
+    def __init__(self, descending: bool) -> None:
+        self.__sign = -1 if descending else 1
+
+        self.__keys: List[float] = []
+
+        self.__levels: Dict[float, _T] = {}
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __contains__(self, price: float) -> bool:
+        return price in self.__levels
+
+    def __iter__(self) -> Iterator[_T]:
+        levels, sign = self.__levels, self.__sign
+
+        return (levels[sign * key] for key in self.__keys)
+
+    def get(self, price: float) -> Optional[_T]:
+        return self.__levels.get(price)
+
+    def set(self, price: float, level: _T) -> None:
+        if price not in self.__levels:
+            insort(self.__keys, self.__sign * price)
+
+        self.__levels[price] = level
+
+    def remove(self, price: float) -> None:
+        if self.__levels.pop(price, None) is not None:
+            del self.__keys[bisect_left(self.__keys, self.__sign * price)]
+
+    def index(self, price: float) -> int:
+        return bisect_left(self.__keys, self.__sign * price)
+
+    def top(self) -> Optional[_T]:
+        if len(self.__keys) == 0:
+            return None
+
+        return self.__levels[self.__sign * self.__keys[0]]
+
+    def prices(self, depth: Optional[int] = None) -> List[float]:
+        return [self.__sign * key for key in self.__keys[:depth]]
+
+    def head(self, depth: Optional[int] = None) -> List[_T]:
+        levels, sign = self.__levels, self.__sign
+
+        return [levels[sign * key] for key in self.__keys[:depth]]
+
+    def clear(self) -> None:
+        self.__keys.clear()
+
+        self.__levels.clear()
+
+
+class OrderBook:
+    """
+    L2 order book of a trading pair, maintained from t_book_* events.
+
+    Updates are O(log n) (plus the memmove of the sorted array) and the
+    best bid/ask are read in O(1): levels are never re-sorted.
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+
+        self.__bids: _BookSide[TradingPairBook] = _BookSide(descending=True)
+
+        self.__asks: _BookSide[TradingPairBook] = _BookSide(descending=False)
+
+    def __len__(self) -> int:
+        return len(self.__bids) + len(self.__asks)
+
+    @property
+    def best_bid(self) -> Optional[TradingPairBook]:
+        return self.__bids.top()
+
+    @property
+    def best_ask(self) -> Optional[TradingPairBook]:
+        return self.__asks.top()
+
+    def bids(self, depth: Optional[int] = None) -> List[TradingPairBook]:
+        return self.__bids.head(depth)
+
+    def asks(self, depth: Optional[int] = None) -> List[TradingPairBook]:
+        return self.__asks.head(depth)
+
+    def snapshot(self, levels: Iterable[TradingPairBook]) -> None:
+        self.clear()
+
+        self.apply(levels)
+
+    def update(self, level: TradingPairBook) -> None:
+        side = self.__bids if level.amount > 0 else self.__asks
+
+        if level.count > 0:
+            side.set(level.price, level)
+        else:
+            side.remove(level.price)
+
+    def apply(self, levels: Iterable[TradingPairBook]) -> None:
+        for level in levels:
+            self.update(level)
+
+    def clear(self) -> None:
+        self.__bids.clear()
+
+        self.__asks.clear()
+
+    def checksum(self) -> int:
+        values: List[float] = []
+
+        bids = self.__bids.head(_CHECKSUM_DEPTH)
+
+        asks = self.__asks.head(_CHECKSUM_DEPTH)
+
+        for index in range(_CHECKSUM_DEPTH):
+            if index < len(bids):
+                values.extend([bids[index].price, bids[index].amount])
+
+            if index < len(asks):
+                values.extend([asks[index].price, asks[index].amount])
+
+        return _crc32(values)
+
+    def verify(self, checksum: int) -> bool:
+        return self.checksum() == checksum
@@ -0,0 +1,251 @@
+import asyncio
+import uuid
+from logging import Logger
+from typing import TYPE_CHECKING, Callable, Dict, List, Literal, Optional, Union, cast
+
+from bfxapi.types import TradingPairBook, TradingPairRawBook
+from bfxapi.websocket.exceptions import UnknownSubscriptionError
+from bfxapi.websocket.subscriptions import Book
+
+from .order_book import OrderBook
+from .raw_order_book import RawOrderBook
+
+if TYPE_CHECKING:
+    from bfxapi.websocket._client import BfxWebSocketClient
+
+_Precision = Literal["R0", "P0", "P1", "P2", "P3", "P4"]
+
+_Frequency = Literal["F0", "F1"]
+
+_Length = Literal["1", "25", "100", "250"]
+
+_DEFAULT_LOGGER = Logger("bfxapi.websocket._order_book", level=0)
+
+_Book = Union[OrderBook, RawOrderBook]
+
+_Watcher = Callable[[str, _Book, Optional[TradingPairBook]], None]
+
+
+class OrderBookManager:
+    """
+    Keeps an OrderBook (or a RawOrderBook, for R0 subscriptions) in sync
+    for each subscribed trading pair.
+
+    Every checksum sent by the server is verified against the top 25
+    levels of the local book; on mismatch (or on a sequence gap, with
+    ConfFlag.SEQ_ALL), the manager unsubscribes and subscribes again
+    (with a new sub_id) to receive a fresh snapshot.
+    """
+
+    def __init__(
+        self, wss: "BfxWebSocketClient", *, logger: Logger = _DEFAULT_LOGGER
+    ) -> None:
+        self.__wss, self.__logger = wss, logger
+
+        self.__books: Dict[str, _Book] = {}
+
+        self.__subscriptions: Dict[str, Book] = {}
+
+        self.__symbols: Dict[str, str] = {}
+
+        self.__synced: Dict[str, bool] = {}
+
+        self.__watchers: List[_Watcher] = []
+
+        wss.on("t_book_snapshot", self.__on_t_book_snapshot)
+
+        wss.on("t_book_update", self.__on_t_book_update)
+
+        wss.on("t_book_bulk_update", self.__on_t_book_bulk_update)
+
+        wss.on("t_raw_book_snapshot", self.__on_t_raw_book_snapshot)
+
+        wss.on("t_raw_book_update", self.__on_t_raw_book_update)
+
+        wss.on("t_raw_book_bulk_update", self.__on_t_raw_book_bulk_update)
+
+        wss.on("checksum", self.__on_checksum)
+
+        wss.on("sequence_gap", self.__on_sequence_gap)
+
+    def __getitem__(self, symbol: str) -> _Book:
+        return self.__books[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.__books
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.__books.keys())
+
+    def get(self, symbol: str) -> Optional[_Book]:
+        return self.__books.get(symbol)
+
+    def is_synced(self, symbol: str) -> bool:
+        return self.__synced.get(symbol, False)
+
+    def _watch(self, callback: _Watcher) -> None:
+        """
+        Call <callback> with the symbol and the book after each change (and
+        with the updated level, if the change is a single t_book_update).
+        """
+
+        self.__watchers.append(callback)
+
+    def __changed(self, symbol: str, level: Optional[TradingPairBook] = None) -> None:
+        for watcher in self.__watchers:
+            watcher(symbol, self.__books[symbol], level)
+
+    async def subscribe(
+        self,
+        symbol: str,
+        *,
+        prec: _Precision = "P0",
+        freq: _Frequency = "F0",
+        len: _Length = "25",
+    ) -> _Book:
+        if prec == "R0":
+            self.__books[symbol] = RawOrderBook(symbol)
+        else:
+            self.__books[symbol] = OrderBook(symbol)
+
+        self.__subscriptions[symbol] = {
+            "channel": "book",
+            "sub_id": str(uuid.uuid4()),
+            "symbol": symbol,
+            "prec": prec,
+            "freq": freq,
+            "len": len,
+        }
+
+        await self.__subscribe(symbol)
+
+        return self.__books[symbol]
+
+    async def unsubscribe(self, symbol: str) -> None:
+        if symbol not in self.__subscriptions:
+            raise UnknownSubscriptionError(
+                f"There is no order book for symbol <{symbol}>."
+            )
+
+        subscription = self.__subscriptions.pop(symbol)
+
+        self.__symbols.pop(subscription["sub_id"], None)
+
+        del self.__books[symbol], self.__synced[symbol]
+
+        await self.__wss.unsubscribe(subscription["sub_id"])
+
+    async def __subscribe(self, symbol: str) -> None:
+        subscription = self.__subscriptions[symbol]
+
+        self.__symbols[subscription["sub_id"]] = symbol
+
+        self.__synced[symbol] = False
+
+        await self.__wss.subscribe(**subscription)
+
+    async def __resync(self, symbol: str) -> None:
+        subscription = self.__subscriptions[symbol]
+
+        self.__synced[symbol] = False
+
+        self.__symbols.pop(subscription["sub_id"], None)
+
+        await self.__wss.unsubscribe(subscription["sub_id"])
+
+        self.__books[symbol].clear()
+
+        self.__changed(symbol)
+
+        subscription["sub_id"] = str(uuid.uuid4())
+
+        await self.__subscribe(symbol)
+
+    def __on_t_book_snapshot(
+        self, subscription: Book, snapshot: List[TradingPairBook]
+    ) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(OrderBook, self.__books[symbol]).snapshot(snapshot)
+
+            self.__synced[symbol] = True
+
+            self.__changed(symbol)
+
+    def __on_t_book_update(self, subscription: Book, data: TradingPairBook) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(OrderBook, self.__books[symbol]).update(data)
+
+            self.__changed(symbol, data)
+
+    def __on_t_book_bulk_update(
+        self, subscription: Book, data: List[TradingPairBook]
+    ) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(OrderBook, self.__books[symbol]).apply(data)
+
+            self.__changed(symbol)
+
+    def __on_t_raw_book_snapshot(
+        self, subscription: Book, snapshot: List[TradingPairRawBook]
+    ) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(RawOrderBook, self.__books[symbol]).snapshot(snapshot)
+
+            self.__synced[symbol] = True
+
+            self.__changed(symbol)
+
+    def __on_t_raw_book_update(
+        self, subscription: Book, data: TradingPairRawBook
+    ) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(RawOrderBook, self.__books[symbol]).update(data)
+
+            self.__changed(symbol)
+
+    def __on_t_raw_book_bulk_update(
+        self, subscription: Book, data: List[TradingPairRawBook]
+    ) -> None:
+        if symbol := self.__symbols.get(subscription["sub_id"]):
+            cast(RawOrderBook, self.__books[symbol]).apply(data)
+
+            self.__changed(symbol)
+
+    def __on_checksum(self, subscription: Book, value: int) -> None:
+        # Checksums must be verified synchronously: by the time a coroutine
+        # handler runs, later updates could have already been applied.
+        if (symbol := self.__symbols.get(subscription["sub_id"])) and self.__synced[
+            symbol
+        ]:
+            if not self.__books[symbol].verify(value):
+                self.__logger.warning(
+                    "Mismatch between local and remote checksums: "
+                    f"restarting book for symbol <{symbol}>..."
+                )
+
+                self.__restart(symbol)
+
+    def __on_sequence_gap(
+        self, subscription: Book, expected: int, received: int
+    ) -> None:
+        if (symbol := self.__symbols.get(subscription["sub_id"])) and self.__synced[
+            symbol
+        ]:
+            self.__logger.warning(
+                f"Sequence gap (expected {expected}, received {received}): "
+                f"restarting book for symbol <{symbol}>..."
+            )
+
+            self.__restart(symbol)
+
+    def __restart(self, symbol: str) -> None:
+        self.__synced[symbol] = False
+
+        task = asyncio.ensure_future(self.__resync(symbol))
+
+        task.add_done_callback(self.__on_resync_done)
+
+    def __on_resync_done(self, task: "asyncio.Future[None]") -> None:
+        if not task.cancelled() and (exception := task.exception()):
+            self.__logger.error(f"Unable to restart order book: {exception!r}")
@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, List, Optional
+
+from bfxapi.types import TradingPairBook, TradingPairRawBook
+
+from .order_book import _CHECKSUM_DEPTH, _BookSide, _crc32
+
+
+class _RawLevel:
+    __slots__ = ("price", "orders", "__aggregate")
+
+    def __init__(self, price: float) -> None:
+        self.price = price
+
+        self.orders: Dict[int, TradingPairRawBook] = {}
+
+        self.__aggregate: Optional[TradingPairBook] = None
+
+    @property
+    def aggregate(self) -> TradingPairBook:
+        # Summed on demand (a running sum would accumulate rounding errors):
+        # levels may change many times between two reads
+        if self.__aggregate is None:
+            self.__aggregate = TradingPairBook(
+                price=self.price,
+                count=len(self.orders),
+                amount=sum(order.amount for order in self.orders.values()),
+            )
+
+        return self.__aggregate
+
+    def add(self, order: TradingPairRawBook) -> None:
+        self.orders[order.order_id] = order
+
+        self.__aggregate = None
+
+    def remove(self, order: TradingPairRawBook) -> None:
+        del self.orders[order.order_id]
+
+        self.__aggregate = None
+
+
+class RawOrderBook:
+    """
+    Raw (R0) order book of a trading pair, maintained from t_raw_book_* events.
+
+    Orders are indexed by id, and grouped in per-price levels whose
+    aggregates are only summed again when read after a change: the L2 view
+    (price, count, amount) never re-aggregates the whole book.
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+
+        self.__orders: Dict[int, TradingPairRawBook] = {}
+
+        self.__bids: _BookSide[_RawLevel] = _BookSide(descending=True)
+
+        self.__asks: _BookSide[_RawLevel] = _BookSide(descending=False)
+
+    def __len__(self) -> int:
+        return len(self.__orders)
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self.__orders
+
+    def get(self, order_id: int) -> Optional[TradingPairRawBook]:
+        return self.__orders.get(order_id)
+
+    @property
+    def best_bid(self) -> Optional[TradingPairBook]:
+        if (level := self.__bids.top()) is not None:
+            return level.aggregate
+
+        return None
+
+    @property
+    def best_ask(self) -> Optional[TradingPairBook]:
+        if (level := self.__asks.top()) is not None:
+            return level.aggregate
+
+        return None
+
+    def bids(self, depth: Optional[int] = None) -> List[TradingPairBook]:
+        return [level.aggregate for level in self.__bids.head(depth)]
+
+    def asks(self, depth: Optional[int] = None) -> List[TradingPairBook]:
+        return [level.aggregate for level in self.__asks.head(depth)]
+
+    def orders(self, price: float) -> List[TradingPairRawBook]:
+        level = self.__bids.get(price) or self.__asks.get(price)
+
+        if level is None:
+            return []
+
+        return [level.orders[order_id] for order_id in sorted(level.orders)]
+
+    def snapshot(self, orders: Iterable[TradingPairRawBook]) -> None:
+        self.clear()
+
+        self.apply(orders)
+
+    def update(self, order: TradingPairRawBook) -> None:
+        if order.order_id in self.__orders:
+            self.__remove(self.__orders.pop(order.order_id))
+
+        if order.price > 0:
+            self.__orders[order.order_id] = order
+
+            self.__add(order)
+
+    def apply(self, orders: Iterable[TradingPairRawBook]) -> None:
+        for order in orders:
+            self.update(order)
+
+    def clear(self) -> None:
+        self.__orders.clear()
+
+        self.__bids.clear()
+
+        self.__asks.clear()
+
+    def checksum(self) -> int:
+        values: List[float] = []
+
+        bids = self.__head(self.__bids)
+
+        asks = self.__head(self.__asks)
+
+        for index in range(_CHECKSUM_DEPTH):
+            if index < len(bids):
+                values.extend([bids[index].order_id, bids[index].amount])
+
+            if index < len(asks):
+                values.extend([asks[index].order_id, asks[index].amount])
+
+        return _crc32(values)
+
+    def verify(self, checksum: int) -> bool:
+        return self.checksum() == checksum
+
+    def __side(self, order: TradingPairRawBook) -> _BookSide[_RawLevel]:
+        return self.__bids if order.amount > 0 else self.__asks
+
+    def __add(self, order: TradingPairRawBook) -> None:
+        side = self.__side(order)
+
+        if (level := side.get(order.price)) is None:
+            side.set(order.price, level := _RawLevel(order.price))
+
+        level.add(order)
+
+    def __remove(self, order: TradingPairRawBook) -> None:
+        side = self.__side(order)
+
+        if (level := side.get(order.price)) is not None:
+            level.remove(order)
+
+            if len(level.orders) == 0:
+                side.remove(order.price)
+
+    @staticmethod
+    def __head(side: _BookSide[_RawLevel]) -> List[TradingPairRawBook]:
+        orders: List[TradingPairRawBook] = []
+
+        for level in side:
+            orders.extend(level.orders[order_id] for order_id in sorted(level.orders))
+
+            if len(orders) >= _CHECKSUM_DEPTH:
+                break
+
+        return orders[:_CHECKSUM_DEPTH]
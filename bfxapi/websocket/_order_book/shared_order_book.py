@@ -0,0 +1,410 @@
+import struct
+import sys
+import time
+from itertools import chain
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+from bfxapi.types import TradingPairBook
+
+from .order_book import OrderBook
+from .raw_order_book import RawOrderBook
+
+if TYPE_CHECKING:
+    from .order_book_manager import OrderBookManager
+
+_DEFAULT_PREFIX = "bfxapi-book"
+
+# Sequence number: odd while the publisher is writing the segment
+_SEQUENCE = struct.Struct("<Q")
+
+# Depth, number of bids, number of asks, synced flag, timestamp
+_HEADER = struct.Struct("<IIIId")
+
+_LEVELS_OFFSET = _SEQUENCE.size + _HEADER.size
+
+# Price, count, amount
+_LEVEL_SIZE = 3
+
+_FIELDS = attrgetter("price", "count", "amount")
+
+_BIDS, _ASKS = 0, 1
+
+_SPINS = 1_000
+
+Level = Tuple[float, int, float]
+
+
+class BookSnapshot(NamedTuple):
+    sequence: int
+
+    timestamp: float
+
+    synced: bool
+
+    bids: List[Level]
+
+    asks: List[Level]
+
+
+class BookView(NamedTuple):
+    sequence: int
+
+    synced: bool
+
+    # Price, count and amount of each level, flattened (as doubles)
+    bids: memoryview
+
+    asks: memoryview
+
+
+def _name(prefix: str, symbol: str) -> str:
+    return f"{prefix}-{symbol}"
+
+
+def _levels(depth: int, *, sides: int = 2) -> struct.Struct:
+    return struct.Struct(f"<{sides * depth * _LEVEL_SIZE}d")
+
+
+# Segments created by the publishers of this process
+_CREATED: Set[str] = set()
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+
+    memory = SharedMemory(name)
+
+    # Before 3.13, the resource tracker of the reader unlinks the segment
+    # when the reader exits (even though it doesn't own it)
+    if name not in _CREATED:
+        resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore
+
+    return memory
+
+
+class _Segment:
+    def __init__(self, memory: SharedMemory) -> None:
+        self.memory, self.sequence = memory, 0
+
+        self.counts = [0, 0]
+
+        # Price of the last published level (if a side is full): updates to
+        # worse prices don't change the published levels
+        self.bounds: List[Optional[float]] = [None, None]
+
+
+class SharedOrderBookPublisher:
+    """
+    Publish the top <depth> levels of each book of an OrderBookManager to a
+    shared memory segment (one per symbol, named <prefix>-<symbol>), so that
+    other processes can read them with a SharedOrderBookReader.
+
+    Segments are versioned like a seqlock: the sequence number at their head
+    is odd while the publisher is writing and is bumped again (to an even
+    number) once the levels are consistent. Readers never take a lock, they
+    just retry when the sequence number changes under them.
+
+    Updates beyond the published depth don't touch the segment, while the
+    other ones only rewrite the levels of their side.
+    """
+
+    def __init__(
+        self,
+        manager: "OrderBookManager",
+        *,
+        depth: int = 25,
+        prefix: str = _DEFAULT_PREFIX,
+    ) -> None:
+        self.__manager, self.__depth, self.__prefix = manager, depth, prefix
+
+        self.__side = _levels(depth, sides=1)
+
+        self.__padding = [0.0] * (depth * _LEVEL_SIZE)
+
+        self.__segments: Dict[str, _Segment] = {}
+
+        manager._watch(self.__on_change)
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.__segments.keys())
+
+    def name(self, symbol: str) -> str:
+        return _name(self.__prefix, symbol)
+
+    def close(self) -> None:
+        """
+        Close and unlink all the segments created by the publisher.
+        """
+
+        for symbol, segment in self.__segments.items():
+            segment.memory.close()
+
+            segment.memory.unlink()
+
+            _CREATED.discard(self.name(symbol))
+
+        self.__segments.clear()
+
+    def __segment(self, symbol: str) -> _Segment:
+        size = _LEVELS_OFFSET + 2 * self.__side.size
+
+        try:
+            memory = SharedMemory(self.name(symbol), create=True, size=size)
+        except FileExistsError:
+            # Left behind by a publisher which didn't exit cleanly
+            stale = SharedMemory(self.name(symbol))
+
+            stale.close()
+
+            stale.unlink()
+
+            memory = SharedMemory(self.name(symbol), create=True, size=size)
+
+        _HEADER.pack_into(memory.buf, _SEQUENCE.size, self.__depth, 0, 0, False, 0.0)
+
+        _CREATED.add(self.name(symbol))
+
+        segment = self.__segments[symbol] = _Segment(memory)
+
+        return segment
+
+    def __on_change(
+        self,
+        symbol: str,
+        book: Union[OrderBook, RawOrderBook],
+        level: Optional[TradingPairBook],
+    ) -> None:
+        if (segment := self.__segments.get(symbol)) is None:
+            segment = self.__segment(symbol)
+
+        if level is None:
+            return self.__write(segment, symbol, book, (_BIDS, _ASKS))
+
+        if level.amount > 0:
+            bound = segment.bounds[_BIDS]
+
+            if bound is None or level.price >= bound:
+                self.__write(segment, symbol, book, (_BIDS,))
+        else:
+            bound = segment.bounds[_ASKS]
+
+            if bound is None or level.price <= bound:
+                self.__write(segment, symbol, book, (_ASKS,))
+
+    def __write(
+        self,
+        segment: _Segment,
+        symbol: str,
+        book: Union[OrderBook, RawOrderBook],
+        sides: Tuple[int, ...],
+    ) -> None:
+        buffer, depth, size = segment.memory.buf, self.__depth, self.__side.size
+
+        heads = [(side, (book.asks if side else book.bids)(depth)) for side in sides]
+
+        segment.sequence += 1
+
+        _SEQUENCE.pack_into(buffer, 0, segment.sequence)
+
+        for side, levels in heads:
+            values = list(chain.from_iterable(map(_FIELDS, levels)))
+
+            values += self.__padding[len(values) :]
+
+            self.__side.pack_into(buffer, _LEVELS_OFFSET + side * size, *values)
+
+            segment.counts[side] = len(levels)
+
+            segment.bounds[side] = levels[-1].price if len(levels) == depth else None
+
+        _HEADER.pack_into(
+            buffer,
+            _SEQUENCE.size,
+            depth,
+            *segment.counts,
+            self.__manager.is_synced(symbol),
+            time.time(),
+        )
+
+        segment.sequence += 1
+
+        _SEQUENCE.pack_into(buffer, 0, segment.sequence)
+
+
+class SharedOrderBookReader:
+    """
+    Read the top levels of a book published by a SharedOrderBookPublisher
+    (possibly running in another process), without locks nor serialization.
+    """
+
+    def __init__(self, symbol: str, *, prefix: str = _DEFAULT_PREFIX) -> None:
+        self.__segment = _attach(_name(prefix, symbol))
+
+        self.__buffer: Optional[memoryview] = self.__segment.buf
+
+        self.__depth: int = _HEADER.unpack_from(self.__segment.buf, _SEQUENCE.size)[0]
+
+        self.__levels = _levels(self.__depth)
+
+        self.__values: Optional[memoryview] = self.__segment.buf[
+            _LEVELS_OFFSET : _LEVELS_OFFSET + self.__levels.size
+        ].cast("d")
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def sequence(self) -> int:
+        """
+        The sequence number of the segment: it changes after each update.
+        """
+
+        return int(_SEQUENCE.unpack_from(self.__view(), 0)[0])
+
+    def snapshot(self) -> BookSnapshot:
+        """
+        Return a consistent copy of the published levels.
+        """
+
+        buffer, spins = self.__view(), 0
+
+        while True:
+            (sequence,) = _SEQUENCE.unpack_from(buffer, 0)
+
+            if not sequence & 1:
+                _, bids, asks, synced, timestamp = _HEADER.unpack_from(
+                    buffer, _SEQUENCE.size
+                )
+
+                values = self.__levels.unpack_from(buffer, _LEVELS_OFFSET)
+
+                if _SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                    break
+
+            if (spins := spins + 1) % _SPINS == 0:
+                time.sleep(0)
+
+        offset = self.__depth * _LEVEL_SIZE
+
+        return BookSnapshot(
+            sequence,
+            timestamp,
+            bool(synced),
+            SharedOrderBookReader.__unpack(values, 0, bids),
+            SharedOrderBookReader.__unpack(values, offset, asks),
+        )
+
+    def view(self) -> BookView:
+        """
+        Return views of the published levels, straight into the segment.
+
+        Nothing is copied, so the levels may change while being read: they are
+        consistent only if validate(view.sequence) is still True afterwards.
+        The views must be released before closing the reader.
+        """
+
+        buffer, spins = self.__view(), 0
+
+        while True:
+            (sequence,) = _SEQUENCE.unpack_from(buffer, 0)
+
+            if not sequence & 1:
+                _, bids, asks, synced, _ = _HEADER.unpack_from(buffer, _SEQUENCE.size)
+
+                if _SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                    break
+
+            if (spins := spins + 1) % _SPINS == 0:
+                time.sleep(0)
+
+        values, offset = cast(memoryview, self.__values), self.__depth * _LEVEL_SIZE
+
+        return BookView(
+            sequence,
+            bool(synced),
+            values[: bids * _LEVEL_SIZE],
+            values[offset : offset + asks * _LEVEL_SIZE],
+        )
+
+    def validate(self, sequence: int) -> bool:
+        """
+        Whether the segment is unchanged since <sequence> was read.
+        """
+
+        return self.sequence == sequence
+
+    def best(self) -> Tuple[Optional[Level], Optional[Level]]:
+        """
+        Return the best bid and the best ask (reading only the top levels).
+        """
+
+        buffer, spins = self.__view(), 0
+
+        offset = _LEVELS_OFFSET + self.__depth * _LEVEL_SIZE * 8
+
+        while True:
+            (sequence,) = _SEQUENCE.unpack_from(buffer, 0)
+
+            if not sequence & 1:
+                _, bids, asks, _, _ = _HEADER.unpack_from(buffer, _SEQUENCE.size)
+
+                bid = struct.unpack_from("<3d", buffer, _LEVELS_OFFSET)
+
+                ask = struct.unpack_from("<3d", buffer, offset)
+
+                if _SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                    break
+
+            if (spins := spins + 1) % _SPINS == 0:
+                time.sleep(0)
+
+        return (
+            (bid[0], int(bid[1]), bid[2]) if bids else None,
+            (ask[0], int(ask[1]), ask[2]) if asks else None,
+        )
+
+    def close(self) -> None:
+        if self.__values is not None:
+            self.__values.release()
+
+        self.__buffer, self.__values = None, None
+
+        self.__segment.close()
+
+    def __view(self) -> memoryview:
+        if self.__buffer is None:
+            raise ValueError("The reader has been closed.")
+
+        return self.__buffer
+
+    @staticmethod
+    def __unpack(values: Tuple[float, ...], offset: int, count: int) -> List[Level]:
+        end = offset + count * _LEVEL_SIZE
+
+        return list(
+            zip(
+                values[offset:end:3],
+                map(int, values[offset + 1 : end : 3]),
+                values[offset + 2 : end : 3],
+            )
+        )
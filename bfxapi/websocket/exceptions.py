@@ -1,3 +1,5 @@
+from typing import Any, Optional, Tuple
+
 from bfxapi.exceptions import BfxBaseException
 
 
@@ -31,3 +33,18 @@ class UnknownEventError(BfxBaseException):
 
 class UnknownSubscriptionError(BfxBaseException):
     pass
+
+
+class HandlerTimeoutError(BfxBaseException):
+    pass
+
+
+class SubscriptionError(BfxBaseException):
+    def __init__(self, sub_id: str, code: Optional[int], msg: Optional[str]) -> None:
+        super().__init__(f"Unable to subscribe <{sub_id}>: {msg} (code: {code}).")
+
+        self.sub_id, self.code, self.msg = sub_id, code, msg
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Raised in the workers of sharded clients, then sent to the parent
+        return SubscriptionError, (self.sub_id, self.code, self.msg)
@@ -0,0 +1,17 @@
+from enum import IntFlag
+
+
+class ConfFlag(IntFlag):
+    """
+    Flags of the <conf> event, sent on each public connection.
+
+    See https://docs.bitfinex.com/docs/ws-general#configuration.
+    """
+
+    TIMESTAMP = 32_768
+
+    SEQ_ALL = 65_536
+
+    OB_CHECKSUM = 131_072
+
+    BULK_UPDATES = 536_870_912
@@ -0,0 +1,214 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypedDict
+
+if TYPE_CHECKING:
+    from bfxapi.websocket._client import BfxWebSocketClient
+
+SubscriptionStats = TypedDict(
+    "SubscriptionStats",
+    {"sub_id": str, "channel": str, "messages": int, "conflated": int, "rate": float},
+)
+
+BucketStats = TypedDict(
+    "BucketStats",
+    {
+        "id": int,
+        "open": bool,
+        "messages": int,
+        "bytes": int,
+        "rate": float,
+        "pendings": int,
+        "subscriptions": List[SubscriptionStats],
+    },
+)
+
+StageStats = TypedDict(
+    "StageStats",
+    {"count": int, "mean": Optional[float], "p50": Optional[int], "p99": Optional[int]},
+)
+
+ClientStats = TypedDict(
+    "ClientStats",
+    {
+        "open": bool,
+        "reconnections": int,
+        "reconnecting": bool,
+        "downtime": float,
+        "last_downtime": Optional[float],
+        "buckets": List[BucketStats],
+        "stages": Optional[Dict[str, Dict[str, StageStats]]],
+    },
+)
+
+
+RecoveryProgress = TypedDict(
+    "RecoveryProgress", {"total": int, "sent": int, "confirmed": int, "failed": int}
+)
+
+GatewayStats = TypedDict(
+    "GatewayStats",
+    {"sessions": int, "channels": int, "subscriptions": int, "upstream": ClientStats},
+)
+
+
+def _labels(**labels: Any) -> str:
+    # Label values are escaped as required by the text exposition format
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(stats: ClientStats, *, prefix: str = "bfxapi_wss") -> str:
+    """
+    Render the stats of a client in the Prometheus text exposition format.
+    """
+
+    lines: List[str] = []
+
+    def _metric(name: str, kind: str, description: str) -> str:
+        lines.extend(
+            [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} {kind}"]
+        )
+
+        return f"{prefix}_{name}"
+
+    metric = _metric("up", "gauge", "Whether the connection is open.")
+    lines.append(f"{metric} {int(stats['open'])}")
+
+    metric = _metric("reconnections_total", "counter", "Successful reconnections.")
+    lines.append(f"{metric} {stats['reconnections']}")
+
+    metric = _metric("downtime_seconds_total", "counter", "Time spent reconnecting.")
+    lines.append(f"{metric} {stats['downtime']}")
+
+    buckets = stats["buckets"]
+
+    metric = _metric("bucket_messages_total", "counter", "Frames received.")
+    lines += [f'{metric}{{bucket="{b["id"]}"}} {b["messages"]}' for b in buckets]
+
+    metric = _metric("bucket_bytes_total", "counter", "Bytes received.")
+    lines += [f'{metric}{{bucket="{b["id"]}"}} {b["bytes"]}' for b in buckets]
+
+    metric = _metric("bucket_pendings", "gauge", "Outstanding subscriptions.")
+    lines += [f'{metric}{{bucket="{b["id"]}"}} {b["pendings"]}' for b in buckets]
+
+    metric = _metric("subscription_messages_total", "counter", "Frames received.")
+
+    for bucket in buckets:
+        for subscription in bucket["subscriptions"]:
+            labels = _labels(
+                bucket=bucket["id"],
+                sub_id=subscription["sub_id"],
+                channel=subscription["channel"],
+            )
+
+            lines.append(f"{metric}{{{labels}}} {subscription['messages']}")
+
+    metric = _metric(
+        "subscription_conflated_total", "counter", "Updates replaced by newer ones."
+    )
+
+    for bucket in buckets:
+        for subscription in bucket["subscriptions"]:
+            labels = _labels(
+                bucket=bucket["id"],
+                sub_id=subscription["sub_id"],
+                channel=subscription["channel"],
+            )
+
+            lines.append(f"{metric}{{{labels}}} {subscription['conflated']}")
+
+    if stages := stats["stages"]:
+        metric = _metric(
+            "stage_seconds", "summary", "Time spent by frames in each stage."
+        )
+
+        for channel, _stages in stages.items():
+            for stage, summary in _stages.items():
+                labels = _labels(channel=channel, stage=stage)
+
+                for quantile, value in (
+                    ("0.5", summary["p50"]),
+                    ("0.99", summary["p99"]),
+                ):
+                    if value is not None:
+                        lines.append(
+                            f'{metric}{{{labels},quantile="{quantile}"}} {value / 1e9}'
+                        )
+
+                if (mean := summary["mean"]) is not None:
+                    lines.append(
+                        f"{metric}_sum{{{labels}}} {mean * summary['count'] / 1e9}"
+                    )
+
+                lines.append(f"{metric}_count{{{labels}}} {summary['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """
+    Serve the stats of a client, in the Prometheus text format, over HTTP.
+
+    Any path is answered with the metrics: point a scraper to it (e.g.
+    http://127.0.0.1:9464/metrics).
+    """
+
+    def __init__(
+        self,
+        wss: "BfxWebSocketClient",
+        *,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        prefix: str = "bfxapi_wss",
+    ) -> None:
+        self.__wss, self.__host, self.__port = wss, host, port
+
+        self.__prefix = prefix
+
+        self.__server: Optional[asyncio.Server] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        if self.__server is None or not self.__server.sockets:
+            return None
+
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self.__server = await asyncio.start_server(
+            self.__handle, self.__host, self.__port
+        )
+
+    async def close(self) -> None:
+        if self.__server is not None:
+            self.__server.close()
+
+            await self.__server.wait_closed()
+
+            self.__server = None
+
+    async def __handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # Request line and headers are ignored
+            await reader.readuntil(b"\r\n\r\n")
+
+            body = to_prometheus(self.__wss.stats(), prefix=self.__prefix).encode()
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
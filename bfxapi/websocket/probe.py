@@ -0,0 +1,93 @@
+from collections import defaultdict
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from bfxapi._utils.histogram import HdrHistogram
+from bfxapi.websocket.subscriptions import Subscription
+
+_STAGES = ["decode", "parse", "dispatch", "total"]
+
+
+class Stages(NamedTuple):
+    """
+    Monotonic timestamps (time.perf_counter_ns) of a frame's stages.
+    """
+
+    received: int
+
+    decoded: int
+
+    parsed: int
+
+    dispatched: int
+
+
+class Probe:
+    """
+    Opt-in instrumentation of the hot path of public channels.
+
+    For each frame, the time spent decoding its JSON, parsing its data
+    and dispatching its event (i.e. running the synchronous handlers and
+    scheduling the coroutine ones) is recorded in an HDR-style histogram
+    (in nanoseconds) per channel. An optional <hook> receives the Stages
+    of each frame along with its subscription.
+
+    Clients without a probe don't take any timestamp.
+    """
+
+    def __init__(
+        self, hook: Optional[Callable[[Subscription, Stages], None]] = None
+    ) -> None:
+        self.__hook = hook
+
+        self.__histograms: Dict[str, Dict[str, HdrHistogram]] = defaultdict(
+            lambda: {stage: HdrHistogram() for stage in _STAGES}
+        )
+
+        self.__received = self.__decoded = 0
+
+    @property
+    def channels(self) -> Dict[str, Dict[str, HdrHistogram]]:
+        """
+        Return, for each channel, the histograms of the decode, parse,
+        dispatch and total (receive to dispatch-done) stages.
+        """
+
+        return dict(self.__histograms)
+
+    def clear(self) -> None:
+        self.__histograms.clear()
+
+    def _decoded(self, received: int, decoded: int) -> None:
+        # Frames are handled one at a time: the next call to <_dispatch>
+        # always refers to the last decoded frame.
+        self.__received, self.__decoded = received, decoded
+
+    def _wrap(self, emit: Callable[..., bool]) -> Callable[..., bool]:
+        def _emit(event: str, subscription: Subscription, *args: Any) -> bool:
+            parsed = perf_counter_ns()
+
+            result = emit(event, subscription, *args)
+
+            self.__on_frame(
+                subscription,
+                Stages(self.__received, self.__decoded, parsed, perf_counter_ns()),
+            )
+
+            return result
+
+        return _emit
+
+    def __on_frame(self, subscription: Subscription, stages: Stages) -> None:
+        histograms = self.__histograms[subscription["channel"]]
+
+        histograms["decode"].record(stages.decoded - stages.received)
+
+        histograms["parse"].record(stages.parsed - stages.decoded)
+
+        histograms["dispatch"].record(stages.dispatched - stages.parsed)
+
+        histograms["total"].record(stages.dispatched - stages.received)
+
+        if self.__hook is not None:
+            self.__hook(subscription, stages)
@@ -1,4 +1,4 @@
-from typing import Literal, TypedDict, Union
+from typing import Any, Dict, Literal, Mapping, Optional, TypedDict, Union
 
 Subscription = Union["Ticker", "Trades", "Book", "Candles", "Status"]
 
@@ -36,3 +36,29 @@ class Status(TypedDict):
     channel: Literal["status"]
     sub_id: str
     key: str
+
+
+def _params(subscription: Mapping[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Return the parameters identifying the channel of a subscription, with
+    the server's defaults (or None, if the channel is unknown).
+    """
+
+    channel = subscription.get("channel")
+
+    if channel in ("ticker", "trades"):
+        return {"channel": channel, "symbol": str(subscription.get("symbol"))}
+
+    if channel == "book":
+        return {
+            "channel": channel,
+            "symbol": str(subscription.get("symbol")),
+            "prec": str(subscription.get("prec", "P0")),
+            "freq": str(subscription.get("freq", "F0")),
+            "len": str(subscription.get("len", "25")),
+        }
+
+    if channel in ("candles", "status"):
+        return {"channel": channel, "key": str(subscription.get("key"))}
+
+    return None
@@ -0,0 +1,26 @@
+from contextvars import ContextVar
+from typing import NamedTuple, Optional
+
+
+class Timestamps(NamedTuple):
+    server: Optional[int]
+    """Server time in milliseconds (requires ConfFlag.TIMESTAMP)."""
+
+    local: float
+    """Local time (in milliseconds) at which the frame was received."""
+
+
+_TIMESTAMPS: ContextVar[Optional[Timestamps]] = ContextVar("_TIMESTAMPS", default=None)
+
+
+def get_timestamps() -> Optional[Timestamps]:
+    """
+    Return the timestamps of the frame whose event is being handled.
+
+    Must be called from an event handler (coroutines included): each
+    handler sees the timestamps of the frame its event comes from. Frames
+    are only timestamped with ConfFlag.TIMESTAMP or a probe (otherwise,
+    return None).
+    """
+
+    return _TIMESTAMPS.get()
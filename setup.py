@@ -38,19 +38,22 @@ setup(
         "bfxapi.websocket._client",
         "bfxapi.websocket._handlers",
         "bfxapi.websocket._event_emitter",
+        "bfxapi.websocket._order_book",
         "bfxapi.rest",
         "bfxapi.rest._interface",
         "bfxapi.rest._interfaces",
     ],
     install_requires=[
-        "pyee~=11.1.0",
         "websockets~=12.0",
         "requests~=2.32.3",
     ],
     extras_require={
         "typing": [
             "types-requests~=2.32.0.20241016",
-        ]
+        ],
+        "orjson": [
+            "orjson~=3.10",
+        ],
     },
     python_requires=">=3.8",
     package_data={"bfxapi": ["py.typed"]},